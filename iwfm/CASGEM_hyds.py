@@ -19,13 +19,9 @@
 import pandas as pd
 import os
 import numpy as np
-import sys
 import matplotlib.pyplot as plt
 import sklearn.metrics
-
-sys.path.insert(0, r'P:\Projects\5658_NSJWCD\IWRFM\pyemu')
-#Let's add pyemu
-import pyemu
+import iwfm
 
 def CASGEM_hyds(gwe_path,wells_df,gwhyd_sim,dir_out,sim_period,y_range,stations_path,sm_pywfm,well_reference="RPE"):
     ''' read_sim_hyds() - Read simulated values from multiple IWFM output 
@@ -73,217 +69,138 @@ def CASGEM_hyds(gwe_path,wells_df,gwhyd_sim,dir_out,sim_period,y_range,stations_
     sim_dates["Date"]=sim_dates.Date_raw.str[:-6]
     sim_dates["Date"]=pd.to_datetime(sim_dates.Date)
 
-    #Let's find wells that are both in CASGEM and the IWFM model
-    IWFM_in_CASGEM = wells_df.Name[wells_df.Name.isin(gwl.SWN)|(wells_df.Name.isin(gwl.WELL_NAME ))].reset_index(drop=True)
+    #Let's normalize well identifiers once: each CASGEM record gets the IWFM name it matches
+    #First, exact matches by SWN and by WELL_NAME
+    iwfm_names = set(wells_df.Name.unique())
+    gwl["Name"] = gwl.SWN.where(gwl.SWN.isin(iwfm_names))
+    gwl["Name"] = gwl.Name.fillna(gwl.WELL_NAME.where(gwl.WELL_NAME.isin(iwfm_names)))
+    unmatched = iwfm_names - set(gwl.Name.dropna())
 
     #Let's match wells where the base and meridian of the state code was omitted in the IWFM model
-    bm_omitted=wells_df.Name[wells_df.Name.isin(gwl.SWN[gwl.SWN.str.len() == 13].str.slice(stop=-1))].reset_index(drop=True)
-    bm_omitted=bm_omitted[~bm_omitted.isin(IWFM_in_CASGEM)]
-
-    if len(bm_omitted)>0:
-    #Let's retrieve the original CASGEM names
-        bm_omit = pd.DataFrame()
-        bm_omit['SWN'] = gwl.SWN[gwl.SWN.str.len() == 13].unique()
-        bm_omit['IWFM']=gwl.SWN[gwl.SWN.str.len() == 13].str.slice(stop=-1).unique()
-        bm_omit=bm_omit[bm_omit.IWFM.isin(bm_omitted)].reset_index(drop=True)
-
-        #Let's loop through wells and fix names in CASGEM hydrographs data frame
-        for well in bm_omitted:
-            gwl.loc[gwl.SWN==bm_omit[bm_omit.IWFM==well].SWN[0],'SWN']=bm_omit[bm_omit.IWFM==well].reset_index(drop=True).IWFM[0]
-            IWFM_in_CASGEM=pd.concat([IWFM_in_CASGEM,bm_omit[bm_omit.IWFM==well].IWFM],ignore_index=True)
-
-    #Let's clean by different combinations of upper and lower casing
-    low_case_match=wells_df.Name[wells_df.Name.str.lower().isin(gwl.WELL_NAME.str.lower())]
-    low_case_match=low_case_match[~low_case_match.isin(IWFM_in_CASGEM)].reset_index(drop=True)
-
-    if len(low_case_match) > 0:
-        # Let's retrieve the original CASGEM names
-        names_dum = pd.DataFrame({'Name': wells_df.Name.unique()})
-        lc_match = pd.DataFrame()
-        lc_match['WELL_NAME']=gwl.WELL_NAME[gwl.WELL_NAME.str.lower().isin(low_case_match.str.lower())].unique()
-
-        lc_match['IWFM'] = names_dum.Name[
-            pd.Index(names_dum.Name).str.lower().get_indexer(lc_match['WELL_NAME'].str.lower())].reset_index(drop=True)
-
-        # Let's loop through wells and fix names in CASGEM hydrographs data frame
-        for well in low_case_match:
-            gwl.loc[gwl.WELL_NAME == lc_match[lc_match.IWFM == well].reset_index(drop=True).WELL_NAME[0], 'WELL_NAME'] = lc_match[lc_match.IWFM == well].reset_index(drop=True).IWFM[0]
-            IWFM_in_CASGEM = pd.concat([IWFM_in_CASGEM,lc_match[lc_match.IWFM == well].IWFM], ignore_index=True)
-    # Let's find wells that are in the IWFM model, but not in CASGEM
+    swn_bm = gwl.SWN.where(gwl.SWN.str.len() == 13).str.slice(stop=-1)
+    gwl["Name"] = gwl.Name.fillna(swn_bm.where(swn_bm.isin(unmatched)))
+    unmatched = unmatched - set(gwl.Name.dropna())
+
+    #Let's match by different combinations of upper and lower casing
+    lower_index = {name.lower(): name for name in unmatched}
+    gwl["Name"] = gwl.Name.fillna(gwl.WELL_NAME.str.lower().map(lower_index))
 
+    #Wells that are both in CASGEM and the IWFM model, in IWFM order
+    IWFM_in_CASGEM = wells_df.Name[wells_df.Name.isin(gwl.Name)].unique()
+
+    # Let's find wells that are in the IWFM model, but not in CASGEM
     IWFM_not_in_CASGEM=wells_df.Name[~wells_df.Name.isin(IWFM_in_CASGEM)]
 
     #Let's find wells that are in CASGEM, but not in the IWFM model
-    CASGEM_not_in_IWFM=pd.concat([gwl.SWN[~gwl.SWN.isin(IWFM_in_CASGEM)].dropna(),gwl.WELL_NAME[~gwl.WELL_NAME.isin(IWFM_in_CASGEM)]]).unique()
-    
-    #Let's remove nans
-    CASGEM_not_in_IWFM=CASGEM_not_in_IWFM[~pd.isnull(CASGEM_not_in_IWFM)]
-    if len(bm_omitted) > 0:
-        CASGEM_not_in_IWFM=CASGEM_not_in_IWFM[~np.isin(CASGEM_not_in_IWFM, bm_omit['SWN'])]
-    if len(low_case_match) > 0:
-        CASGEM_not_in_IWFM[~np.isin(CASGEM_not_in_IWFM, lc_match['WELL_NAME'])]
+    no_match = gwl.Name.isnull()
+    CASGEM_not_in_IWFM=pd.concat([gwl.SWN[no_match],gwl.WELL_NAME[no_match]]).dropna().unique()
+
     #Let's convert dates of gwl to Pandas format
     gwl["Date"]=pd.to_datetime(gwl.MSMT_DATE.str[:-11], format="%Y-%m-%d")
 
+    #Hash index of observations within the simulation period by IWFM name
+    gwl_sim = gwl[gwl.Name.notna() & (gwl.Date >= sim_dates.loc[0, "Date"]) & (gwl.Date <= sim_dates.loc[1, "Date"])].reset_index(drop=True)
+    gwl_groups = gwl_sim.groupby("Name").indices
+
     #List with ranges of hydrographs
     ranges= {}
 
-    #We'll add screen information to wells df
-    wells_df["Screen_top"]=np.nan
-    wells_df["Screen_bot"] = np.nan
-
     wells_df["IOUTHL"]=wells_df["IOUTHL"].astype(int)
     wells_df["HYDROGRAPH ID"] = wells_df["HYDROGRAPH ID"].astype(int)
 
-    IWFM_in_CASGEM=IWFM_in_CASGEM.unique()
+    #Let's grab well information: hash indexes of stations by SWN, WELL_NAME and lower-case WELL_NAME
+    station_swn = pd.Series(stations.index, index=stations.SWN).dropna()
+    station_swn = station_swn[~station_swn.index.duplicated()].to_dict()
+    station_name = pd.Series(stations.index, index=stations.WELL_NAME)
+    station_lower = station_name.copy()
+    station_lower.index = station_lower.index.str.lower()
+    station_name = station_name[~station_name.index.duplicated()].to_dict()
+    station_lower = station_lower[~station_lower.index.duplicated()].to_dict()
+
+    #CASGEM identifiers of the first record of each matched well
+    gwl_ids = gwl[gwl.Name.notna()].drop_duplicates("Name").set_index("Name")
+
+    station_rows = []
+    for well in IWFM_in_CASGEM:
+        keys = [well, gwl_ids.loc[well, "SWN"], gwl_ids.loc[well, "WELL_NAME"]]
+        row = next((index[key] for key in keys for index in (station_name, station_swn) if key in index), None)
+        if row is None:
+            row = station_lower.get(str(well).lower())
+        if row is None:
+            #Last resort, station names that contain the well name
+            found = stations.index[stations.WELL_NAME.str.find(well) >= 0]
+            row = found[0] if len(found) > 0 else None
+        station_rows.append(row)
+
+    #Station information for all matched wells (nan where no station was found)
+    station_info = stations.reindex([np.nan if row is None else row for row in station_rows])
+    screen_top = (station_info[well_reference] - station_info['TOP_PRF']).values.astype(float)
+    screen_bot = (station_info[well_reference] - station_info['BOT_PRF']).values.astype(float)
+    well_depth = station_info['WELL_DEPTH'].values.astype(float)
+    well_bot = (station_info[well_reference] - station_info['WELL_DEPTH']).values.astype(float)
+
+    #We'll add screen information to wells df
+    wells_df["Screen_top"] = wells_df.Name.map(pd.Series(screen_top, index=IWFM_in_CASGEM))
+    wells_df["Screen_bot"] = wells_df.Name.map(pd.Series(screen_bot, index=IWFM_in_CASGEM))
+
+    #Layer tops and bottoms at each matched well
+    strat = wells_df.drop_duplicates("Name").set_index("Name").loc[IWFM_in_CASGEM]
+    bot_cols = ["L" + str(i + 1) + "_bot" for i in range(nlay)]
+    layer_bot = strat[bot_cols].values.astype(float)
+    layer_top = np.column_stack([strat['Top'].values.astype(float), layer_bot[:, :-1]])
+
+    #Hydrograph ID of each layer of each matched well (nan if the layer has no hydrograph)
+    hyd_ids = wells_df.drop_duplicates(["Name", "IOUTHL"]).pivot(index="Name", columns="IOUTHL", values="HYDROGRAPH ID")
+    hyd_ids = hyd_ids.reindex(index=IWFM_in_CASGEM, columns=range(1, nlay + 1)).values
+
+    #Interval used to weight the layers: the screen, else the well depth, else all the layers
+    has_screen = ~(np.isnan(screen_top) | np.isnan(screen_bot))
+    has_depth = ~np.isnan(well_depth)
+    int_top = np.where(has_screen, screen_top, layer_top[:, 0])
+    int_bot = np.where(has_screen, screen_bot, np.where(has_depth, well_bot, layer_bot[:, -1]))
+
+    #Let's calculate the weights of all wells at once, only for layers with hydrographs
+    w_all = iwfm.screen_overlap(layer_top, layer_bot, int_top, int_bot)
+    w_all[np.isnan(hyd_ids)] = 0.0
+    w_total = w_all.sum(axis=1, keepdims=True)
+    w_all = np.divide(w_all, w_total, out=np.zeros_like(w_all), where=w_total > 0)
+
+    #Simulated heads in wide format, one column per hydrograph ID
+    sim_wide = gwhyd_sim.pivot(index="Date", columns="HYDROGRAPH ID", values="SIM")
 
     CASGEM_outside_range = []
     
     #Let's loop through wells for which we have both simulations and observations
-    for well in IWFM_in_CASGEM:
-        #Let's grab well information
-        station_dum=stations[(stations.WELL_NAME==well)|(stations.SWN==well)|(stations.WELL_NAME.str.find(well)>=0)].reset_index(drop=True)
-        screen_top_dum=station_dum.loc[0,well_reference] - station_dum.loc[0,'TOP_PRF']
-        screen_bot_dum = station_dum.loc[0, well_reference] - station_dum.loc[0, 'BOT_PRF']
-        screen_length_dum=screen_top_dum-screen_bot_dum
-        well_bot_dum=station_dum.loc[0, well_reference] - station_dum.loc[0, 'WELL_DEPTH']
-        well_depth_dum=station_dum.loc[0, 'WELL_DEPTH']
-        wells_dum=wells_df[wells_df.Name == well].reset_index(drop=True)
-        wells_df.loc[wells_df.Name == well,"Screen_top"]=screen_top_dum
-        wells_df.loc[wells_df.Name == well, "Screen_bot"] = screen_bot_dum
-        gwl_dum=gwl[(gwl.SWN==well)|(gwl.WELL_NAME==well)]
-        gwl_dum=gwl_dum[(gwl_dum.Date >= sim_dates.loc[0, "Date"]) & (gwl_dum.Date <= sim_dates.loc[1, "Date"])].reset_index(drop=True)
-        top_dum=wells_dum.Top.unique()[0]
-
+    for k, well in enumerate(IWFM_in_CASGEM):
         ## Skip CASGEM wells that don't have data within simulation period
-        if gwl_dum.WSE.isnull().all():
+        rows_dum = gwl_groups.get(well, [])
+        if pd.isnull(gwl_sim.WSE.values[rows_dum]).all():
             CASGEM_outside_range.append(well)
             continue
+        gwl_dum = gwl_sim.iloc[rows_dum].reset_index(drop=True)
 
-        
-        #Let's retrieve which hydrographs we will need
-        IDs_dum=[]
-        #List with weights
-        w=[]
-        #Do we have nan in screen values?
-        if (np.isnan(screen_top_dum)|np.isnan(screen_bot_dum)):
-            #Do we also have nan in well depth
-            if np.isnan(well_depth_dum):
-                    #In this case, we add all the layers
-
-                for i in range(nlay):
-                    # In this case, we add all the layers
-                    IDs_dum.append(wells_dum.loc[wells_dum.IOUTHL == i + 1, "HYDROGRAPH ID"].values[0])
-                    # Bottom of the layer
-                    bot_lay_dum = wells_dum.loc[0, "L" + str(i + 1) + "_bot"]
-                    if i == 0:
-                        # Surface elevation
-                        top_lay_dum = wells_dum.loc[0, 'Top']
-                    else:
-                        top_lay_dum = wells_dum.loc[0, "L" + str(i) + "_bot"]
-                    lay_length=top_lay_dum-bot_lay_dum
-                    w.append(lay_length)
-                # Let's normalize weights
-                Model_Depth=wells_dum.loc[0, 'Top']-bot_lay_dum
-                w=[x / (wells_dum.loc[0, 'Top']-bot_lay_dum) for x in w]
-
-            else:
-            #In this case, we add all the layers included within the well depth
-                for i in range(nlay):
-                    #Bottom of the layer
-                    bot_lay_dum = wells_dum.loc[0, "L" + str(i + 1) + "_bot"]
-                    #If the top of the layer is above the bottom of the well, we will add the layer to the list
-                    #Layer 1
-                    if i==0:
-                        #Surface elevation
-                        top_lay_dum=wells_dum.loc[0,'Top']
-                        IDs_dum.append(wells_dum.loc[wells_dum.IOUTHL == i + 1, "HYDROGRAPH ID"].values[0])
-                        #Let's add weight
-                        #Length of layer in well
-                        lay_length=min(top_dum-bot_lay_dum,top_dum-well_bot_dum)
-                        w.append(lay_length)
-                    else:
-                        # Top of layer
-                        top_lay_dum = wells_dum.loc[0, "L" + str(i) + "_bot"]
-                        if (top_lay_dum>well_bot_dum):
-                            if len(wells_dum.loc[wells_dum.IOUTHL == i + 1, "HYDROGRAPH ID"].values) > 0:
-                                IDs_dum.append(wells_dum.loc[wells_dum.IOUTHL == i + 1, "HYDROGRAPH ID"].values[0])
-                                lay_length = min(top_lay_dum - bot_lay_dum, top_lay_dum - well_bot_dum)
-                                w.append(lay_length)
-                # Let's normalize weights
-                w = w / well_depth_dum
-
-
-        else:
-            #Let's loop through layers
-            for i in range(nlay):
-                #Bottom of the layer
-                bot_lay_dum = wells_dum.loc[0, "L" + str(i + 1) + "_bot"]
-                #Is the well screened in the layer?
-                #First we see layer one
-                if i==0:
-                    if ~(screen_top_dum<bot_lay_dum):
-                        IDs_dum.append(wells_dum.loc[wells_dum.IOUTHL==1,"HYDROGRAPH ID"].values[0])
-                        #Let's add weight
-                        lay_length = min(screen_top_dum - bot_lay_dum, top_dum - bot_lay_dum,screen_top_dum - screen_bot_dum)
-                        w.append(lay_length)
-                #For the rest of the layers
-                else:
-                    #Top of layer
-                    top_lay_dum=wells_dum.loc[0, "L" + str(i ) + "_bot"]
-                    #Bottom of the layer
-                    bot_lay_dum=wells_dum.loc[0, "L" + str(i+1) + "_bot"]
-                    #If screen is in the layer
-                    if~((screen_top_dum<bot_lay_dum)|(screen_bot_dum>top_lay_dum)):
-                        if len(wells_dum.loc[wells_dum.IOUTHL == i + 1, "HYDROGRAPH ID"].values) > 0:
-                            IDs_dum.append(wells_dum.loc[wells_dum.IOUTHL == i+1, "HYDROGRAPH ID"].values[0])
-                            #Let's add weight
-                            lay_length = min(screen_top_dum - bot_lay_dum, top_lay_dum - bot_lay_dum,screen_top_dum - screen_bot_dum,top_lay_dum - well_bot_dum)
-                            w.append(lay_length)
-
-            w = w / screen_length_dum
-
-
-
-
-
-        #Now, let's grab simulations for the well
-
-
-
-        sim_dum=gwhyd_sim.loc[gwhyd_sim['HYDROGRAPH ID'].isin(IDs_dum),['Date','HYDROGRAPH ID', 'LAYER','SIM']].reset_index(drop=True)
-
-        #Let's transform to wide
-        sim_dum_wide=sim_dum.pivot(index="Date",columns='LAYER',values="SIM")
+        #Let's retrieve which hydrographs we will need, with their weights
+        layers_dum = np.nonzero(w_all[k] > 0)[0]
+        IDs_dum = hyd_ids[k, layers_dum].astype(int)
+        w = w_all[k, layers_dum]
 
+        #Now, let's grab simulations for the well from the wide table
         #Names for wide dataframe
-        wide_names=[]
-
-        for i in range(len(IDs_dum)):
-            lay_dum=wells_dum.loc[wells_dum["HYDROGRAPH ID"]==IDs_dum[i],'IOUTHL'].values[0]
-            wide_names.append("Layer_"+str(lay_dum))
+        wide_names=["Layer_"+str(lay+1) for lay in layers_dum]
 
+        sim_dum_wide=sim_wide.reindex(columns=IDs_dum)
         sim_dum_wide.columns = wide_names
         sim_dum_wide["Date"]=sim_dum_wide.index
 
         sim_dum_wide=sim_dum_wide[["Date"] + wide_names].reset_index(drop=True)
-        if sim_dum.shape[0] > 0:
+        if len(IDs_dum) > 0 and sim_dum_wide.shape[0] > 0:
 
             #Let's calculate weighted average
-            avg_w=sim_dum_wide.iloc[:,1]*0
-            for i in range(len(IDs_dum)):
-                avg_w=avg_w+(sim_dum_wide['Layer_'+str(i+1)]*w[i])
-            sim_dum_wide["Avg_w"]=avg_w
+            sim_dum_wide["Avg_w"]=sim_dum_wide[wide_names].values @ w
 
-            #Let's prepare dates to join dataframes
-
-            # sim_dum_wide.loc[:,"Year_Month"]=pd.to_datetime(sim_dum_wide.Date.dt.strftime('%Y/%m'))
-            sim_dum_wide.loc[:,"Year_Month"]=sim_dum_wide.Date.dt.strftime('%Y/%m')
-
-            # gwl_dum.loc[:,"Year_Month"]=pd.to_datetime(gwl_dum.Date.dt.strftime('%Y/%m'))
-            gwl_dum.loc[:,"Year_Month"]=gwl_dum.Date.dt.strftime('%Y/%m')
-
-            all_wide=pd.merge(sim_dum_wide, gwl_dum[["Year_Month",'WSE']], on="Year_Month", how='left')
+            #Let's match simulated and observed heads for the same year and month
+            all_wide=iwfm.match_obs_sim(sim_dum_wide, gwl_dum[["Date", "WSE"]], keys=["Month", "Year"], how='left')
+            all_wide=all_wide.drop(columns=["Date_y"]).rename(columns={"Date_x": "Date"})
 
             #Let's export to csv
             all_wide.to_csv(os.path.join(dir_out,well+".csv"))
@@ -292,8 +209,8 @@ def CASGEM_hyds(gwe_path,wells_df,gwhyd_sim,dir_out,sim_period,y_range,stations_
 
             ax = gwl_dum.plot(x='Date',y='WSE',marker='o',linestyle = 'None',title=well)
             #Let's plot the rest of the series
-            for i in range(len(IDs_dum)):
-                sim_dum_wide.plot(ax=ax, x='Date', y='Layer_'+str(i+1))
+            for wide_name in wide_names:
+                sim_dum_wide.plot(ax=ax, x='Date', y=wide_name)
 
             #If there is more than one layer and less than nlay, we add weighted average
             if (len(IDs_dum)>1) and (len(IDs_dum)<nlay):
@@ -322,18 +239,18 @@ def CASGEM_hyds(gwe_path,wells_df,gwhyd_sim,dir_out,sim_period,y_range,stations_
             # Let's remove rows with nas
             all_wide_dum = all_wide[~all_wide['WSE'].isna()]
             #Now, let's draw scatterplots for the layers
-            for i in range(len(IDs_dum)):
+            for wide_name in wide_names:
 
-                r2 = sklearn.metrics.r2_score(all_wide_dum['WSE'], all_wide_dum['Layer_'+str(i+1)])
+                r2 = sklearn.metrics.r2_score(all_wide_dum['WSE'], all_wide_dum[wide_name])
                 #axis limits
-                lb=np.min(all_wide_dum[['WSE','Layer_'+str(i+1)]].min().values)
-                ub=np.max(all_wide_dum[['WSE','Layer_'+str(i+1)]].max().values)
+                lb=np.min(all_wide_dum[['WSE',wide_name]].min().values)
+                ub=np.max(all_wide_dum[['WSE',wide_name]].max().values)
 
                 #Let's turn into integers
                 lb=(round(lb/5)-1)*5
                 ub=(round(ub/5)+1)*5
 
-                ax = all_wide_dum.plot.scatter(x='WSE', y='Layer_'+str(i+1), title=well+" Layer "+str(i+1))
+                ax = all_wide_dum.plot.scatter(x='WSE', y=wide_name, title=well+" "+wide_name.replace("_", " "))
                 ax.axline((1, 1), slope=1, color='g')
 
                 #Let's add text
@@ -345,7 +262,7 @@ def CASGEM_hyds(gwe_path,wells_df,gwhyd_sim,dir_out,sim_period,y_range,stations_
                 ax.set_xlim(lb,ub)
                 ax.set_ylim(lb, ub)
                 fig = ax.get_figure()
-                fig.savefig(os.path.join(dir_out, "OBS_vs_SIM_" + well +"_Layer_"+str(i+1)+ ".png"))
+                fig.savefig(os.path.join(dir_out, "OBS_vs_SIM_" + well +"_"+wide_name+ ".png"))
                 fig.clear()
 
             #Now, we do the same for the average
@@ -375,20 +292,10 @@ def CASGEM_hyds(gwe_path,wells_df,gwhyd_sim,dir_out,sim_period,y_range,stations_
 
 
 
-    #Let's subset now all the observations that will be useful
-    OBS=gwl[gwl.WELL_NAME.isin(IWFM_in_CASGEM)|gwl.SWN.isin(IWFM_in_CASGEM)].copy().reset_index(drop=True)
-
-    #Now, let's filter for records which are in the simulation period of the model
-    OBS=OBS[(OBS.Date >= sim_period.loc[0, 'Date']) & (OBS.Date <= sim_period.loc[1, 'Date'])].reset_index(drop=True)
-
-    #Let's remove rows for which we don't have water level records
-    OBS=OBS[~OBS.WSE.isnull()].reset_index(drop=True)
-
-    #Let's fix names
-    OBS['Name']=""
-    OBS.loc[OBS.WELL_NAME.isin(IWFM_in_CASGEM), "Name"] = OBS.loc[OBS.WELL_NAME.isin(IWFM_in_CASGEM), "WELL_NAME"]
-    OBS.loc[(OBS.SWN.isin(IWFM_in_CASGEM)) & (OBS.Name == ""), "Name"] = OBS.loc[
-        (OBS.SWN.isin(IWFM_in_CASGEM)) & (OBS.Name == ""), "SWN"]
+    #Let's subset now all the observations that will be useful: matched records in the
+    #simulation period of the model, with water level records. Name is the IWFM well name
+    OBS=gwl[gwl.Name.notna() & (gwl.Date >= sim_period.loc[0, 'Date']) & (gwl.Date <= sim_period.loc[1, 'Date'])
+        & ~gwl.WSE.isnull()].reset_index(drop=True)
 
     return IWFM_in_CASGEM, IWFM_not_in_CASGEM, CASGEM_not_in_IWFM, CASGEM_outside_range, OBS, ranges
 
@@ -20,7 +20,13 @@
 # -- IWFM model class -------------------------------------
 from iwfm.iwfm_model import iwfm_model
 from iwfm.gw_well_lay_elev import gw_well_lay_elev
+from iwfm.fe_weights import fe_weights
+from iwfm.fe_weights import fe_geometry
+from iwfm.fe_weights import fe_locate
+from iwfm.fe_weights import fe_local
+from iwfm.well_layers import well_layers
 from iwfm.idw import idw
+from iwfm.idw import idw_weights
 
 # -- IWFM model file ---------------------------------------
 from iwfm.iwfm_read_model_file import iwfm_read_model_file
@@ -71,17 +77,24 @@ from iwfm.read_sim_hyds_df import read_sim_hyds_df
 
 # -- IWFM land use methods --------------------------------
 from iwfm.iwfm_adj_crops import iwfm_adj_crops
+from iwfm.iwfm_adj_crops_batch import iwfm_adj_crops_batch
 from iwfm.iwfm_lu2sub import iwfm_lu2sub
 from iwfm.read_lu_file import read_lu_file
+from iwfm.read_lu_array import read_lu_array
+from iwfm.read_lu_array import read_lu_arrays
 from iwfm.write_lu2file import write_lu2file
 from iwfm.lu2tables import lu2tables
 from iwfm.lu2csv import lu2csv
+from iwfm.lu2csv_dir import lu2csv_dir
 
 # -- IWFM land use file changes for scenarios -------------
 from iwfm.iwfm_lu4scenario import iwfm_lu4scenario
 from iwfm.get_change_col import get_change_col
 from iwfm.read_lu_change_zones import read_lu_change_zones
 from iwfm.read_lu_change_factors import read_lu_change_factors
+from iwfm.lu_change import lu_change
+from iwfm.lu_change import lu_zone_factors
+from iwfm.lu_change import round2
 from iwfm.iwfm_precip_adj import iwfm_precip_adj
 
 # -- igsm file methods ------------------------------------
@@ -101,10 +114,13 @@ from iwfm.match_obs_sim import match_obs_sim
 
 # --- plotting methods --for IWFM output ------------------
 from iwfm.read_obs_smp import read_obs_smp
+from iwfm.read_smp import read_smp
+from iwfm.gw_hyd_info import gw_hyd_info
 from iwfm.read_sim_wells import read_sim_wells
 from iwfm.read_sim_wells_df import read_sim_wells_df
 from iwfm.read_sim_hyds import read_sim_hyds
 from iwfm.hyd_diff import hyd_diff
+from iwfm.gw_plot_context import gw_plot_context
 from iwfm.gw_plot_draw import gw_plot_draw
 from iwfm.gw_plot_noobs_draw import gw_plot_noobs_draw
 from iwfm.gw_plot_noobs import gw_plot_noobs
@@ -127,14 +143,18 @@ from iwfm.headall2ts import headall2ts
 from iwfm.get_heads_4_date import get_heads_4_date
 
 # -- finite-element methods -------------------------------
+from iwfm.elem_poly_array import elem_poly_array
 from iwfm.elem_poly_coords import elem_poly_coords
+from iwfm.elem_polygons import elem_polygons
 from iwfm.iwfm_nearest_nodes import iwfm_nearest_nodes
 from iwfm.nearest_node import nearest_node
+from iwfm.node_tree import node_tree
 from iwfm.nearest import nearest
 from iwfm.in_element import in_element
 
 # -- text file methods -------------------------------------
 from iwfm.write_2_dat import write_2_dat
+from iwfm.format_table import format_table
 from iwfm.skip_ahead import skip_ahead
 from iwfm.pad_front import pad_front
 from iwfm.pad_back import pad_back
@@ -170,6 +190,7 @@ from iwfm.pdf_setfont import pdf_setfont
 from iwfm.pdf_cell import pdf_cell
 from iwfm.pdf_addimage import pdf_addimage
 from iwfm.pdf_save import pdf_save
+from iwfm.pdf_bookmarks import pdf_bookmarks
 from iwfm.pdf2csv import pdf2csv
 
 # -- file system methods ----------------------------------
@@ -183,10 +204,12 @@ from iwfm.file_dir import file_dir
 from iwfm.file_2_bak import file_2_bak
 from iwfm.file_type_error import file_type_error
 from iwfm.file_get_path import file_get_path
+from iwfm.file_chunks import file_chunks
 
 # -- date and time methods --(using datetime module) ------
 from iwfm.dates_diff import dates_diff
 from iwfm.secs_between import secs_between
+from iwfm.text2datetime64 import text2datetime64
 from iwfm.Unbuffered import Unbuffered
 
 # -- unit conversion --------------------------------------
@@ -220,6 +243,7 @@ from iwfm.multiproc import multiproc
 
 #Groundwater methods
 from iwfm.add_wells import add_wells
+from iwfm.screen_overlap import screen_overlap
 from iwfm.read_velocities import read_velocities
 
 # -- other methods -----------------------------------------
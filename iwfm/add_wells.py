@@ -19,10 +19,6 @@
 from pyproj import Proj, transform
 import numpy as np
 import pandas as pd
-import sys
-#Path to pywfm module
-sys.path.insert(0, r'P:\Projects\5658_NSJWCD\IWRFM\PyWFM-master\PyWFM-master\src')
-import pywfm
 import iwfm
 import os
 
@@ -35,7 +31,8 @@ def add_wells(gw_file,
               nlay=4,
               wells_flag="C       ID   HYDTYP   IOUTHL         X               Y         IOUTH        Name                      Comment",
               nouth_flag="/ NOUTH",
-              output_suffix="_mod"):
+              output_suffix="_mod",
+              model=None):
     ''' add_wells() - Read IWFM Groundwater.dat file and add new wells
 
     Parameters
@@ -45,13 +42,16 @@ def add_wells(gw_file,
     New_Wells: Pandas dataframe with new wells (format of CASGEM Station.csv table)
     epsg_in: Reference system of wells in New_Wells dataframe
     nlay: number of layers in the model
-    sm_pywfm: pywfm model object
+    sm_pywfm: pywfm model object, or None if model is given
     out_path: output path for the modified IWFM Groundwater.dat file
     epsg_out: reference system we are using in the IWFM model
     nlay: number of layers of the IWFM model
     wells_flag: flag of the line before the one where the wells start
     nouth_flag: flag of the line where the nouth variable is located
     output_suffix: suffix for the modified IWFM Groundwaer.dat file
+    model: iwfm_model object, if given the layer elevations at the wells are
+        interpolated from its nodal stratigraphy with finite element weights
+        (iwfm.well_layers) instead of asking sm_pywfm for each well
 
 
 
@@ -66,62 +66,57 @@ def add_wells(gw_file,
 
     New_Wells['X'],New_Wells['Y']=transform(inProj, outProj, New_Wells['LONGITUDE'].values, New_Wells['LATITUDE'].values)
 
-    #Let's add columns for stratigraphy
-    New_Wells['top']=np.nan
-
     #Let's calculate screen top and bottom elevations
     New_Wells['screen_top']=New_Wells['GSE']-New_Wells['TOP_PRF']
 
     New_Wells['screen_bot'] = New_Wells['GSE'] - New_Wells['BOT_PRF']
 
-    #Let's create columns where we will keep track of which are the layers where the wells are screened
-    New_Wells['Layer']=''
-
     #Let's fix names
     New_Wells["Name"]=New_Wells.WELL_NAME
     New_Wells.loc[~New_Wells.SWN.isna(), "Name"] = New_Wells.loc[~New_Wells.SWN.isna(), "SWN"]
 
     #Let's drop wells for which we don't have screen depths
-    #New_Wells = New_Wells[~(New_Wells.screen_top.isna() | New_Wells.screen_bot.isna())]
-
-    for layer in range(nlay):
-        New_Wells['lay_'+str(layer+1)+'_bot'] = np.nan
-
     New_Wells = New_Wells[~(New_Wells.screen_top.isna() | New_Wells.screen_bot.isna())]
     New_Wells=New_Wells.reset_index(drop=True)
 
-    #Let's loop through wells
-    for i in range(New_Wells.shape[0]):
-        lith_dum=sm_pywfm.get_stratigraphy_atXYcoordinate(New_Wells.loc[i,'X'], New_Wells.loc[i,'Y'],3.2808)
-        New_Wells.loc[i,'top']=lith_dum[0]
-        for layer in range(nlay):
-            New_Wells.loc[i,'lay_' + str(layer + 1) + '_bot'] = lith_dum[layer + 1]
-
-            #Is the well screened in this layer?
-            #Top layer
-            if layer==0 and New_Wells.loc[i,'screen_top']>=New_Wells.loc[i,'lay_' + str(layer + 1) + '_bot']:
-                New_Wells.loc[i, 'Layer']=New_Wells.loc[i,'Layer']+str(layer+1)
-            #Rest of the layers
-            if layer > 0:
-                #The screen will be in the layer in all the cases except when both the top and bottom of the screen are above
-                #or below the layer
-                if not ((New_Wells.loc[i,'screen_top']>New_Wells.loc[i,'lay_' + str(layer) + '_bot'] and
-                    New_Wells.loc[i,'screen_bot']>New_Wells.loc[i,'lay_' + str(layer) + '_bot']) or
-                    (New_Wells.loc[i,'screen_top']<New_Wells.loc[i,'lay_' + str(layer + 1) + '_bot'] and
-                    New_Wells.loc[i, 'screen_bot'] < New_Wells.loc[i, 'lay_' + str(layer + 1) + '_bot'])):
-                    New_Wells.loc[i, 'Layer'] = New_Wells.loc[i, 'Layer'] + str(layer + 1)
-
-            #Let's add 1 row per layer
-
-        while len(New_Wells.loc[i,"Layer"])>1:
-            new_row_dum=New_Wells.loc[i,:].copy()
-            #Layer we will use for the new row
-            new_row_dum["Layer"]=New_Wells.loc[i,"Layer"][-1]
-            new_row_dum["Name"]=New_Wells.loc[i,"Name"]+"_L"+new_row_dum["Layer"]
-            #Layer that will remain in the row we are iterating
-            New_Wells.loc[i, "Layer"]=New_Wells.loc[i,"Layer"][:-1]
-            #Let's add the new row ot the dataframe
-            New_Wells = pd.concat([New_Wells,new_row_dum],ignore_index=True)
+    #Let's get the stratigraphy at all the wells at once
+    if model is not None:
+        elevs = iwfm.well_layers(New_Wells['X'].values, New_Wells['Y'].values, model.d_nodexy,
+                                 model.d_elem_nodes, model.d_nodeelev)[1]
+        lith = np.column_stack([elevs[:, 0], elevs[:, 2::2][:, :nlay]])
+    else:
+        lith = np.array([sm_pywfm.get_stratigraphy_atXYcoordinate(x_dum, y_dum, 3.2808)[:nlay + 1]
+                         for x_dum, y_dum in zip(New_Wells['X'], New_Wells['Y'])], dtype=float).reshape(-1, nlay + 1)
+    New_Wells['top'] = lith[:, 0]
+    for layer in range(nlay):
+        New_Wells['lay_'+str(layer+1)+'_bot'] = lith[:, layer + 1]
+
+    #Is each well screened in each layer? In all the cases except when both the top and
+    #bottom of the screen are above or below the layer (top layer: screen top above its bottom)
+    screen_top = New_Wells['screen_top'].values.astype(float)[:, None]
+    screen_bot = New_Wells['screen_bot'].values.astype(float)[:, None]
+    lay_bot = lith[:, 1:]
+    lay_above = lith[:, :-1]
+    screened = ~(((screen_top > lay_above) & (screen_bot > lay_above)) |
+                 ((screen_top < lay_bot) & (screen_bot < lay_bot)))
+    screened[:, 0] = screen_top[:, 0] >= lay_bot[:, 0]
+
+    #Let's drop wells that are not screened in any layer
+    New_Wells = New_Wells[screened.any(axis=1)].reset_index(drop=True)
+    screened = screened[screened.any(axis=1)]
+
+    #Let's add 1 row per layer: the first layer stays in the well's row, the rest are added
+    #after all the wells, named with a layer suffix
+    first = screened.argmax(axis=1)
+    New_Wells['Layer'] = (first + 1).astype(str)
+    extra = screened.copy()
+    extra[np.arange(len(first)), first] = False
+    well_i, layer_i = np.nonzero(extra[:, ::-1])
+    layer_i = nlay - 1 - layer_i
+    extra_rows = New_Wells.iloc[well_i].reset_index(drop=True)
+    extra_rows['Layer'] = (layer_i + 1).astype(str)
+    extra_rows['Name'] = extra_rows['Name'] + "_L" + extra_rows['Layer']
+    New_Wells = pd.concat([New_Wells, extra_rows], ignore_index=True)
 
     New_Wells_mini=New_Wells[['Layer','X','Y','Name']].copy()
 
@@ -29,6 +29,7 @@ def draw_plot(
     start_date,
     title_words,
     yaxis_width=-1,
+    pdf=None,
 ):
     ''' draw_plot() - Creates a PDF file with a graph of the simulated data vs time
         for all hydrographs as lines, with observed values vs time as dots, saved 
@@ -67,6 +68,10 @@ def draw_plot(
     yaxis_width : int, default=-1
         minimum y-axis width, -1 for automatic
     
+    pdf : PdfPages object, default=None
+        open multi-page PDF to add this plot to as one page, or None to
+        save the plot to its own PDF file
+    
     Return
     ------
     nothing
@@ -82,6 +87,7 @@ def draw_plot(
     import matplotlib.dates as mdates
     import matplotlib.pyplot as plt
     from matplotlib.backends.backend_pdf import PdfPages
+    from contextlib import nullcontext
 
     line_colors = [
         'r-',
@@ -139,7 +145,11 @@ def draw_plot(
     yearsFmt = mdates.DateFormatter('%Y')
 
     # plot simulated vs sim_dates as line, and meas vs specific dates as points, on one plot
-    with PdfPages(well_name + '_' + iwfm.pad_front(col, 4, '0') + '.pdf') as pdf:
+    if pdf is None:  # save plot to the_well_name.pdf
+        pdf_out = PdfPages(well_name + '_' + iwfm.pad_front(col, 4, '0') + '.pdf')
+    else:            # add plot as the next page of the open PDF
+        pdf_out = nullcontext(pdf)
+    with pdf_out as pdf_page:
         fig = plt.figure(figsize=(10, 7.5))
         ax = plt.subplot(111)
         ax.xaxis_date()
@@ -165,6 +175,6 @@ def draw_plot(
             plt.plot(sim_dates[j], sim_heads[j], line_colors[j], label=gwhyd_name[j])
 
         leg = ax.legend(frameon=1, facecolor='white')
-        pdf.savefig()  # saves the current figure into a pdf page
+        pdf_page.savefig()  # saves the current figure into a pdf page
         plt.close()
     return 
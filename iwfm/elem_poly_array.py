@@ -0,0 +1,66 @@
+# elem_poly_array.py
+# Array of closed element polygon coordinates gathered by node index
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def elem_poly_array(elem_nodes, node_coords):
+    ''' elem_poly_array() - Return the closed polygon coordinates of all 
+        elements as one (elements, 5, 2) array, gathered from the node 
+        coordinates by node index. Quadrilaterals are [n0,n1,n2,n3,n0], 
+        triangles [n0,n1,n2,n0] followed by n0 again as padding
+
+    Parameters
+    ----------
+    elem_nodes : list or dictionary
+        nodes of each element (3 or 4 nodes, or 4 with 0 as the last node
+        of triangles), or dictionary with key = element number
+    
+    node_coords : list or dictionary
+        X and Y coordinates of each node in node order (node 1 first), or
+        dictionary with key = node number, value = [x, y]
+
+    Returns
+    -------
+    coords : numpy float array
+        (elements, 5, 2) polygon coordinates
+
+    nverts : numpy int array
+        number of vertices of each element, 3 or 4; the closed ring of 
+        element i is coords[i, :nverts[i] + 1]
+    
+    '''
+    import numpy as np
+
+    if isinstance(elem_nodes, dict):
+        elem_nodes = list(elem_nodes.values())
+    conn = np.array([(list(nodes) + [0])[:4] for nodes in elem_nodes], dtype=np.int64).reshape(-1, 4)
+    nverts = np.where(conn[:, 3] > 0, 4, 3)
+
+    # -- node number -> row of xy
+    if isinstance(node_coords, dict):
+        node_nos = np.fromiter(node_coords.keys(), dtype=np.int64, count=len(node_coords))
+        xy = np.array([node_coords[n][:2] for n in node_nos], dtype=float).reshape(-1, 2)
+        lookup = np.zeros(max(node_nos.max(initial=0), conn.max(initial=0)) + 1, dtype=np.int64)
+        lookup[node_nos] = np.arange(len(node_nos))
+    else:
+        xy = np.array([c[:2] for c in node_coords], dtype=float).reshape(-1, 2)
+        lookup = np.arange(-1, len(xy))  # node n is row n - 1
+
+    # -- ring node order: close triangles at the fourth vertex, pad with the first node
+    ring = np.column_stack([conn[:, :3], np.where(nverts == 4, conn[:, 3], conn[:, 0]), conn[:, 0]])
+    coords = xy[lookup[ring]]
+    return coords, nverts
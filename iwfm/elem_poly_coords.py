@@ -23,11 +23,12 @@ def elem_poly_coords(elem_nodes, node_coords):
 
     Parameters
     ----------
-    elem_nodes : list
+    elem_nodes : list or dictionary
         list of elements and associated nodes
     
-    node_coords : list
-        list of nodes and associated X and Y coordinates
+    node_coords : list or dictionary
+        list of nodes and associated X and Y coordinates, or dictionary
+        with key = node number
 
     Returns
     -------
@@ -35,19 +36,8 @@ def elem_poly_coords(elem_nodes, node_coords):
         list of polygon coordinates
     
     '''
-    polys = []
+    import iwfm as iwfm
 
-    for i in range(0, len(elem_nodes)):  # for each element ...
-        coords = []
-        for j in range(0, len(elem_nodes[i])):  # for each node in the element ...
-            coords.append(
-                (
-                    node_coords[elem_nodes[i][j] - 1][0],
-                    node_coords[elem_nodes[i][j] - 1][1],
-                )
-            )
-        coords.append(
-            (node_coords[elem_nodes[i][0] - 1][0], node_coords[elem_nodes[i][0] - 1][1])
-        )  # close the polygon
-        polys.append(coords)
+    coords, nverts = iwfm.elem_poly_array(elem_nodes, node_coords)
+    polys = [list(map(tuple, ring[:n + 1])) for ring, n in zip(coords.tolist(), nverts.tolist())]
     return polys
@@ -21,13 +21,6 @@ def elem_poly_coords_wkt(elem_nodes, node_coords):
     ''' elem_poly_coords_wkt() - Return a list ofelement coordinates 
         in WKT form: ['POLYGON ((X0 Y0, X1 Y1, X2 Y2, X3 Y3, X0 Y0)),'<,...>]
 
-    TODO:
-      - change i from range to enumerate
-      - change polys to WKT format:
-      ['POLYGON ((X0 Y0, X1 Y1, X2 Y2, X3 Y3, X0 Y0))',
-       'POLYGON ((X0 Y0, X1 Y1, X2 Y2, X3 Y3, X0 Y0))',
-        etc...  
-
     Parameters
     ----------
     elem_nodes : list
@@ -39,22 +32,11 @@ def elem_poly_coords_wkt(elem_nodes, node_coords):
     Returns
     -------
     polys : list
-        list of polygon coordinates
+        list of polygon WKT strings
 
     '''
-    polys = []
+    import shapely
+    import iwfm as iwfm
 
-    for i in range(0, len(elem_nodes)):  # for each element ...
-        coords = []
-        for j in range(0, len(elem_nodes[i])):  # for each node in the element ...
-            coords.append(
-                (
-                    node_coords[elem_nodes[i][j] - 1][0],
-                    node_coords[elem_nodes[i][j] - 1][1],
-                )
-            )
-        coords.append(
-            (node_coords[elem_nodes[i][0] - 1][0], node_coords[elem_nodes[i][0] - 1][1])
-        )  # close the polygon
-        polys.append(coords)
+    polys = list(shapely.to_wkt(iwfm.elem_polygons(elem_nodes, node_coords), rounding_precision=-1, trim=True))
     return polys
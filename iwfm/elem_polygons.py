@@ -0,0 +1,55 @@
+# elem_polygons.py
+# Shapely polygons of all model elements created in bulk
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def elem_polygons(elem_nodes, node_coords):
+    ''' elem_polygons() - Return shapely polygons of all elements, created
+        in one call with shapely 2 (one at a time with older shapely)
+
+    Parameters
+    ----------
+    elem_nodes : list or dictionary
+        nodes of each element, as for iwfm.elem_poly_array()
+    
+    node_coords : list or dictionary
+        node X and Y coordinates, as for iwfm.elem_poly_array()
+
+    Returns
+    -------
+    polygons : numpy object array
+        shapely Polygon of each element, in element order
+    
+    '''
+    import numpy as np
+    import shapely
+    import iwfm as iwfm
+
+    coords, nverts = iwfm.elem_poly_array(elem_nodes, node_coords)
+
+    if int(shapely.__version__.split('.')[0]) >= 2:
+        # rings of different lengths as one flat array with a ring index per point
+        keep = np.arange(5) <= nverts[:, None]
+        ring_index = np.repeat(np.arange(len(nverts)), nverts + 1)
+        rings = shapely.linearrings(coords[keep], indices=ring_index)
+        return shapely.polygons(rings)
+
+    from shapely.geometry import Polygon
+    polygons = np.empty(len(nverts), dtype=object)
+    for i in range(len(nverts)):
+        polygons[i] = Polygon(coords[i, :nverts[i] + 1])
+    return polygons
@@ -0,0 +1,282 @@
+# fe_weights.py
+# Locate points in model elements and return finite element interpolation weights
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+# bilinear element corners in local (xi, eta) coordinates, in node order
+FE_XI = (-1.0, 1.0, 1.0, -1.0)
+FE_ETA = (-1.0, -1.0, 1.0, 1.0)
+
+
+def fe_weights(x, y, d_nodexy, d_elem_nodes, elems=None, geometry=None):
+    ''' fe_weights() - Find the element containing each point and the finite
+        element shape function weights of the element nodes at the point,
+        for all points at once. Triangles use linear (barycentric) weights,
+        quadrilaterals bilinear weights, as IWFM does. A value at the points
+        is then (weights * node_values[nodes]).sum(axis=1)
+
+    Parameters
+    ----------
+    x, y : array-like
+        point coordinates
+
+    d_nodexy : dictionary
+        key = node number, value = [x, y]
+
+    d_elem_nodes : dictionary
+        key = element number, value = list of 3 or 4 node numbers
+
+    elems : array-like, optional
+        element containing each point if already known, else found here
+
+    geometry : tuple, optional
+        fe_geometry(d_nodexy, d_elem_nodes), to reuse across calls
+
+    Returns
+    -------
+    elems : numpy int array
+        element number containing each point, 0 if in none
+
+    nodes : numpy int array
+        (points, 4) node numbers of the element, 0 for the missing node of
+        a triangle and for points outside the model
+
+    weights : numpy float array
+        (points, 4) weight of each node, rows sum to 1, nan outside the model
+
+    '''
+    import numpy as np
+
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    y = np.atleast_1d(np.asarray(y, dtype=float))
+    if geometry is None:
+        geometry = fe_geometry(d_nodexy, d_elem_nodes)
+    e_nos, e_nodes, ex, ey, is_tri = geometry
+
+    if elems is None:
+        e_row = fe_locate(x, y, ex, ey)
+    else:
+        row_of = dict(zip(e_nos.tolist(), range(len(e_nos))))
+        e_row = np.array([row_of.get(int(e), -1) for e in np.atleast_1d(elems)], dtype=np.int64)
+
+    local = fe_local(x, y, e_row, geometry)
+    found = e_row >= 0
+    rows = e_row[found]
+    tri = np.zeros(len(x), dtype=bool)
+    tri[found] = is_tri[rows]
+    quad = found & ~tri
+
+    weights = np.full((len(x), 4), np.nan)
+    weights[tri, :3] = local[tri]
+    weights[tri, 3] = 0.0
+    xi, eta = local[quad, 0], local[quad, 1]
+    weights[quad] = 0.25 * (1 + FE_XI * xi[:, None]) * (1 + FE_ETA * eta[:, None])
+
+    nodes = np.zeros((len(x), 4), dtype=np.int64)
+    nodes[found] = e_nodes[rows]
+    elem_out = np.zeros(len(x), dtype=np.int64)
+    elem_out[found] = e_nos[rows]
+    return elem_out, nodes, weights
+
+
+def fe_geometry(d_nodexy, d_elem_nodes):
+    ''' fe_geometry() - Element vertex arrays, built once and reused by
+        fe_weights(), fe_locate(), fe_local() and in_element()
+
+    Parameters
+    ----------
+    d_nodexy : dictionary
+        key = node number, value = [x, y]
+
+    d_elem_nodes : dictionary
+        key = element number, value = list of 3 or 4 node numbers
+
+    Returns
+    -------
+    e_nos : numpy int array
+        element numbers
+
+    e_nodes : numpy int array
+        (elements, 4) node numbers, 0 as the fourth node of triangles
+
+    ex, ey : numpy float arrays
+        (elements, 4) node coordinates, triangles repeat their third node
+
+    is_tri : numpy bool array
+        True for triangles
+
+    '''
+    import numpy as np
+
+    e_nos = np.fromiter(d_elem_nodes.keys(), dtype=np.int64, count=len(d_elem_nodes))
+    e_nodes = np.array([(list(n) + [0])[:4] for n in d_elem_nodes.values()], dtype=np.int64)
+    e_nodes = e_nodes.reshape(-1, 4)
+    is_tri = e_nodes[:, 3] == 0
+    e_full = np.where(is_tri[:, None], e_nodes[:, [0, 1, 2, 2]], e_nodes)
+
+    node_nos = np.fromiter(d_nodexy.keys(), dtype=np.int64, count=len(d_nodexy))
+    node_xy = np.array([d_nodexy[n][:2] for n in node_nos], dtype=float).reshape(-1, 2)
+    lookup = np.zeros(max(node_nos.max(initial=0), e_full.max(initial=0)) + 1, dtype=np.int64)
+    lookup[node_nos] = np.arange(len(node_nos))
+    ex, ey = node_xy[lookup[e_full], 0], node_xy[lookup[e_full], 1]
+    return e_nos, e_nodes, ex, ey, is_tri
+
+
+def fe_local(x, y, e_row, geometry):
+    ''' fe_local() - Local coordinates of points in their elements:
+        barycentric (l1, l2, l3) in triangles, bilinear (xi, eta, nan) in
+        quadrilaterals, from a vectorized Newton inversion of the
+        isoparametric map
+
+    Parameters
+    ----------
+    x, y : numpy arrays
+        point coordinates
+
+    e_row : numpy int array
+        row in geometry of the element containing each point, -1 if none
+
+    geometry : tuple
+        fe_geometry() arrays
+
+    Returns
+    -------
+    local : numpy float array
+        (points, 3) local coordinates, nan for points in no element
+
+    '''
+    import numpy as np
+
+    e_nos, e_nodes, ex, ey, is_tri = geometry
+    local = np.full((len(x), 3), np.nan)
+    found = e_row >= 0
+    tri = np.zeros(len(x), dtype=bool)
+    tri[found] = is_tri[e_row[found]]
+
+    # -- triangles: barycentric coordinates
+    if tri.any():
+        r = e_row[tri]
+        x0, y0 = ex[r, 0], ey[r, 0]
+        d1x, d1y = ex[r, 1] - x0, ey[r, 1] - y0
+        d2x, d2y = ex[r, 2] - x0, ey[r, 2] - y0
+        px, py = x[tri] - x0, y[tri] - y0
+        det = d1x * d2y - d2x * d1y
+        l2 = (px * d2y - d2x * py) / det
+        l3 = (d1x * py - px * d1y) / det
+        local[tri] = np.column_stack([1.0 - l2 - l3, l2, l3])
+
+    # -- quadrilaterals: invert the bilinear map to (xi, eta) by Newton's method
+    quad = found & ~tri
+    if quad.any():
+        r = e_row[quad]
+        qx, qy = ex[r], ey[r]
+        px, py = x[quad], y[quad]
+        sx, sy = np.array(FE_XI), np.array(FE_ETA)
+        xi, eta = np.zeros(len(r)), np.zeros(len(r))
+        for _ in range(20):
+            n = 0.25 * (1 + sx * xi[:, None]) * (1 + sy * eta[:, None])
+            dn_dxi = 0.25 * sx * (1 + sy * eta[:, None])
+            dn_deta = 0.25 * sy * (1 + sx * xi[:, None])
+            fx = (n * qx).sum(axis=1) - px
+            fy = (n * qy).sum(axis=1) - py
+            j11, j12 = (dn_dxi * qx).sum(axis=1), (dn_deta * qx).sum(axis=1)
+            j21, j22 = (dn_dxi * qy).sum(axis=1), (dn_deta * qy).sum(axis=1)
+            det = j11 * j22 - j12 * j21
+            dxi = (j22 * fx - j12 * fy) / det
+            deta = (j11 * fy - j21 * fx) / det
+            xi, eta = xi - dxi, eta - deta
+            if max(np.abs(dxi).max(), np.abs(deta).max()) < 1e-12:
+                break
+        local[quad, 0] = np.clip(xi, -1.0, 1.0)
+        local[quad, 1] = np.clip(eta, -1.0, 1.0)
+    return local
+
+
+def fe_locate(x, y, ex, ey):
+    ''' fe_locate() - Row of the (convex) element containing each point, -1
+        if in none. Candidate elements come from a uniform grid of element
+        bounding boxes, then all point-element pairs are tested at once
+
+    Parameters
+    ----------
+    x, y : numpy arrays
+        point coordinates
+
+    ex, ey : numpy arrays
+        (elements, 4) node coordinates of each element, counterclockwise or
+        clockwise, triangles with the last node repeated
+
+    Returns
+    -------
+    e_row : numpy int array
+        element row containing each point, -1 if none
+
+    '''
+    import numpy as np
+
+    nelem, npts = len(ex), len(x)
+    e_row = np.full(npts, -1, dtype=np.int64)
+    if nelem == 0 or npts == 0:
+        return e_row
+
+    # -- grid with about one element per cell
+    xmin, xmax = ex.min(axis=1), ex.max(axis=1)
+    ymin, ymax = ey.min(axis=1), ey.max(axis=1)
+    x0, y0 = xmin.min(), ymin.min()
+    ncell = max(1, int(np.sqrt(nelem)))
+    cw = max(xmax.max() - x0, 1e-9) / ncell
+    ch = max(ymax.max() - y0, 1e-9) / ncell
+
+    def cell(v, v0, size):
+        return np.clip(((v - v0) / size).astype(np.int64), 0, ncell - 1)
+
+    ix0, ix1 = cell(xmin, x0, cw), cell(xmax, x0, cw)
+    iy0, iy1 = cell(ymin, y0, ch), cell(ymax, y0, ch)
+
+    # -- (cell, element) pairs for every cell an element's box covers
+    nx, ny = ix1 - ix0 + 1, iy1 - iy0 + 1
+    count = nx * ny
+    pair_elem = np.repeat(np.arange(nelem), count)
+    k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    pair_cell = (iy0[pair_elem] + k // nx[pair_elem]) * ncell + ix0[pair_elem] + k % nx[pair_elem]
+    order = np.argsort(pair_cell, kind='stable')
+    cell_elems = pair_elem[order]
+    cell_start = np.searchsorted(pair_cell[order], np.arange(ncell * ncell + 1))
+
+    # -- candidate (point, element) pairs from the cell of each point
+    inside = (x >= x0) & (x <= x0 + cw * ncell) & (y >= y0) & (y <= y0 + ch * ncell)
+    pcell = np.where(inside, cell(y, y0, ch) * ncell + cell(x, x0, cw), 0)
+    lo, hi = cell_start[pcell], cell_start[pcell + 1]
+    ncand = np.where(inside, hi - lo, 0)
+    cand_pt = np.repeat(np.arange(npts), ncand)
+    k = np.arange(ncand.sum()) - np.repeat(np.cumsum(ncand) - ncand, ncand)
+    cand_el = cell_elems[np.repeat(lo, ncand) + k]
+
+    # -- point in convex polygon: same side of every edge (zero-length edges ignored)
+    px, py = x[cand_pt, None], y[cand_pt, None]
+    ax, ay = ex[cand_el], ey[cand_el]
+    bx, by = np.roll(ax, -1, axis=1), np.roll(ay, -1, axis=1)
+    cross = (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+    scale = np.abs(bx - ax) + np.abs(by - ay)
+    tol = 1e-9 * scale * (np.abs(px - ax) + np.abs(py - ay))
+    hit = ((cross >= -tol) | (scale == 0)).all(axis=1) | ((cross <= tol) | (scale == 0)).all(axis=1)
+
+    # -- first containing element of each point
+    cand_pt, cand_el = cand_pt[hit], cand_el[hit]
+    first = np.unique(cand_pt, return_index=True)[1]
+    e_row[cand_pt[first]] = cand_el[first]
+    return e_row
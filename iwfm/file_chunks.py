@@ -0,0 +1,65 @@
+# file_chunks.py
+# Split a text file into byte ranges that start and end on line boundaries
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def file_chunks(filename, nchunks, skip_lines=0):
+    ''' file_chunks() - Split a text file into about nchunks byte ranges of
+        similar size that start and end on line boundaries, so that each 
+        range can be read by a separate process
+
+    Parameters
+    ----------
+    filename : str
+        file name
+
+    nchunks : int
+        number of byte ranges wanted
+
+    skip_lines : int, default=0
+        number of lines at the top of the file (such as headers) to leave
+        out of the byte ranges
+
+    Returns
+    -------
+    chunks : list
+        list of (start, end) byte offsets, in file order
+
+    '''
+    import os
+
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        for i in range(skip_lines):
+            f.readline()
+        start = f.tell()
+
+        bounds = [start]
+        for i in range(1, max(nchunks, 1)):
+            pos = start + (size - start) * i // nchunks
+            if pos <= bounds[-1]:
+                continue
+            f.seek(pos)
+            f.readline()  # move to the start of the next line
+            pos = f.tell()
+            if pos >= size:
+                break
+            bounds.append(pos)
+        bounds.append(size)
+
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) 
+        if bounds[i + 1] > bounds[i]]
@@ -0,0 +1,205 @@
+# format_table.py
+# Format a table of numbers as text for IWFM input files, all values at once
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def format_table(values, decimals=2, width=None, ids=None, id_width=None,
+                 sep='\t', lead='', end='\n', labels=None):
+    ''' format_table() - Format a (rows, columns) table of numbers as text,
+        each row as label + lead + id + sep + values joined by sep + end. The digits
+        of all values are built at once in a byte array, so the text is the
+        same as formatting each value with Python but much faster
+
+        Example:
+          # same as write_lu2file(): '\t1\t12.5\t0.0\t\n'
+          text = format_table(block, ids=elems, lead='\t', end='\t\n')
+          # same as f'{j:6d} ' + f'{v:20.4f} '...: '     1              12.5000 \n'
+          text = format_table(block, 4, 20, ids=elems, id_width=6, sep=' ', end=' \n')
+
+    Parameters
+    ----------
+    values : array-like
+        (rows, columns) numbers
+
+    decimals : int, default=2
+        number of decimal places
+
+    width : int, optional
+        None = shortest text of each value rounded to decimals, as
+        str(round(value, decimals)) (an integer if decimals=0), else
+        right-aligned in width characters with all decimals, as
+        f'{value:{width}.{decimals}f}'
+
+    ids : array-like, optional
+        integer written before the values of each row (e.g. element numbers)
+
+    id_width : int, optional
+        ids right-aligned in id_width characters, None = no padding
+
+    sep : str, default='\t'
+        text between the id and values
+
+    lead, end : str, default='' and '\n'
+        text at the start and end of each row
+
+    labels : list, optional
+        text written first in each row (e.g. dates)
+
+    Returns
+    -------
+    text : str
+        formatted rows
+
+    '''
+    import numpy as np
+
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    nrows = values.shape[0]
+    if nrows == 0:
+        return ''
+
+    parts = [_text_bytes(lead, nrows)]
+    if labels is not None:  # padded with 0 bytes
+        label_bytes = np.array([label.encode('ascii') for label in labels], dtype=bytes)
+        parts.insert(0, label_bytes.view(np.uint8).reshape(nrows, -1))
+    if ids is not None:
+        chars = _number_bytes(np.asarray(ids, dtype=float).reshape(-1, 1), 0, id_width, sep)
+        parts.append(None if chars is None else chars.reshape(nrows, -1))
+    chars = _number_bytes(values, decimals, width, sep)
+    if chars is not None:
+        chars[:, -1, chars.shape[2] - len(sep):] = 0  # no sep after the last value
+        chars = chars.reshape(nrows, -1)
+    parts.append(chars)
+    parts.append(_text_bytes(end, nrows))
+
+    # -- values Python would write in exponent form, or wider than width,
+    #    are formatted one at a time
+    if any(part is None for part in parts):
+        if width is None:
+            words = [[str(round(v, decimals or None)) for v in row] for row in values.tolist()]
+        else:
+            words = [[f'{v:{width}.{decimals}f}' for v in row] for row in values.tolist()]
+        id_text = [''] * nrows if ids is None else [f'{int(i):{id_width or ""}d}' + sep
+            for i in np.asarray(ids).tolist()]
+        labels = [''] * nrows if labels is None else labels
+        return ''.join(label + lead + i + sep.join(row) + end
+            for label, i, row in zip(labels, id_text, words))
+
+    text = np.concatenate(parts, axis=1).ravel()
+    return text[text != 0].tobytes().decode('ascii')
+
+
+def _text_bytes(text, nrows):
+    ''' _text_bytes() - (nrows, len(text)) byte array of text in every row '''
+    import numpy as np
+
+    row = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    return np.broadcast_to(row, (nrows, len(row)))
+
+
+_digit_tables = {}  # (digits, pad byte, strip) : (10**digits, digits) bytes
+
+
+def _digit_table(ndigits, pad, strip=False):
+    ''' _digit_table() - Bytes of every number below 10**ndigits, zero padded,
+        or with leading (strip=False) or trailing (strip=True) zeros after
+        the first digit replaced by pad '''
+    import numpy as np
+
+    key = (ndigits, pad, strip)
+    if key not in _digit_tables:
+        numbers = np.arange(10 ** ndigits)[:, None]
+        powers = 10 ** np.arange(ndigits - 1, -1, -1)
+        table = ((numbers // powers) % 10 + ord('0')).astype(np.uint8)
+        if pad is not None and not strip:  # leading zeros, keep the last digit
+            table[(numbers < powers) & (powers > 1)] = pad
+        elif pad is not None:              # trailing zeros, keep the first digit
+            table[(numbers % (powers * 10) == 0) & (powers < 10 ** (ndigits - 1))] = pad
+        _digit_tables[key] = table
+    return _digit_tables[key]
+
+
+def _number_bytes(values, decimals, width, sep):
+    ''' _number_bytes() - (rows, columns, field) bytes of each number, right
+        aligned in width and followed by sep. Without width, bytes that are
+        not written are 0. None if a number does not fit '''
+    import numpy as np
+
+    # -- value * 10**decimals must be an exact integer in a float64
+    if not np.isfinite(values).all() or np.abs(values).max(initial=0) * 10.0 ** decimals >= 2 ** 53:
+        return None
+
+    # -- value * 10**decimals rounded as Python rounds, ties checked one at a time
+    scaled = values * 10.0 ** decimals
+    whole = np.rint(scaled)
+    near = np.abs(np.abs(scaled - whole) - 0.5) < 1e-6 + 1e-15 * np.abs(scaled)
+    if near.any():
+        whole[near] = [float(f'{v:.{decimals}f}'.replace('.', '')) for v in values[near].tolist()]
+    negative = np.signbit(whole)
+    ipart, fpart = np.divmod(np.abs(whole).astype(np.int64), 10 ** decimals)
+
+    # -- number of integer digits, at least one
+    ndigits = np.ones(values.shape, dtype=np.int64)
+    for k in range(1, len(str(ipart.max(initial=0)))):
+        ndigits += ipart >= 10 ** k
+    nchunk = -(-int(ndigits.max(initial=1)) // 4)  # 4-digit chunks
+    nfrac = decimals + 1 if decimals > 0 else 0    # '.' and decimals
+
+    if width is None:
+        pad, nint = 0, 4 * nchunk
+    else:
+        if (ndigits + negative + nfrac).max(initial=0) > width:
+            return None
+        pad, nint = ord(' '), width - 1 - nfrac
+    nsep = len(sep)
+    chars = np.full(values.shape + (1 + nint + nfrac + nsep,), pad, dtype=np.uint8)
+
+    # -- integer digits from 4-digit tables (4 bytes gathered as one uint32),
+    #    leading zeros padded
+    padded = _digit_table(4, pad).view(np.uint32).ravel()
+    zeros = _digit_table(4, None).view(np.uint32).ravel()
+    blank = np.full(4, pad, dtype=np.uint8).view(np.uint32)[0]
+    block = np.empty(values.shape + (nchunk,), dtype=np.uint32)
+    for j in range(nchunk):
+        power = 10 ** (4 * (nchunk - 1 - j))
+        chunk = (ipart // power) % 10000 if j < nchunk - 1 else ipart % 10000
+        if j == 0:  # no digits before the first chunk
+            block[..., j] = padded[chunk]
+        else:
+            block[..., j] = np.where(ipart < power * 10000, padded[chunk], zeros[chunk])
+        if power > 1:
+            block[..., j][ipart < power] = blank
+    take = min(nint, 4 * nchunk)
+    block = block.view(np.uint8).reshape(values.shape + (4 * nchunk,))
+    chars[..., 1 + nint - take:1 + nint] = block[..., 4 * nchunk - take:]
+
+    # -- sign just before the first digit
+    where = np.nonzero(negative)
+    chars[where + (nint - ndigits[where],)] = ord('-')
+
+    # -- decimal point and decimals, trailing zeros dropped without width
+    if decimals > 0:
+        chars[..., 1 + nint] = ord('.')
+        strip = _digit_table(decimals, 0 if width is None else None, strip=True)
+        if decimals in (2, 4):  # gather the decimals as one integer
+            strip = strip.view(f'u{decimals}').ravel()
+            chars[..., 2 + nint:2 + nint + decimals] = strip[fpart][..., None].view(np.uint8)
+        else:
+            chars[..., 2 + nint:2 + nint + decimals] = strip[fpart]
+
+    chars[..., chars.shape[-1] - nsep:] = np.frombuffer(sep.encode('ascii'), dtype=np.uint8)
+    return chars
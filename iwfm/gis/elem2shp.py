@@ -55,14 +55,14 @@ def elem2shp(elem_nodes, node_coords, elem_sub, lake_elems, shape_name,
     import fiona 
     import fiona.crs 
     import shapefile as shp # pyshp
-    from shapely.geometry import mapping, Polygon
+    from shapely.geometry import mapping
 
     import iwfm as iwfm
 
     elem_shapename = f'{shape_name}_Elements.shp'
 
     # Create list of element polygons
-    polygons = iwfm.elem_poly_coords(elem_nodes, node_coords)
+    polygons = iwfm.elem_polygons(elem_nodes, node_coords)
 
     # Define the polygon feature geometry
     elem_schema = {
@@ -79,7 +79,7 @@ def elem2shp(elem_nodes, node_coords, elem_sub, lake_elems, shape_name,
         schema=elem_schema,
     ) as out:
         for i in range(0, len(polygons)):
-            poly = Polygon(polygons[i])
+            poly = polygons[i]
             lake_no = 0
             if lake_elems > 0:
                 for j in range(0, len(lake_elems)):
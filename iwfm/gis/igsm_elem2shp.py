@@ -56,13 +56,13 @@ def igsm_elem2shp(elem_nodes,node_coords,elem_char,lake_elems,shape_name,
 
     import fiona 
     import fiona.crs 
-    from shapely.geometry import mapping, Polygon
+    from shapely.geometry import mapping
 
     import iwfm as iwfm
 
     elem_shapename = f'{shape_name}_Elements.shp'
 
-    polygons = iwfm.elem_poly_coords(elem_nodes, node_coords)
+    polygons = iwfm.elem_polygons(elem_nodes, node_coords)
 
     # Define the polygon feature geometry
     elem_schema = {
@@ -87,7 +87,7 @@ def igsm_elem2shp(elem_nodes,node_coords,elem_char,lake_elems,shape_name,
         schema=elem_schema,
     ) as out:
         for i in range(0, len(polygons)):
-            poly = Polygon(polygons[i])
+            poly = polygons[i]
             lake_no = 0
             for j in range(0, len(lake_elems)):
                 if lake_elems[j][1] == i + 1:  # lake on this element
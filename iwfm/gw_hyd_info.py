@@ -0,0 +1,178 @@
+# gw_hyd_info.py
+# Table of groundwater hydrograph locations from an IWFM Groundwater.dat file
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+class gw_hyd_info(object):
+    ''' gw_hyd_info() - Groundwater hydrograph locations read once from an
+        IWFM Groundwater.dat file into a compact table, with case-insensitive
+        indexes by well name and by hydrograph file column
+
+        Example:
+          hyd_info = gw_hyd_info('Groundwater.dat')
+          row = hyd_info.find('01N02E03A001M')  # any case, None if absent
+          x, y, layer = hyd_info.x[row], hyd_info.y[row], hyd_info.layers[row]
+
+        With cache=True the table is saved to gw_file + '.hyd.npz' and read
+        back from there while Groundwater.dat and the cache format are
+        unchanged.
+
+    Parameters
+    ----------
+    gw_file : str
+        IWFM Groundwater.dat file name
+
+    cache : bool, default=False
+        True = read and write the disk cache
+
+    Attributes
+    ----------
+    nouth : int
+        number of groundwater hydrographs
+
+    gwhydoutfl : str
+        groundwater hydrograph output file name
+
+    ids, columns, layers : numpy int arrays
+        hydrograph ID, column in the hydrograph output file, model layer
+
+    x, y : numpy float arrays
+        hydrograph coordinates
+
+    names, wells, comments : numpy str arrays
+        hydrograph name as in the file, name without the '_L<layer>'
+        suffix, comment
+
+    '''
+
+    fields = ('ids', 'columns', 'x', 'y', 'layers', 'names', 'wells', 'comments')
+    version = 1  # cache format, increase when parse() changes
+
+    def __init__(self, gw_file, cache=False):
+        import os
+        import numpy as np
+
+        self.gw_file = gw_file
+        cache_file = gw_file + '.hyd.npz'
+        stat = os.stat(gw_file)
+        stamp = np.array([self.version, stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+
+        table = None
+        if cache and os.path.isfile(cache_file):
+            try:
+                with np.load(cache_file) as saved:
+                    if np.array_equal(saved['stamp'], stamp):
+                        table = {key: saved[key]
+                            for key in self.fields + ('nouth', 'gwhydoutfl')}
+            except (OSError, ValueError, KeyError):
+                table = None
+
+        if table is None:
+            table = self.parse(gw_file)
+            if cache:
+                try:
+                    with open(cache_file, 'wb') as f:
+                        np.savez(f, stamp=stamp, **table)
+                except OSError:
+                    pass
+
+        for key in self.fields:
+            setattr(self, key, table[key])
+        self.nouth = int(table['nouth'])
+        self.gwhydoutfl = str(table['gwhydoutfl'])
+
+        # case-insensitive indexes, the last hydrograph wins as in a dict
+        self.name_index = {}
+        for row, (name, well) in enumerate(zip(self.names, self.wells)):
+            self.name_index[well.lower()] = row
+            self.name_index[name.lower()] = row
+        self.column_index = {int(col): row for row, col in enumerate(self.columns)}
+
+    @staticmethod
+    def parse(gw_file):
+        ''' parse() - Read the hydrograph section of Groundwater.dat into
+            a dictionary of numpy arrays '''
+        import re
+        import numpy as np
+        import iwfm as iwfm
+
+        lines = open(gw_file).read().splitlines()
+
+        # NOUTH line, by its description or else by position
+        line_index = next((i for i, line in enumerate(lines) if line[:1] not in 'Cc*#'
+            and re.search(r'/\s*NOUTH\b', line)), None)
+        if line_index is None:
+            line_index = iwfm.skip_ahead(1, lines, 20)
+        nouth = int(lines[line_index].split()[0])
+
+        # GWHYDOUTFL line, after FACTXY
+        line_index = iwfm.skip_ahead(line_index, lines, 2)
+        gwhydoutfl = lines[line_index].split()[0]
+
+        # the header comment names the columns; IOUTH is not always present
+        header = [line for line in lines[line_index + 1:iwfm.skip_ahead(line_index, lines, 1)]
+            if re.search(r'\bHYDTYP\b', line)]
+        has_iouth = any(re.search(r'\bIOUTH\b', line) for line in header)
+
+        line_index = iwfm.skip_ahead(line_index, lines, 1)  # first hydrograph
+        rows = []
+        while len(rows) < nouth:
+            line = lines[line_index].strip()
+            fields = [f for f in re.split(r'\t+', line) if f.strip()] if '\t' in line \
+                else line.split()
+            fields = [f.strip() for f in fields]
+            if not header and len(rows) == 0:
+                has_iouth = len(fields) > 6 and fields[5].isdigit()
+            name_col = 6 if has_iouth else 5
+            rows.append((fields[0], fields[2], fields[3], fields[4],
+                fields[name_col] if len(fields) > name_col else fields[0],
+                ' '.join(fields[name_col + 1:])))
+            line_index += 1
+            while line_index < len(lines) and lines[line_index][:1] in 'Cc*#':
+                line_index += 1
+
+        ids, layers, x, y, names, comments = (list(col) for col in zip(*rows)) \
+            if rows else ([], [], [], [], [], [])
+        wells = [name.replace('_L' + layer, '') if name.find('_L' + layer) > 0 else name
+            for name, layer in zip(names, layers)]
+
+        return {'nouth': np.array(nouth), 'gwhydoutfl': np.array(gwhydoutfl),
+                'ids': np.array(ids, dtype=np.int64),
+                'columns': np.arange(1, len(rows) + 1, dtype=np.int64),
+                'x': np.array(x, dtype=float), 'y': np.array(y, dtype=float),
+                'layers': np.array(layers, dtype=np.int64),
+                'names': np.array(names, dtype=str), 'wells': np.array(wells, dtype=str),
+                'comments': np.array(comments, dtype=str)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def find(self, name):
+        ''' find() - Table row of a well or hydrograph name, any case, or None '''
+        return self.name_index.get(str(name).lower())
+
+    def find_column(self, column):
+        ''' find_column() - Table row of a hydrograph file column, or None '''
+        return self.column_index.get(int(column))
+
+    def to_df(self):
+        ''' to_df() - Table as a Pandas dataframe '''
+        import pandas as pd
+
+        return pd.DataFrame({'ID': self.ids, 'Column': self.columns, 'X': self.x,
+            'Y': self.y, 'Layer': self.layers, 'Name': self.names,
+            'Well': self.wells, 'Comment': self.comments})
@@ -17,9 +17,10 @@
 # -----------------------------------------------------------------------------
 
 
-def gw_plot(obs_file, gwhyd_info_file, gwhyd_files, gwhyd_names, yaxis_width, titlewords):
+def gw_plot(obs_file, gwhyd_info_file, gwhyd_files, gwhyd_names, yaxis_width, titlewords,
+    pdf_file=None, bookmarks=False, manifest_file=None):
     ''' gw_plot() - Assemble groundwater hydrograph info and call fns to 
-        write individual plots to PDF files
+        write individual plots to PDF files, or to one multi-page PDF file
 
     Parameters
     ----------
@@ -42,24 +43,64 @@ def gw_plot(obs_file, gwhyd_info_file, gwhyd_files, gwhyd_names, yaxis_width, ti
     title_words : str
         plot title words
     
+    pdf_file : str, default=None
+        name of one multi-page PDF file to write all plots to, in 
+        Groundwater.dat well order, or None for one PDF file per well
+    
+    bookmarks : bool, default=False
+        add a bookmark for each well to pdf_file; this reads and writes
+        the whole PDF file once more after the plots are drawn
+    
+    manifest_file : str, default=None
+        name of a file with a hash of the contents of each well's plot,
+        so that only the plots that have changed are redrawn; used only
+        with one PDF file per well
+    
     Return
     ------
     count : int
-        number of hydrographs processed
+        number of hydrographs drawn
     
     '''
     
+    import os, json
     import iwfm as iwfm 
+    from contextlib import nullcontext
 
-    well_dict, well_list = iwfm.read_sim_wells(gwhyd_info_file)  
+    well_dict, well_list, nouth, gwhydoutfl = iwfm.read_sim_wells(gwhyd_info_file)  
 
     gwhyd_sim = iwfm.read_sim_hyds(len(gwhyd_files), gwhyd_files)  
 
-    if obs_file.lower() != 'none':  # have observed values
-      obs = iwfm.read_obs_smp(obs_file)
-      count = iwfm.gw_plot_obs(well_list,len(gwhyd_files),obs,gwhyd_sim,gwhyd_names,well_dict,titlewords,yaxis_width)
-    else:                           # no observed values
-      count = iwfm.gw_plot_noobs(well_list,len(gwhyd_files),gwhyd_sim,gwhyd_names,well_dict,titlewords,yaxis_width)
+    # parse dates and convert simulated values once for all plots
+    gwhyd_sim = iwfm.gw_plot_context(gwhyd_sim)
+
+    if pdf_file is None:  # one PDF file per well
+        pdf_out = nullcontext()
+    else:                 # stream all pages into one PDF file
+        from matplotlib.backends.backend_pdf import PdfPages
+        pdf_file = iwfm.filename_ext(pdf_file, 'pdf')
+        pdf_out = PdfPages(pdf_file)
+    page_names = [] if bookmarks else None
+
+    manifest = None
+    if manifest_file is not None and pdf_file is None:  # redraw changed plots only
+        manifest = {}
+        if os.path.isfile(manifest_file):
+            with open(manifest_file) as f:
+                manifest = json.load(f)
+
+    with pdf_out as pdf:
+      if obs_file.lower() != 'none':  # have observed values
+        obs = iwfm.read_smp(obs_file)
+        count = iwfm.gw_plot_obs(well_list,len(gwhyd_files),obs,gwhyd_sim,gwhyd_names,well_dict,titlewords,yaxis_width,pdf,page_names,manifest)
+      else:                           # no observed values
+        count = iwfm.gw_plot_noobs(well_list,len(gwhyd_files),gwhyd_sim,gwhyd_names,well_dict,titlewords,yaxis_width,pdf,page_names,manifest)
+
+    if pdf_file is not None and bookmarks:
+        iwfm.pdf_bookmarks(pdf_file, page_names)
+    if manifest is not None:
+        with open(manifest_file, 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
     return count
 
 if __name__ == '__main__':
@@ -83,6 +124,11 @@ if __name__ == '__main__':
             gwhyd_names.append(
                 sys.argv[6 + i * 2 + 1]
             )  # Legend name for this hydrograph
+        pdf_file, bookmarks = None, False
+        if len(sys.argv) > 6 + no_hyds * 2:  # optional combined PDF file
+            pdf_file = sys.argv[6 + no_hyds * 2]
+        if len(sys.argv) > 7 + no_hyds * 2:  # optional 'bookmarks' for the PDF file
+            bookmarks = sys.argv[7 + no_hyds * 2].lower() == 'bookmarks'
 
     else:  # get everything form the command line
         titlewords      = input('Graph title: ')
@@ -95,6 +141,12 @@ if __name__ == '__main__':
             gwhyd_files.append(filename)
             legendname  = input(f'  Graph legend for {filename}: ')
             gwhyd_names.append(legendname)
+        pdf_file        = input('Combined PDF file name (or \'none\' for one file per well): ')
+        bookmarks       = False
+        if pdf_file.lower() == 'none':
+            pdf_file = None
+        else:
+            bookmarks   = input('Add well bookmarks to the PDF file (y/n): ').lower().startswith('y')
 
     # test that the input files exist
     if obs_file.lower() != 'none':
@@ -104,6 +156,10 @@ if __name__ == '__main__':
         iwfm.file_test(gwhyd_files[i])
 
     idb.exe_time()  # initialize timer
-    count = gw_plot(obs_file, gwhyd_info_file, gwhyd_files, gwhyd_names, yaxis_width, titlewords)
-    print(f'  Created {count} PDF hydrograph files')  # update cli
+    count = gw_plot(obs_file, gwhyd_info_file, gwhyd_files, gwhyd_names, yaxis_width, 
+        titlewords, pdf_file, bookmarks=bookmarks)
+    if pdf_file is None:
+        print(f'  Created {count} PDF hydrograph files')  # update cli
+    else:
+        print(f'  Wrote {count} hydrographs to {pdf_file}')  # update cli
     idb.exe_time()  # print elapsed time
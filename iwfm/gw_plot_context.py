@@ -0,0 +1,91 @@
+# gw_plot_context.py
+# Simulated groundwater hydrographs as arrays shared by the hydrograph plots
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+class gw_plot_context(object):
+    ''' gw_plot_context() - Simulated groundwater hydrographs with the dates 
+        parsed and the values converted to arrays once, so that each 
+        hydrograph plot takes zero-copy views of the columns it needs
+
+        Example:
+          plot_data = gw_plot_context(iwfm.read_sim_hyds(nhyds, gwhyd_files))
+          sim_heads = plot_data.sim_heads(col)  # one array per file
+          plt.plot(plot_data.dates[0], sim_heads[0])
+
+    Parameters
+    ----------
+    gwhyd_sim : list
+        simulated IWFM groundwater hydrographs, one item per hydrograph 
+        file, each a list of [date, value, value, ...] rows
+
+    '''
+
+    def __init__(self, gwhyd_sim):
+        import hashlib
+        import numpy as np
+        import iwfm as iwfm
+
+        self.no_hyds = len(gwhyd_sim)
+        self.start_date = gwhyd_sim[0][0][0]  # first date as text
+
+        self.dates = []  # datetime64 array for each hydrograph file
+        self.heads = []  # (column, time) array for each hydrograph file
+        date_text, dates = None, None
+        for hyd in gwhyd_sim:
+            text = [row[0] for row in hyd]
+            if text != date_text:  # hydrograph files usually share dates
+                date_text, dates = text, iwfm.text2datetime64(text)
+            self.dates.append(dates)
+
+            # transpose so that each hydrograph column is contiguous
+            values = np.array([row[1:] for row in hyd], dtype=float)
+            self.heads.append(np.ascontiguousarray(values.T))
+
+        # hash of the simulated dates, shared by every well_hash()
+        dates_hash = hashlib.sha1()
+        for dates in self.dates:
+            dates_hash.update(dates.tobytes())
+        self.dates_hash = dates_hash.digest()
+
+    def sim_heads(self, col):
+        ''' sim_heads() - Return a list of views of hydrograph file column 
+            col (1 = first column after the date), one per hydrograph file'''
+        return [heads[col - 1] for heads in self.heads]
+
+    def sim_range(self, col):
+        ''' sim_range() - Return the minimum and maximum simulated values of 
+            hydrograph file column col over all hydrograph files'''
+        ymin = min(heads[col - 1].min() for heads in self.heads)
+        ymax = max(heads[col - 1].max() for heads in self.heads)
+        return ymin, ymax
+
+    def well_hash(self, col, *items):
+        ''' well_hash() - Return a hash of the simulated dates and values of
+            hydrograph file column col and of the text of items, such as 
+            the observations and plot title, to tell if a plot has changed'''
+        import hashlib
+
+        well_hash = hashlib.sha1(self.dates_hash)
+        for heads in self.sim_heads(col):
+            well_hash.update(heads.tobytes())
+        for item in items:  # whole contents of arrays, text of the rest
+            if hasattr(item, 'tobytes'):
+                well_hash.update(item.tobytes())
+            else:
+                well_hash.update(repr(item).encode())
+        return well_hash.hexdigest()
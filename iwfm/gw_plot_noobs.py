@@ -18,7 +18,7 @@
 
 
 def gw_plot_noobs(well_list,no_hyds,gwhyd_sim,gwhyd_names,well_dict,
-    titlewords,yaxis_width=-1):
+    titlewords,yaxis_width=-1,pdf=None,bookmarks=None,manifest=None):
     ''' gw_plot_noobs() - Create PDF files for simulated data vs time for 
         all hydrographs as lines
 
@@ -30,9 +30,9 @@ def gw_plot_noobs(well_list,no_hyds,gwhyd_sim,gwhyd_names,well_dict,
     no_hyds : int
         number of simulation time series to be graphed
     
-    gwhyd_sim : list
-        simulated IWFM groundwater hydrographs 
-        [0]==dates, [1 to no_hyds]==datasets
+    gwhyd_sim : gw_plot_context or list
+        simulated IWFM groundwater hydrographs, converted to a 
+        gw_plot_context once for all wells if a list
      
     gwhyd_names : list
         hydrograph names from PEST observations file
@@ -46,28 +46,43 @@ def gw_plot_noobs(well_list,no_hyds,gwhyd_sim,gwhyd_names,well_dict,
     yaxis_width : int, default=-1
         minimum y-axis width, -1 for automatic
     
+    pdf : PdfPages object, default=None
+        open multi-page PDF to write all plots to, one page per well,
+        or None to write one PDF file per well
+    
+    bookmarks : list, default=None
+        if a list, the name of each well plotted is appended in page order
+    
+    manifest : dict, default=None
+        if a dictionary, key = PDF file name, value = hash of the plot
+        contents; wells whose hash is unchanged and whose PDF file exists 
+        are skipped, and the hashes of the plots drawn are updated
+    
     Return
     ------
     count : int
         number of files produced
     
     '''
+    import os
     import iwfm as iwfm
 
-    i, count, date, meas = 1, 0, [], []
-    date.append(gwhyd_sim[0][0][0])
-    name = well_list[0]
-
-    start_date = gwhyd_sim[0][0][0]  
-    for j in range(1, len(well_list)):  
+    count = 0
+    if not isinstance(gwhyd_sim, iwfm.gw_plot_context):  # convert once
+        gwhyd_sim = iwfm.gw_plot_context(gwhyd_sim)
+    start_date = gwhyd_sim.start_date
+    for name in dict.fromkeys(well_list):  # each well once, in Groundwater.dat order
         if name in well_dict:  # draw and save the current plot
-            iwfm.gw_plot_noobs_draw(name,date,no_hyds,gwhyd_sim,gwhyd_names,well_dict.get(name),start_date,titlewords,yaxis_width)
+            well_info = well_dict.get(name)
+            if manifest is not None:  # skip the plot if nothing has changed
+                pdf_name = name + '_' + iwfm.pad_front(well_info[0], 4, '0') + '.pdf'
+                well_hash = gwhyd_sim.well_hash(well_info[0],name,well_info,
+                    gwhyd_names,titlewords,yaxis_width)
+                if manifest.get(pdf_name) == well_hash and os.path.isfile(pdf_name):
+                    continue
+                manifest[pdf_name] = well_hash
+            iwfm.gw_plot_noobs_draw(name,[start_date],no_hyds,gwhyd_sim,gwhyd_names,well_info,start_date,titlewords,yaxis_width,pdf)
+            if bookmarks is not None:
+                bookmarks.append(name)
             count += 1
-            # re-initialize for next observation well
-            date, name = [], well_list[j]
-        date.append(gwhyd_sim[j][0][0])
-    # make the last one
-    if name in well_dict:
-        iwfm.gw_plot_noobs_draw(name,date,no_hyds,gwhyd_sim,gwhyd_names,well_dict.get(name),start_date,titlewords,yaxis_width)
-        count += 1
     return count
@@ -18,7 +18,7 @@
 
 
 def gw_plot_noobs_draw(well_name,date,no_hyds,gwhyd_sim,gwhyd_name,well_info,
-    start_date,title_words,yaxis_width=-1):
+    start_date,title_words,yaxis_width=-1,pdf=None):
     ''' gw_plot_noobs_draw() - Create a PDF file with a graph of the simulated 
         data vs time for all hydrographs as lines, saved as the well_name.pdf
 
@@ -33,9 +33,9 @@ def gw_plot_noobs_draw(well_name,date,no_hyds,gwhyd_sim,gwhyd_name,well_info,
     no_hyds : int
         number of simulation time series to be graphed
     
-    gwhyd_sim : list
-        simulated groundwater hydrographs 
-        [0]==dates, [1 to no_hyds]==datasets
+    gwhyd_sim : gw_plot_context or list
+        simulated IWFM groundwater hydrographs, preferably as a 
+        gw_plot_context so dates and values are not converted for each well
     
     gwhyd_name : list
         hydrograph names from PEST observations file
@@ -52,13 +52,17 @@ def gw_plot_noobs_draw(well_name,date,no_hyds,gwhyd_sim,gwhyd_name,well_info,
     yaxis_width : int, default=-1
         minimum y-axis width, -1 for automatic
     
+    pdf : PdfPages object, default=None
+        open multi-page PDF to add this plot to as one page, or None to
+        save the plot to its own PDF file
+    
     Return
     ------
     nothing
     
     '''
-    import datetime
     import matplotlib
+    import iwfm as iwfm
 
     # Force matplotlib to not use any Xwindows backend.
     matplotlib.use('TkAgg')  # Set to TkAgg ...
@@ -66,6 +70,7 @@ def gw_plot_noobs_draw(well_name,date,no_hyds,gwhyd_sim,gwhyd_name,well_info,
     import matplotlib.pyplot as plt
     import matplotlib.dates as mdates
     from matplotlib.backends.backend_pdf import PdfPages
+    from contextlib import nullcontext
 
     line_colors = ['b-' ,'y-' ,'r-' ,'g-' ,'c-' ,'m-' ,'k-' ,
                    'b--','y--','r--','g--','c--','m--','k--',
@@ -73,25 +78,26 @@ def gw_plot_noobs_draw(well_name,date,no_hyds,gwhyd_sim,gwhyd_name,well_info,
     # 'r-' = red line, 'bo' = blue dots, 'r--' = red dashes, 
     # 'r:' = red dotted line, 'bs' = blue squares, 'g^' = green triangles, etc
 
+    if not isinstance(gwhyd_sim, iwfm.gw_plot_context):
+        gwhyd_sim = iwfm.gw_plot_context(gwhyd_sim)
+
     col = well_info[0]  # gather information
 
-    ymin, ymax, sim_heads, sim_dates = 1e6, -1e6, [], []
-    for j in range(0, no_hyds):
-        date_temp, sim_temp = [], []
-        for i in range(0, len(gwhyd_sim[j])):
-            date_temp.append(datetime.datetime.strptime(gwhyd_sim[j][i][0], '%m/%d/%Y'))
-            sim_temp.append(gwhyd_sim[j][i][col])
-            ymin = min(ymin, gwhyd_sim[j][i][col])
-            ymax = max(ymax, gwhyd_sim[j][i][col])
-        sim_dates.append(date_temp)
-        sim_heads.append(sim_temp)
+    # views of this well's column, dates were parsed once for all wells
+    sim_dates = gwhyd_sim.dates
+    sim_heads = gwhyd_sim.sim_heads(col)
+    ymin, ymax = gwhyd_sim.sim_range(col)
 
     years = mdates.YearLocator()
     months = mdates.MonthLocator()
     yearsFmt = mdates.DateFormatter('%Y')
 
     # plot simulated vs sim_dates as line, and meas vs specific dates as points, on one plot
-    with PdfPages(well_name + '_' + pad_front(col, 4, '0') + '.pdf') as pdf:
+    if pdf is None:  # save plot to the_well_name.pdf
+        pdf_out = PdfPages(well_name + '_' + iwfm.pad_front(col, 4, '0') + '.pdf')
+    else:            # add plot as the next page of the open PDF
+        pdf_out = nullcontext(pdf)
+    with pdf_out as pdf_page:
         fig = plt.figure(figsize=(10, 7.5))
         ax = plt.subplot(111)
         ax.xaxis_date()
@@ -115,6 +121,6 @@ def gw_plot_noobs_draw(well_name,date,no_hyds,gwhyd_sim,gwhyd_name,well_info,
             plt.plot(sim_dates[j], sim_heads[j], line_colors[j], label=gwhyd_name[j])
 
         leg = ax.legend(frameon=1, facecolor='white')
-        pdf.savefig()  # saves the current figure into a pdf page
+        pdf_page.savefig()  # saves the current figure into a pdf page
         plt.close()
     return 
@@ -19,7 +19,7 @@
 
 
 def gw_plot_obs(well_list,no_hyds,obs,gwhyd_sim,gwhyd_names,well_dict,
-    titlewords,yaxis_width=-1):
+    titlewords,yaxis_width=-1,pdf=None,bookmarks=None,manifest=None):
     ''' gw_plot_obs() - Create PDF files for simulated data vs time for 
         all hydrographs as lines, with observed values vs time as dots
 
@@ -28,12 +28,16 @@ def gw_plot_obs(well_list,no_hyds,obs,gwhyd_sim,gwhyd_names,well_dict,
     well_list : str
         well name, often state well number
     
+    obs : tuple or list
+        observations as the (DataFrame, offsets) tuple from read_smp(), or
+        as a list of [well name, date, time, value] from read_obs_smp()
+    
     no_hyds : int
         number of simulation time series to be graphed
     
-    gwhyd_sim : list
-        simulated IWFM groundwater hydrographs 
-        [0]==dates, [1 to no_hyds]==datasets
+    gwhyd_sim : gw_plot_context or list
+        simulated IWFM groundwater hydrographs, converted to a 
+        gw_plot_context once for all wells if a list
     
     gwhyd_names : list
         hydrograph names from PEST observations file
@@ -47,33 +51,57 @@ def gw_plot_obs(well_list,no_hyds,obs,gwhyd_sim,gwhyd_names,well_dict,
     yaxis_width : int, default=-1
         minimum y-axis width, -1 for automatic
     
+    pdf : PdfPages object, default=None
+        open multi-page PDF to write all plots to, one page per well,
+        or None to write one PDF file per well
+    
+    bookmarks : list, default=None
+        if a list, the name of each well plotted is appended in page order
+    
+    manifest : dict, default=None
+        if a dictionary, key = PDF file name, value = hash of the plot
+        contents; wells whose hash is unchanged and whose PDF file exists 
+        are skipped, and the hashes of the plots drawn are updated
+    
     Return
     ------
     count           (int):  Number of files produced
     
     '''
+    import os
     import iwfm as iwfm
 
-    # cycle through the list of wells in obs to print plots
-    # initialize
-    i, count, date, meas = 1, 0, [], []
-    date.append(obs[0][1])
-    meas.append(obs[0][3])
-    name = well_list[0]
+    # group the observed dates and values by well
+    if isinstance(obs, tuple):  # columns and row ranges from read_smp()
+        smp, offsets = obs
+        dates, values = smp.Date.values, smp.Value.values
+        obs_dict = {name: (dates[start:end], values[start:end]) 
+            for name, (start, end) in offsets.items()}
+    else:
+        obs_dict = {}
+        for j in range(0, len(obs)):
+            date, meas = obs_dict.setdefault(obs[j][0], ([], []))
+            date.append(obs[j][1])
+            meas.append(obs[j][3])
 
-    start_date = gwhyd_sim[0][0][0]  # get starting date
-    for j in range(1, len(obs)):  # move through the file
-        if obs[j][0] != name:
-            i = i + 1  # move index to next plot, then...
-            if name in well_dict:  # draw and save the current plot
-                iwfm.gw_plot_obs_draw(name,date,meas,no_hyds,gwhyd_sim,gwhyd_names,well_dict.get(name),start_date,titlewords,yaxis_width)
-                count += 1
-            # re-initialize for next observation well
-            date, meas, name = [], [], obs[j][0]
-        date.append(obs[j][1])
-        meas.append(obs[j][3])
-    # make the last one
-    if name in well_dict:
-        iwfm.gw_plot_obs_draw(name,date,meas,no_hyds,gwhyd_sim,gwhyd_names,well_dict.get(name),start_date,titlewords,yaxis_width)
-        count += 1
+    # cycle through the wells in Groundwater.dat order to print plots
+    count = 0
+    if not isinstance(gwhyd_sim, iwfm.gw_plot_context):  # convert once
+        gwhyd_sim = iwfm.gw_plot_context(gwhyd_sim)
+    start_date = gwhyd_sim.start_date
+    for name in well_list:
+        if name in well_dict and name in obs_dict:
+            date, meas = obs_dict.pop(name)  # each well is drawn only once
+            well_info = well_dict.get(name)
+            if manifest is not None:  # skip the plot if nothing has changed
+                pdf_name = name + '_' + iwfm.pad_front(well_info[0], 4, '0') + '.pdf'
+                well_hash = gwhyd_sim.well_hash(well_info[0],name,date,meas,well_info,
+                    gwhyd_names,titlewords,yaxis_width)
+                if manifest.get(pdf_name) == well_hash and os.path.isfile(pdf_name):
+                    continue
+                manifest[pdf_name] = well_hash
+            iwfm.gw_plot_obs_draw(name,date,meas,no_hyds,gwhyd_sim,gwhyd_names,well_info,start_date,titlewords,yaxis_width,pdf)
+            if bookmarks is not None:
+                bookmarks.append(name)
+            count += 1
     return count
@@ -18,7 +18,7 @@
 
 
 def gw_plot_obs_draw(well_name,date,meas,no_hyds,gwhyd_obs,gwhyd_name,well_info,
-    start_date,title_words,yaxis_width=-1):
+    start_date,title_words,yaxis_width=-1,pdf=None):
     ''' gw_plot_obs_draw() - Create a PDF file with a graph of the simulated data 
         vs time for all hydrographs as lines, with observed values vs time as 
         dots, saved as the_well_name.pdf
@@ -28,18 +28,18 @@ def gw_plot_obs_draw(well_name,date,meas,no_hyds,gwhyd_obs,gwhyd_name,well_info,
     well_name : str
         well name, often state well number
     
-    date : list
-        list of dates (paired with meas)
+    date : list or array
+        MM/DD/YYYY dates or datetime64 array (paired with meas)
     
-    meas : list
-        list of observed values (paired with date)
+    meas : list or array
+        observed values (paired with date)
     
     no_hyds : int
         number of simulation time series to be graphed
     
-    gwhyd_obs : list
-        simulated IWFM groundwater hydrographs 
-        [0]==dates, [1 to no_hyds]==datasets
+    gwhyd_obs : gw_plot_context or list
+        simulated IWFM groundwater hydrographs, preferably as a 
+        gw_plot_context so dates and values are not converted for each well
     
     gwhyd_name : list
         hydrograph names from PEST observations file
@@ -56,13 +56,16 @@ def gw_plot_obs_draw(well_name,date,meas,no_hyds,gwhyd_obs,gwhyd_name,well_info,
     yaxis_width : int, default=-1
         minimum y-axis width, -1 for automatic
     
+    pdf : PdfPages object, default=None
+        open multi-page PDF to add this plot to as one page, or None to
+        save the plot to its own PDF file
+    
     Return
     ------
     nothing
     
     '''
     
-    import datetime
     import matplotlib
     import iwfm as iwfm
 
@@ -72,6 +75,7 @@ def gw_plot_obs_draw(well_name,date,meas,no_hyds,gwhyd_obs,gwhyd_name,well_info,
     import matplotlib.pyplot as plt
     import matplotlib.dates as mdates
     from matplotlib.backends.backend_pdf import PdfPages
+    from contextlib import nullcontext
 
     line_colors = ['b-' ,'y-' ,'r-' ,'g-' ,'c-' ,'m-' ,'k-' ,
                    'b--','y--','r--','g--','c--','m--','k--',
@@ -79,29 +83,31 @@ def gw_plot_obs_draw(well_name,date,meas,no_hyds,gwhyd_obs,gwhyd_name,well_info,
     # 'r-' = red line, 'bo' = blue dots, 'r--' = red dashes, 
     # 'r:' = red dotted line, 'bs' = blue squares, 'g^' = green triangles, etc
 
-    col = well_info[0] 
+    if not isinstance(gwhyd_obs, iwfm.gw_plot_context):
+        gwhyd_obs = iwfm.gw_plot_context(gwhyd_obs)
 
-    dates = []
-    for i in range(0, len(gwhyd_obs)):
-        dates.append(datetime.datetime.strptime(gwhyd_obs[i][0], '%m/%d/%Y'))
+    col = well_info[0] 
 
-    ymin, ymax, sim_heads, sim_dates = 1e6, -1e6, [], []
-    for j in range(0, no_hyds):
-        sim_heads.append([float(x) for x in gwhyd_obs[j][1:]])
+    # views of this well's column, dates were parsed once for all wells
+    sim_dates = gwhyd_obs.dates
+    sim_heads = gwhyd_obs.sim_heads(col)
 
-    ymin = min(ymin, min(min(sim_heads)), min(meas))
-    ymax = max(ymax, max(max(sim_heads)), max(meas))
+    ymin, ymax = gwhyd_obs.sim_range(col)
+    ymin = min(ymin, min(meas))
+    ymax = max(ymax, max(meas))
 
-    meas_dates = []
-    for i in range(0, len(date)):
-        meas_dates.append(datetime.datetime.strptime(date[i], '%m/%d/%Y'))
+    meas_dates = iwfm.text2datetime64(date)
 
     years = mdates.YearLocator()
     months = mdates.MonthLocator()
     yearsFmt = mdates.DateFormatter('%Y')
 
     # plot simulated vs sim_dates as line, and meas vs specific dates as points, on one plot
-    with PdfPages(well_name + '_' + iwfm.pad_front(col, 4, '0') + '.pdf') as pdf:
+    if pdf is None:  # save plot to the_well_name.pdf
+        pdf_out = PdfPages(well_name + '_' + iwfm.pad_front(col, 4, '0') + '.pdf')
+    else:            # add plot as the next page of the open PDF
+        pdf_out = nullcontext(pdf)
+    with pdf_out as pdf_page:
         fig = plt.figure(figsize=(10, 7.5))
         ax = plt.subplot(111)
         ax.xaxis_date()
@@ -125,6 +131,6 @@ def gw_plot_obs_draw(well_name,date,meas,no_hyds,gwhyd_obs,gwhyd_name,well_info,
             plt.plot(sim_dates[j], sim_heads[j], line_colors[j], label=gwhyd_name[j])
 
         leg = ax.legend(frameon=1, facecolor='white')
-        pdf.savefig()  
+        pdf_page.savefig()  
         plt.close()
     return 
@@ -19,150 +19,60 @@
 
 def gw_well_lay_elev(self, d_wellinfo, debug=0):
     ''' gw_well_lay_elev() - Find layer elevations at each well using node 
-        elevation data. Inverse Distance Weighting is used to determine the 
-        elevations.
-
-    ** INCOMPLETE **
-    TODO:
-      - Find layer elevations at each well using node elevation data.
-
+        elevation data. The nodal stratigraphy is interpolated to all the 
+        wells at once with the finite element weights of the element 
+        containing each well (iwfm.well_layers).
 
     Parameters
     ----------
-    d_wellinfo     (dict): Dictionary with info for each well
+    self           (iwfm_model): model with d_nodexy, d_elem_nodes and 
+                                 d_nodeelev
+    
+    d_wellinfo     (dict): Dictionary with info for each well, 
+                           values = [x, y, ..., element, ...] with the 
+                           element number at index 4 (0 if unknown)
     
     debug          (int):  Turn debugging to CLI on if >0 
 
     Returns
     -------
     new_d_wellinfo : dictionary
-        dictionary, key = well name, values = layer info for each well
+        dictionary, key = well name, values = well info followed by the 
+        nodes of the element containing the well and 
+        [aquifer_top, aquifer_bottom, aquitard_top, aquitard_bottom], 
+        each a list of elevations by layer
 
 
     '''
+    import numpy as np
+    import iwfm as iwfm
 
     if debug:
         print('      => gw_well_lay_elev()')
 
-    new_d_wellinfo = {}
-    for key in d_wellinfo:  # cycle through wells
-        if debug:
-            print('      =>  {}: \t{}'.format('key', key))
-        well_elevs = []
-
-        old_value = d_wellinfo[key]  # save dictionary contents for this well
-        x = d_wellinfo[key][0]  # well x coordinate
-        y = d_wellinfo[key][1]  # well y coordinate
-        elem = d_wellinfo[key][4]  # element containing well
-        if debug:
-            print('      =>  {}: \t{}'.format('old_value', old_value))
-
-        # nodes of element containing well
-        e_nodes = self.e_nodes[self.e_nos.index(elem)]  
-        old_value.append(e_nodes)
-
-        nodexy = []
-        for i in range(0, len(e_nodes)):
-            nodexy.append(self.d_nodes[e_nodes[i]])  # x,y coordinates of element nodes
-
-        if debug:
-            print('      =>  {}: \t{}'.format('elem', elem))
-            print('      =>  {}: \t{}'.format('e_nodes', e_nodes))
-            print('      =>  {}: \t{}'.format('nodexy', nodexy))
-            print('\n      => right here\n')
-
-        elevs = []
-        for i in range(0, len(self.nnodes)):
-            index = self.nodeno[self.nnodes[i]]
-            elevs.append(self.aquifer_top[index])  # aquifer top for these nodes
-        if debug:
-            print('      =>  {}: \t{}'.format('aquifer_top elevs', elevs))
-        result_aqtop = IDW(
-            x, y, elem, self.nnodes, self.nlayers, nodexy, elevs, debug
-        )  # Top of each aquifer layer at well
-        well_elevs.append(result_aqtop)
-        if debug:
-            print('      =>  {}: \t{}'.format('well_elevs', well_elevs))
-
-        elevs = []
-        for i in range(0, len(self.nnodes)):
-            index = self.nodeno[self.nnodes[i]]
-            elevs.append(self.aquifer_bottom[index])  # aquifer bottom for these nodes
-        if debug:
-            print('      =>  {}: \t{}'.format('aquifer_bottom elevs', elevs))
-        result_aqbot = IDW(
-            x, y, elem, self.nnodes, self.nlayers, nodexy, elevs, debug
-        )  # Bottom of each aquifer layer at well
-        well_elevs.append(result_aqbot)
-        if debug:
-            print('      =>  {}: \t{}'.format('well_elevs', well_elevs))
+    keys = list(d_wellinfo.keys())
+    x = np.array([d_wellinfo[key][0] for key in keys], dtype=float)
+    y = np.array([d_wellinfo[key][1] for key in keys], dtype=float)
+    elems = np.array([d_wellinfo[key][4] for key in keys], dtype=np.int64)
 
-        elevs = []
-        for i in range(0, len(self.nnodes)):
-            index = self.nodeno[self.nnodes[i]]
-            elevs.append(self.aquitard_top[index])  # aquitard top for these nodes
-        if debug:
-            print('      =>  {}: \t{}'.format('aquitard_top elevs', elevs))
-        result_attop = IDW(
-            x, y, elem, self.nnodes, self.nlayers, nodexy, elevs, debug
-        )  # Top of each aquitard layer at well
-        well_elevs.append(result_attop)
-        if debug:
-            print('      =>  {}: \t{}'.format('well_elevs', well_elevs))
+    # -- locate wells without an element, then interpolate all wells at once
+    if (elems == 0).any():
+        elems[elems == 0] = iwfm.fe_weights(x[elems == 0], y[elems == 0], 
+            self.d_nodexy, self.d_elem_nodes)[0]
+    elems, elevs, layer_top, layer_bot, fractions = iwfm.well_layers(x, y, 
+        self.d_nodexy, self.d_elem_nodes, self.d_nodeelev, elems=elems)
 
-        elevs = []
-        for i in range(0, len(self.nnodes)):
-            index = self.nodeno[self.nnodes[i]]
-            elevs.append(self.aquitard_bottom[index])  # aquitard bottom for these nodes
-        if debug:
-            print('      =>  {}: \t{}'.format('aquitard_bottom elevs', elevs))
-        result_atbot = IDW(
-            x, y, elem, self.nnodes, self.nlayers, nodexy, elevs, debug
-        )  # Bottom of each aquitard layer at well
-        well_elevs.append(result_atbot)
-        if debug:
-            print('      =>  {}: \t{}'.format('well_elevs', well_elevs))
+    aquitard_top = elevs[:, 0:-1:2]
+    aquifer_top = elevs[:, 1::2]     # = aquitard bottom
+    aquifer_bot = elevs[:, 2::2]
 
-        old_value.append(well_elevs)
-        if debug:
-            print('      =>  {}: \t{}'.format('key', key))
-        if debug:
-            print('      =>  {}: \t{}'.format('old_value', old_value))
+    new_d_wellinfo = {}
+    for i, key in enumerate(keys):  # cycle through wells
+        old_value = list(d_wellinfo[key])  # save dictionary contents for this well
+        old_value.append(self.d_elem_nodes.get(int(elems[i]), []))  # nodes of element containing well
+        old_value.append([aquifer_top[i].tolist(), aquifer_bot[i].tolist(),
+            aquitard_top[i].tolist(), aquifer_top[i].tolist()])
         new_d_wellinfo[key] = old_value
         if debug:
             print('      =>  new_d_wellinfo[{}]: \t{}'.format(key, new_d_wellinfo[key]))
-        # result_top = IDW(nwell, xwell, ywell, wellelem, result_top, nnodes, nlayers, nodex, nodey, top_elev, nelements, elements)
-        # result_bot = IDW(nwell, xwell, ywell, wellelem, result_bot, nnodes, nlayers, nodex, nodey, bot_elev, nelements, elements)
-        # return result_top,result_botom
-
-        #!-----------------------------------------------------------------------------!
-        # SUBROUTINE layerelevation(top_elev, bot_elev, result_top, result_bot)
-        #    implicit none
-        #!-----------------------------------------------------------------------------!
-        #! Find layer elevations at each well using node elevation data.
-        #! Inverse Distance Weighting is used to determine the elevations.
-        #!
-        #! Arguments:
-        #!    - topelev    - Top elevation at nodes
-        #!    - botelev    - Bottom elevation at nodes
-        #!    - result_top - Layer top elevations at each well
-        #!    - result_bot - Layer bottom elevations at each well
-        #!-----------------------------------------------------------------------------!
-        #    real,intent(in)          :: top_elev(nnodes, nlayers), &
-        #                                bot_elev(nnodes, nlayers)
-        #    real,intent(inout)       :: result_top(nwell, nlayers), &
-        #                                result_bot(nwell, nlayers)
-        #
-        #    result_top = 0.0
-        #    result_bot = 0.0
-        #
-        #    call IDW(nwell, xwell, ywell, wellelem, result_top, nnodes, nlayers, &
-        #             nodex, nodey, top_elev, nelements, elements)
-        #    call IDW(nwell, xwell, ywell, wellelem, result_bot, nnodes, nlayers, &
-        #             nodex, nodey, bot_elev, nelements, elements)
-        #
-        # end subroutine layerelevation
-        #!-----------------------------------------------------------------------------!
-    if debug:
-        print('\n  ** incomplete: gw_well_lay_elev.py  **\n')
     return new_d_wellinfo
@@ -17,7 +17,7 @@
 # -----------------------------------------------------------------------------
 
 
-def hyd_dict(gwhyd_info_file):
+def hyd_dict(gwhyd_info_file, cache=False):
     ''' hyd_dict() - Read hydrograph info from Groundwater.dat file and build
         a dictionary of groundwater hydrograph info
 
@@ -26,6 +26,9 @@ def hyd_dict(gwhyd_info_file):
     gwhyd_info_file : str
         IWFM Groundwaer.dat file name
 
+    cache : bool, default=False
+        True = read and write the gw_hyd_info disk cache
+
     Returns
     -------
     well_dict : dictionary
@@ -34,23 +37,12 @@ def hyd_dict(gwhyd_info_file):
     '''
     import iwfm as iwfm
 
-    well_dict = {}
-    gwhyd_info = open(gwhyd_info_file).read().splitlines()  # open and read input file
-
-    # skip to NOUTH, number of hydrographs
-    line_index = iwfm.skip_ahead(1, gwhyd_info, 20)  
-    nouth = int(gwhyd_info[line_index].split()[0])
+    hyd_info = iwfm.gw_hyd_info(gwhyd_info_file, cache=cache)
 
-    line_index = iwfm.skip_ahead(line_index, gwhyd_info, 3)  # skip to first hydrograph
-    for i in range(0, nouth): 
-        items = []
-        line = gwhyd_info[line_index].split()
-        items.append(line[5].lower())  # well name = key
-        items.append(int(line[0]))     # column number in hydrograph file
-        items.append(float(line[3]))   # x
-        items.append(float(line[4]))   # y
-        items.append(int(line[2]))     # model layer
-        items.append(line[5].lower())  # well name
-        well_dict[items[0]] = items[1:]
-        line_index += 1
+    well_dict = {}
+    for row in range(len(hyd_info)):
+        name = str(hyd_info.names[row]).lower()  # well name = key
+        well_dict[name] = [int(hyd_info.columns[row]),          # column number in hydrograph file
+            float(hyd_info.x[row]), float(hyd_info.y[row]),     # x, y
+            int(hyd_info.layers[row]), name]                    # model layer, well name
     return well_dict
@@ -1,5 +1,5 @@
 # idw.py
-# Inverse distance weighting... for what?
+# Inverse distance weighting of nodal values to points
 # Copyright (C) 2020-2021 University of California
 # -----------------------------------------------------------------------------
 # This information is free; you can redistribute it and/or modify it
@@ -16,115 +16,114 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 # -----------------------------------------------------------------------------
 
-# ** INFOMPLETE ** #
 
+def idw(x, y, nodes, values, power=2.0, k=8, radius=None, weights=None):
+    ''' idw() - Inverse distance weighting of nodal values to points, for
+        all points and all layers (or time steps) at once
 
-def idw(x, y, elem, nnodes, nlayers, nodexy, elevations, debug=0):
-    ''' idw() - Inverse distance weighting
+        Example:
+          w = iwfm.idw_weights(x, y, d_nodexy, k=4)         # once
+          heads = iwfm.idw(x, y, d_nodexy, node_heads, weights=w)
 
-    ** INCOMPLETE **
-    TODO: only partially developed
+    Parameters
+    ----------
+    x, y : float or array-like
+        locations of the points
+
+    nodes : dictionary or list
+        node locations, anything iwfm.node_tree takes (e.g. d_nodexy)
+
+    values : array-like
+        (nodes,) or (nodes, layers or time steps) values, rows in the order
+        of nodes
+
+    power : float, default=2.0
+        weights are 1 / distance ** power
+
+    k : int, default=8
+        number of nearest nodes used for each point
+
+    radius : float, optional
+        only nodes within this distance of a point are used
+
+    weights : scipy sparse matrix, optional
+        weights from idw_weights() for these points and nodes, to reuse
+
+    Returns
+    -------
+    result : numpy array
+        (points,) or (points, layers or time steps) interpolated values, nan
+        for points with no node within radius
+
+    '''
+    import numpy as np
+
+    if weights is None:
+        weights = idw_weights(x, y, nodes, power=power, k=k, radius=radius)
+    values = np.asarray(values, dtype=float)
+    result = np.asarray(weights @ values)
+
+    empty = np.diff(weights.indptr) == 0
+    result[empty] = np.nan
+    return result
+
+
+def idw_weights(x, y, nodes, power=2.0, k=8, radius=None):
+    ''' idw_weights() - Sparse (points, nodes) matrix of inverse distance
+        weights from the k nearest nodes of each point, each row summing to
+        1, so that interpolated values are weights @ node_values
 
     Parameters
     ----------
-    x : list of floats
-        X values of points
-    
-    y : list of floats
-        y values of points
-    
-    elem : list
-        list of model elements and nodes
-    
-    nnodes : list
-        list of model nodes
-    
-    nlayers : int
-        number of model layers
-    
-    nodexy : list
-        spatial locations of nodes
-    
-    elevations : list
-        Top row of table data in excel spreadsheets
-    
-    debug : int, default=0
-        1 == Turn on debug printing to cli
+    x, y : float or array-like
+        locations of the points
+
+    nodes : dictionary or list
+        node locations, anything iwfm.node_tree takes (e.g. d_nodexy),
+        columns are in this order
+
+    power : float, default=2.0
+        weights are 1 / distance ** power
+
+    k : int, default=8
+        number of nearest nodes used for each point
+
+    radius : float, optional
+        only nodes within this distance of a point are used
 
     Returns
     -------
-    nothing
+    weights : scipy.sparse.csr_matrix
+        (points, nodes) weights, an empty row for points with no node
+        within radius. A point on a node gets all its weight from that node
 
     '''
     import numpy as np
+    import scipy.sparse
+    import iwfm as iwfm
+
+    tree = nodes if isinstance(nodes, iwfm.node_tree) else iwfm.node_tree(nodes)
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    y = np.atleast_1d(np.asarray(y, dtype=float))
+    npts, nnodes = len(x), len(tree)
+    k = min(k, nnodes)
+
+    bound = np.inf if radius is None else radius
+    dist, index = tree.tree.query(np.column_stack([x, y]), k=k, distance_upper_bound=bound)
+    dist, index = dist.reshape(npts, k), index.reshape(npts, k)
+
+    valid = index < nnodes  # neighbours missing beyond radius have index nnodes
+    with np.errstate(divide='ignore'):
+        w = np.where(valid, 1.0 / np.power(dist, power), 0.0)
+
+    # a point on a node takes that node's value
+    on_node = valid & (dist == 0)
+    hit = on_node.any(axis=1)
+    w[hit] = on_node[hit].astype(float)
+
+    total = w.sum(axis=1, keepdims=True)
+    w = np.divide(w, total, out=np.zeros_like(w), where=total > 0)
 
-    # inverse distance weighting
-    if debug:
-        print('\n  ==> iwfm.idw()')
-        print('      =>  {}: \t{}'.format('elem', elem))
-        print('      =>  {}: \t{}'.format('nnodes', nnodes))
-        print('      =>  {}: \t{}'.format('nlayers', nlayers))
-        print('      =>  {}: \t{}'.format('nodexy', nodexy))
-        print('      =>  {}: \t{}'.format('elevations', elevations))
-
-    InterpValues = [[0.0 for j in range(0, len(nnodes))] for i in range(0, nlayers)]
-    if debug:
-        print('      =>  {}: \t{}'.format('InterpValues', InterpValues))
-
-    for i in range(0, nlayers):
-        if debug:
-            print('\n      =>  {}: \t{}'.format('i', i))
-        wgt = 0
-        for j in range(0, len(nnodes)):  # for each node of element
-            if debug:
-                print('\n      =>  {}: \t{}'.format('j', j))
-            # if elem > 0:   # all ObsElem > 0
-            nodeID = nnodes[i]
-            if debug:
-                print('      =>  {}: \t{}'.format('nodeID', nodeID))
-            if nodeID > 0:
-                if debug:
-                    print('      =>  {}, {}: \t{}, {}'.format('x', 'y', x, y))
-                if debug:
-                    print('      =>  {}: \t{}'.format('nodexy[j]', nodexy[j]))
-                Distance = float(
-                    np.sqrt((x - nodexy[j][0]) ** 2 + (y - nodexy[j][1]) ** 2)
-                )
-                if debug:
-                    print('      =>  {}: \t{}'.format('Distance', Distance))
-                wgt_tmp = 1.0 / Distance
-                if debug:
-                    print('      =>  {}: \t{}'.format('wgt_tmp', wgt_tmp))
-                wgt += wgt_tmp
-                for k in range(0, nlayers):
-                    if debug:
-                        print('      =>  i: {} \tk: {}'.format(i, k))
-                    if debug:
-                        print(
-                            '      =>  {}: \t{}'.format(
-                                'InterpValues[i][k]', InterpValues[i][k]
-                            )
-                        )
-                    if debug:
-                        print(
-                            '      =>  {}: \t{}'.format(
-                                'elevations[i][k]', elevations[i][k]
-                            )
-                        )
-                    InterpValues[i][k] += wgt_tmp * elevations[i][k]
-                    if debug:
-                        print(
-                            '      =>  {}: \t{}'.format(
-                                'InterpValues[i][k]', InterpValues[i][k]
-                            )
-                        )
-        if debug:
-            print('      =>  {}: \t{}'.format('wgt', wgt))
-        for k in range(0, nlayers):
-            InterpValues[i][k] = InterpValues[i][k] / wgt
-        if debug:
-            print('      =>  {}: \t{}'.format('InterpValues', InterpValues))
-
-    if debug:
-        print('\n  ** incomplete: IDW.py **')
-    return InterpValues
+    keep = w > 0
+    rows = np.repeat(np.arange(npts), keep.sum(axis=1))
+    return scipy.sparse.csr_matrix((w[keep], (rows, index[keep])), shape=(npts, nnodes))
@@ -1,6 +1,5 @@
 # in_element.py
-# Return number of element containing (x,y) point or 0 if none
-# the nearest node to each (x,y) point
+# Return number of element containing each (x,y) point or 0 if none
 # Copyright (C) 2020-2021 University of California
 # -----------------------------------------------------------------------------
 # This information is free; you can redistribute it and/or modify it
@@ -18,14 +17,19 @@
 # -----------------------------------------------------------------------------
 
 
-def in_element(e_nodes, e_nos, d_nodexy, x, y):
+def in_element(e_nodes, e_nos, d_nodexy, x, y, local=False, geometry=None):
     ''' in_element() - Returns the element containing the point (x,y), 
-        or 0 if not in any element
+        or 0 if not in any element, for one point or arrays of points
+
+        Candidate elements come from a grid of element bounding boxes and
+        are tested with exact vectorized edge tests (iwfm.fe_locate), so
+        no polygons are built. For many calls on the same model, pass 
+        geometry = iwfm.fe_geometry(d_nodexy, dict(zip(e_nos, e_nodes))).
 
     Parameters
     ----------
     e_nodes : list
-        element numbers and corresponding nodes
+        nodes of each element, in the order of e_nos
     
     e_nos : list
         element numbers
@@ -33,32 +37,43 @@ def in_element(e_nodes, e_nos, d_nodexy, x, y):
     d_nodexy : dictionary
         key=nodes, values=coordinates
     
-    x : float
-        X coordinate
+    x : float or array-like
+        X coordinate(s)
     
-    y : float
-        Y coordinate
+    y : float or array-like
+        Y coordinate(s)
+
+    local : bool, default=False
+        True = also return local coordinates in the element, barycentric
+        (l1, l2, l3) in triangles and bilinear (xi, eta, nan) in 
+        quadrilaterals, for interpolation
+
+    geometry : tuple, optional
+        precomputed iwfm.fe_geometry() element vertex arrays
 
     Returns
     -------
-    Integer element number of element containing point, or 0 if none
+    Integer element number of element containing point, or 0 if none 
+    (numpy int array for arrays of points), and if local is True a 
+    (points, 3) numpy array of local coordinates
     
     '''
-    from shapely.geometry import Polygon, Points
-
-    point = Point(x, y)
+    import numpy as np
+    import iwfm as iwfm
 
-    # brute force - cycle through all elements until contains() is true
-    for i in range(0, len(e_nodes)):  
-        points = []
-        points.append(d_nodexy[e_nodes[i][0]])
-        points.append(d_nodexy[e_nodes[i][1]])
-        points.append(d_nodexy[e_nodes[i][2]])
-        if len(e_nodes[i]) > 3:
-            points.append(d_nodexy[e_nodes[i][3]])
+    if geometry is None:
+        geometry = iwfm.fe_geometry(d_nodexy, dict(zip(e_nos, e_nodes)))
+    elem_nos = geometry[0]
 
-        polygon = Polygon(points)
+    xs = np.atleast_1d(np.asarray(x, dtype=float))
+    ys = np.atleast_1d(np.asarray(y, dtype=float))
+    e_row = iwfm.fe_locate(xs, ys, geometry[2], geometry[3])
+    elems = np.where(e_row >= 0, elem_nos[np.maximum(e_row, 0)], 0)
 
-        if polygon.contains(point):
-            return e_nos[i]  # if contains() is true, end and return element number
-    return 0  # point is not inside any element
+    scalar = np.ndim(x) == 0
+    if scalar:
+        elems = int(elems[0])
+    if not local:
+        return elems
+    coords = iwfm.fe_local(xs, ys, e_row, geometry)
+    return elems, (coords[0] if scalar else coords)
@@ -77,9 +77,9 @@ def iwfm_adj_crops(
 
     elem_zones = iwfm.read_lu_change_zones(in_zone_file)
 
-    npag_table, dates, elems = iwfm.read_lu_file(in_area_npag, skip) # read ag
-    nvrv_table, _, _ = iwfm.read_lu_file(in_area_nvrv, skip)     # read nv
-    urban_table, _, _ = iwfm.read_lu_file(in_area_urban, skip)   # read urban
+    npag_table, dates, elems = iwfm.read_lu_array(in_area_npag, skip, dtype=float)  # read ag
+    nvrv_table, _, _ = iwfm.read_lu_array(in_area_nvrv, skip, dtype=float)          # read nv
+    urban_table, _, _ = iwfm.read_lu_array(in_area_urban, skip, dtype=float)        # read urban
 
     changes_NV = iwfm.read_lu_change_factors(in_chg_file_NV)
     changes_UR = iwfm.read_lu_change_factors(in_chg_file_UR)
@@ -88,32 +88,13 @@ def iwfm_adj_crops(
     chg_col_nv = iwfm.get_change_col(changes_NV, in_year, in_chg_file_NV)
     chg_col_ur = iwfm.get_change_col(changes_UR, in_year, in_chg_file_UR)
 
-    lu_rows = len(npag_table[0])  # number of rows in land use files
-
-    for i in range(0, len(npag_table)):
-        for j in range(0, len(elem_zones) - 1):  # cycle through elements in zone list
-            elem, zone = elem_zones[j][0], elem_zones[j][1]
-            ag2nv, ag2ur = (
-                1.0 - changes_NV[zone][chg_col_nv],
-                1.0 - changes_UR[zone][chg_col_ur],
-            )  # factors for this zone
-
-            area_ag = round(sum(npag_table[i][elem]), 2)
-            # reduce ag area and add to NV area
-            if ag2nv < 1 and area_ag > 0:
-                ag_start = sum(npag_table[i][elem])
-                temp = [round(j * ag2nv, 2) for k in npag_table[i][elem]]
-                npag_table[i][elem] = temp
-                ag_change = ag_start - sum(npag_table[i][elem])
-                nvrv_table[i][elem][0] = round(nvrv_table[i][elem][0] + ag_change, 2)
-
-            # reduce ag area and add to Urban area
-            if ag2ur < 1 and area_ag > 0:
-                ag_start = sum(npag_table[i][elem])
-                temp = [round(j * ag2ur, 2) for k in npag_table[i][elem]]
-                npag_table[i][elem] = temp
-                ag_change = ag_start - sum(npag_table[i][elem])
-                urban_table[i][elem][0] = round(urban_table[i][elem][0] + ag_change, 2)
+    # -- change factor of each element from its zone
+    ag2nv = iwfm.lu_zone_factors(elem_zones, changes_NV, chg_col_nv, elems)
+    ag2ur = iwfm.lu_zone_factors(elem_zones, changes_UR, chg_col_ur, elems)
+
+    # -- move ag area to native and urban for all time steps at once
+    npag_table, nvrv_table, urban_table = iwfm.lu_change(npag_table, nvrv_table,
+        urban_table, ag2nv, ag2ur)
 
     # -- create the output file names
     out_file_ag = out_basename + '_AG_' + in_year + '.dat'
@@ -0,0 +1,180 @@
+# iwfm_adj_crops_batch.py
+# Use change factors to make IWFM land use files for many years and scenarios
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def iwfm_adj_crops_batch(
+    scenarios,
+    in_zone_file,
+    in_area_npag,
+    in_area_nvrv,
+    in_area_urban,
+    years=None,
+    skip=4,
+    processes=4,
+    verbose=False,
+):
+    ''' iwfm_adj_crops_batch() - Use change factors to modify IWFM land use
+        files for every year of every scenario, with the same output files
+        as calling iwfm_adj_crops() for each. The land use, zone and change
+        factor files are each read once, and the output files are written
+        in parallel processes
+
+        Example:
+          scenarios = {'Base': ('nv_base.csv', 'ur_base.csv'),
+                       'High': ('nv_high.csv', 'ur_high.csv', [2030, 2050])}
+          iwfm.iwfm_adj_crops_batch(scenarios, 'zones.csv', 'npag.dat',
+              'nvrv.dat', 'urban.dat', years=[2030, 2040, 2050])
+
+    Parameters
+    ----------
+    scenarios : dictionary
+        key = output files basename, value = (Ag to Native factors file
+        name, Ag to Urban factors file name) or (Ag to Native, Ag to Urban,
+        list of years)
+
+    in_zone_file : str
+        zones file name
+
+    in_area_npag : str
+        Non-Ponded Ag Area file name
+
+    in_area_nvrv : str
+        Native and Riparian Area file name
+
+    in_area_urban : str
+        Urban Area file name
+
+    years : list, optional
+        water years for scenarios without their own list, default = every
+        year in both change factors files
+
+    skip : int, default=4
+        number of non-comment lines to skip in each file (header)
+
+    processes : int, default=4
+        number of processes for reading and writing files
+
+    verbose: bool, default=False
+        True = write to cli
+
+    Returns
+    -------
+    out_files : list
+        names of the land use files written
+
+    '''
+    import multiprocessing as mp
+    import iwfm as iwfm
+
+    elem_zones = iwfm.read_lu_change_zones(in_zone_file)
+
+    # -- only the first time step is written, so only it is changed
+    tables = iwfm.read_lu_arrays([in_area_npag, in_area_nvrv, in_area_urban], skip,
+        dtype=float, processes=processes)
+    (npag, _, elems), (nvrv, _, _), (urban, _, _) = [(t[:1], d, e) for t, d, e in tables]
+
+    changes = {}  # change factors file name: table
+
+    def change_factors(in_chg_file, in_year):
+        if in_chg_file not in changes:
+            changes[in_chg_file] = iwfm.read_lu_change_factors(in_chg_file)
+        chg_col = iwfm.get_change_col(changes[in_chg_file], in_year, in_chg_file)
+        return iwfm.lu_zone_factors(elem_zones, changes[in_chg_file], chg_col, elems)
+
+    # -- resolve every year and change here, so errors exit before the pool starts
+    job_list = []
+    for out_basename, spec in scenarios.items():
+        in_chg_file_NV, in_chg_file_UR = spec[0], spec[1]
+        scenario_years = spec[2] if len(spec) > 2 else years
+        if scenario_years is None:
+            for in_chg_file in (in_chg_file_NV, in_chg_file_UR):
+                if in_chg_file not in changes:
+                    changes[in_chg_file] = iwfm.read_lu_change_factors(in_chg_file)
+            scenario_years = sorted(set(changes[in_chg_file_NV][0][1:])
+                & set(changes[in_chg_file_UR][0][1:]))
+
+        for year in scenario_years:
+            in_year = str(year)
+            ag2nv = change_factors(in_chg_file_NV, in_year)
+            ag2ur = change_factors(in_chg_file_UR, in_year)
+            out_tables = iwfm.lu_change(npag, nvrv, urban, ag2nv, ag2ur)
+            for lu_type, code, table in zip(('Ag', 'Native', 'Urban'),
+                    ('AG', 'NV', 'UR'), out_tables):
+                out_file = out_basename + '_' + code + '_' + in_year + '.dat'
+                job_list.append((table, out_file, [in_year], lu_type, verbose))
+
+    out_files = []
+    if processes > 1:
+        with mp.Pool(processes=processes) as pool:
+            for out_file in pool.imap(write_lu_job, job_list):
+                out_files.append(out_file)
+    else:
+        out_files = [write_lu_job(job) for job in job_list]
+
+    if verbose:
+        print(f'  Wrote {len(out_files):,} land use files for {len(scenarios)} scenarios')
+    return out_files
+
+
+def write_lu_job(job):
+    ''' write_lu_job() - Write one land use file for iwfm_adj_crops_batch(),
+        job = (table, out_file, years, lu_type, verbose), returns out_file '''
+    import iwfm as iwfm
+
+    table, out_file, years, lu_type, verbose = job
+    iwfm.write_lu2file(table, out_file, years, lu_type=lu_type, verbose=verbose)
+    return out_file
+
+
+if __name__ == '__main__':
+    ' Run iwfm_adj_crops_batch() from command line '
+    import sys
+    import iwfm.debug as idb
+    import iwfm as iwfm
+
+    if len(sys.argv) > 1:  # arguments are listed on the command line
+        in_scenario_file = sys.argv[1]
+        in_zone_file = sys.argv[2]
+        in_area_npag = sys.argv[3]
+        in_area_nvrv = sys.argv[4]
+        in_area_urban = sys.argv[5]
+    else:  # ask for file names from terminal
+        in_scenario_file = input('Scenario file name (basename,NV factors file,UR factors file[,years]): ')
+        in_zone_file     = input('Zone file name: ')
+        in_area_npag     = input('Input Ag file name: ')
+        in_area_nvrv     = input('Input Native file name: ')
+        in_area_urban    = input('Input Urban file name: ')
+
+    iwfm.file_test(in_scenario_file)
+    iwfm.file_test(in_zone_file)
+    iwfm.file_test(in_area_npag)
+    iwfm.file_test(in_area_nvrv)
+    iwfm.file_test(in_area_urban)
+
+    # -- one scenario per line: basename,NV factors file,UR factors file[,year,year...]
+    scenarios = {}
+    for line in open(in_scenario_file).read().splitlines():
+        if line.strip() and line[0] not in 'Cc*#':
+            items = [item.strip() for item in line.split(',')]
+            scenarios[items[0]] = (items[1], items[2], items[3:]) if len(items) > 3 else (items[1], items[2])
+
+    idb.exe_time()  # initialize timer
+    iwfm_adj_crops_batch(scenarios, in_zone_file, in_area_npag, in_area_nvrv,
+        in_area_urban, verbose=True)
+
+    idb.exe_time()  # print elapsed time
@@ -25,16 +25,21 @@ def iwfm_lu2sub(
         a new land use file with land use for only the elements in the 
         Elements File
 
+        The land use file is read and written one line at a time, so memory
+        use does not grow with the file. Several submodels can be extracted
+        in the same pass by giving lists of element and output files.
+
     Parameters
     ----------
-    elem_file : str
-        IWFM submodel Preprocessor Element file name
+    elem_file : str or list
+        IWFM submodel Preprocessor Element file name, or list of file names
     
     lu_file : str
         IWFM base model land use area file
     
-    out_file : str
-        IWFM submodel land use area file name (output)
+    out_file : str or list
+        IWFM submodel land use area file name (output), or list of file
+        names in the same order as elem_file
     
     skip : int, default=4
         number of non-comment lines to skip in each file
@@ -47,63 +52,87 @@ def iwfm_lu2sub(
     
     Returns
     -------
-    nothing
+    count : int or list
+        number of land use lines written to out_file, or to each out_file
     
     '''
-    import sys, re, os
+    import sys
     import iwfm as iwfm
 
-    iwfm.file_test(elem_file)
-    iwfm.file_test(lu_file)
+    single = isinstance(elem_file, str)
+    elem_files = [elem_file] if single else list(elem_file)
+    out_files = [out_file] if single else list(out_file)
 
-    elem_ids, _, _ = iwfm.iwfm_read_elements(elem_file) 
-    elem_ids.sort()
+    iwfm.file_test(lu_file)
+    for filename in elem_files:
+        iwfm.file_test(filename)
 
-    lu_lines = open(lu_file).read().splitlines()  # open and read input file
-    line_index = iwfm.skip_ahead(0, lu_lines, 4) # skip comments
-    header = line_index
+    # -- element number: submodels that contain it
+    owners = {}
+    for k, filename in enumerate(elem_files):
+        elem_ids, _, _ = iwfm.iwfm_read_elements(filename)
+        for elem in set(elem_ids):
+            owners.setdefault(int(elem), []).append(k)
 
     if verbose:
         outport = iwfm.Unbuffered(sys.stdout)  # to write unbuffered output to console
 
-    out_lines, print_count = [], 0
-    while line_index < len(lu_lines):
-        out = []
-        this_line = lu_lines[line_index].split()
-        if re.search('/', lu_lines[line_index]):  # catch date
-            this_date = this_line.pop(0)
-
-            if verbose:  # write progress to console
-                if print_count > per_line - 2:
-                    outport.write(' ' + this_date[:10])
-                    print_count = 0
-                else:
-                    if print_count == 0:
-                        outport.write('\n  ' + this_date[:10])
-                    else:
-                        outport.write(' ' + this_date[:10])
-                    print_count += 1
-
-        # -- build the output line
-        if int(this_line[0]) in elem_ids:
-            if int(this_line[0]) == elem_ids[0]:  # first element -> add date
-                out.append(this_date)
-            for j in range(0, len(this_line)):  # add the rest of the line
-                out.append('\t' + this_line[j])
-            out_lines.append(out)
-        line_index += 1
-    outport.write('\n')
-
-    with open(out_file, 'w') as f:
-        for i in range(0, header):  # copy top of input file to output
-            f.write(lu_lines[i])
-            f.write('\n')
-        for i in range(0, len(out_lines)):
-            this_line = out_lines[i]
-            for j in range(0, len(this_line)):
-                f.write(this_line[j])
-            f.write('\n')
-    return len(out_lines)
+    comments = 'Cc*#'
+    counts = [0] * len(out_files)
+    outs = [open(filename, 'w') for filename in out_files]
+    try:
+        with open(lu_file) as lu:
+            # -- copy top of input file to output
+            skip_lines = skip
+            for line in lu:
+                line = line.rstrip('\n')
+                if skip_lines == 0 and line and line[0] not in comments:
+                    break
+                if line and line[0] not in comments:
+                    skip_lines -= 1
+                for f in outs:
+                    f.write(line + '\n')
+            else:
+                line = ''
+
+            this_date, dated, print_count = '', [True] * len(outs), 0
+            while True:
+                this_line = line.split()
+                if this_line and line[0] not in comments:
+                    if '/' in this_line[0]:  # catch date
+                        this_date = this_line.pop(0)
+                        dated = [False] * len(outs)
+
+                        if verbose:  # write progress to console
+                            if print_count > per_line - 2:
+                                outport.write(' ' + this_date[:10])
+                                print_count = 0
+                            else:
+                                if print_count == 0:
+                                    outport.write('\n  ' + this_date[:10])
+                                else:
+                                    outport.write(' ' + this_date[:10])
+                                print_count += 1
+
+                    # -- write the line to each submodel with this element
+                    for k in owners.get(int(this_line[0]), ()):
+                        text = '\t' + '\t'.join(this_line) + '\n'
+                        if not dated[k]:  # first element of time step -> add date
+                            text = this_date + text
+                            dated[k] = True
+                        outs[k].write(text)
+                        counts[k] += 1
+
+                line = next(lu, None)
+                if line is None:
+                    break
+    finally:
+        for f in outs:
+            f.close()
+
+    if verbose:
+        outport.write('\n')
+    return counts[0] if single else counts
 
 
 if __name__ == '__main__':
@@ -24,13 +24,16 @@ def iwfm_lu4scenario(
     in_urban_file,
     in_nvrv_file,
     skip=4,
+    step=0,
+    processes=4,
     verbose=False,
 ):
     ''' iwfm_lu4scenario() - Modify IWFM land use files for a scenario
 
-    TODO:
-      Each land use file is done in series. Can this be replaced with a function that
-        does one land use file, and use the function for each land use file?
+        The four land use files are read in parallel into arrays with
+        iwfm.read_lu_arrays(), and one time step of the first 20 non-ponded
+        crops, 5 ponded crops, native and riparian, and urban areas is
+        written as one table, with the values as written in the input files.
 
     Parameters
     ----------
@@ -51,7 +54,13 @@ def iwfm_lu4scenario(
     
     skip : int, default=4
         number of non-comment lines to skip in each file (header)
-    
+
+    step : int, default=0
+        time step to write, 0 = first
+
+    processes : int, default=4
+        number of processes reading the land use files
+
     verbose : bool, default=False
         True = command-line output on
 
@@ -60,153 +69,32 @@ def iwfm_lu4scenario(
     nothing
 
     '''
-    comments = 'Cc*#'
+    import numpy as np
+    import iwfm as iwfm
 
-    # -- Non-Ponded Area file
-    npag_data = open(in_npag_file).read().splitlines()
+    files = [in_npag_file, in_ponded_file, in_urban_file, in_nvrv_file]
+    tables = iwfm.read_lu_arrays(files, skip, dtype=str, processes=processes)
     if verbose:
-        print(f'   Read {len(npag_data):,} lines from {in_npag_file}')
-
-    npag_index = 0
-    while any((c in comments) for c in npag_data[npag_index][0]): 
-        npag_index += 1
-    for i in range(0, skip):  # skip data spec rows
-        npag_index += 1
-    while any((c in comments) for c in npag_data[npag_index][0]):
-        npag_index += 1
-
-    # -- compile the data from the file 
-    # the first line contains the date, elemeno, and land use data
-    line = npag_data[npag_index].split()
-    date = line.pop(0)
-    elem = line.pop(0)
-    npag_table = []
-    npag_table.append(line)
-    npag_index += 1
-    npag_cols = len(line)  # including elem_no column
-    # do the remaining lines
-    while npag_index < len(npag_data):
-        line = npag_data[npag_index].split()
-        elem = line.pop(0)
-        npag_table.append(line)
-        npag_index += 1
-
-    # -- Ponded Area file 
-    pag_data = open(in_ponded_file).read().splitlines() 
-    if verbose:
-        print(f'   Read {len(pag_data):,} lines from {in_ponded_file}')
-
-    pag_index = 0
-    while any((c in comments) for c in pag_data[pag_index][0]):
-        pag_index += 1
-    for i in range(0, skip):  # skip data spec rows
-        pag_index += 1
-    while any((c in comments) for c in pag_data[pag_index][0]):
-        pag_index += 1
-
-    # -- compile the data from the file 
-    # the first line contains the date, elemeno, and land use data
-    line = pag_data[pag_index].split()
-    date = line.pop(0)
-    elem = line.pop(0)
-    pag_table = []
-    pag_table.append(line)
-    pag_index += 1
-    pag_cols = len(line)  # including elem_no column
-    # do the remaining lines
-    while pag_index < len(pag_data):
-        line = pag_data[pag_index].split()
-        elem = line.pop(0)
-        pag_table.append(line)
-        pag_index += 1
-
-    # -- Urban Area file 
-    urb_data = open(in_urban_file).read().splitlines() 
-    if verbose:
-        print(f'   Read {len(urb_data):,} lines from {in_urban_file}')
-
-    urb_index = 0
-    while any((c in comments) for c in urb_data[urb_index][0]):
-        urb_index += 1
-    for i in range(0, skip):  # skip data spec rows
-        urb_index += 1
-    while any((c in comments) for c in urb_data[urb_index][0]):
-        urb_index += 1
-
-    # -- compile the data from the file 
-    # the first line contains the date, elemeno, and land use data
-    line = urb_data[urb_index].split()
-    date = line.pop(0)
-    elem = line.pop(0)
-    urb_table = []
-    urb_table.append(line)
-    urb_index += 1
-    urb_cols = len(line)  # including elem_no column
-    # do the remaining lines
-    while urb_index < len(urb_data):
-        line = urb_data[urb_index].split()
-        elem = line.pop(0)
-        urb_table.append(line)
-        urb_index += 1
-
-    # -- Native and Riparian Area file
-    nvrv_data = open(in_nvrv_file).read().splitlines()
-    if verbose:
-        print(f'   Read {len(nvrv_data):,} lines from {in_nvrv_file}')
-
-    nvrv_index = 0
-    while any((c in comments) for c in nvrv_data[nvrv_index][0]):
-        nvrv_index += 1
-    for i in range(0, skip):  # skip data spec rows
-        nvrv_index += 1
-    while any((c in comments) for c in nvrv_data[nvrv_index][0]):
-        nvrv_index += 1
-
-    # -- compile the data from the file 
-    # the first line contains the date, elemeno, and land use data
-    line = nvrv_data[nvrv_index].split()
-    date = line.pop(0)
-    elem = line.pop(0)
-    nvrv_table = []
-    nvrv_table.append(line)
-    nvrv_index += 1
-    nvrv_cols = len(line)  # including elem_no column
-    # do the remaining lines
-    while nvrv_index < len(nvrv_data):
-        line = nvrv_data[nvrv_index].split()
-        elem = line.pop(0)
-        nvrv_table.append(line)
-        nvrv_index += 1
+        for filename, (table, _, _) in zip(files, tables):
+            print(f'   Read {table.shape[0]:,} time steps of {table.shape[1]:,} elements from {filename}')
+
+    (npag, dates, elems), (pag, _, _), (urb, _, _), (nvrv, _, _) = tables
+    date = iwfm.dss_date(dates[step].astype('datetime64[s]').item())
 
     # -- build one table from the four data sets
-    import itertools
-
-    land_use = []
-    for i in range(0, len(npag_table)):
-        npag = npag_table[i][0:20]
-        pag = pag_table[i]
-        urb = urb_table[i][0]
-        nvrv = nvrv_table[i]
-        x = []
-        x.append([str(i + 1)])
-        x.append(npag_table[i][0:20])
-        x.append(pag_table[i][0:5])
-        x.append(nvrv_table[i][0:2])
-        y = list(itertools.chain.from_iterable(x))
-        y.append(urb_table[i][0])
-        land_use.append(y)
+    columns = [npag[step][:, :20], pag[step][:, :5], nvrv[step][:, :2], urb[step][:, :1]]
+    land_use = np.column_stack([elems.astype(str)] + columns)
+
+    names = ([f'NPA{i + 1}' for i in range(columns[0].shape[1])]
+        + [f'PA{i + 1}' for i in range(columns[1].shape[1])]
+        + ['NV', 'RV'][:columns[2].shape[1]] + ['Urb'])
 
     # -- write to file
     outFileName = out_base_name + '_Landuse.dat'
-    outFile = open(outFileName, 'w', newline='')
-    outFile.write(f'# Date: {date}\n')
-    outFile.write(
-        '# Elem\tNPA1\tNPA2\tNPA3\tNPA4\tNPA5\tNPA6\tNPA7\tNPA8\tNPA9\tNPA10\tNPA11\tNPA12\tNPA13\tNPA14\tNPA15\tNPA16\tNPA17\tNPA18\tNPA19\tNPA20\tPA1\tPA2\tPA3\tPA4\tPA5\tNV\tRV\tUrb\n'
-    )
-    for i in range(0, len(npag_table)):
-        outFile.write('\t'.join(land_use[i]))
-        outFile.write('\n')
-    outFile.close
+    with open(outFileName, 'w', newline='') as outFile:
+        outFile.write(f'# Date: {date}\n')
+        outFile.write('# Elem\t' + '\t'.join(names) + '\n')
+        outFile.write('\n'.join('\t'.join(row) for row in land_use.tolist()) + '\n')
     if verbose:
         print(f'   Wrote land use data for {date} to {outFileName}')
     return
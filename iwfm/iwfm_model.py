@@ -432,21 +432,8 @@ class iwfm_model:
     def elems2poly(self):
         ''' elem_poly() - Compile a dictionary of model elements as shapely 
             polygons'''
-
-        self.d_elem_polys = {}
-        for key in self.d_elem_nodes:  # for each element ...
-            elem = key
-            nodes = self.d_elem_nodes[key]
-
-            coords = []
-            for node in nodes:  # for each node in the element ...
-                # tuple of (x,y) coordinates
-                coords.append(Point(self.d_nodexy[node][0], self.d_nodexy[node][1]))  
-            # close the polygon
-            coords.append(Point(self.d_nodexy[nodes[0]][0], self.d_nodexy[nodes[0]][1]))
-
-            new_poly = Polygon([[p.x, p.y] for p in coords])
-            self.d_elem_polys[elem] = new_poly  # list of coords for all elements
+        polys = iwfm.elem_polygons(self.d_elem_nodes, self.d_nodexy)
+        self.d_elem_polys = dict(zip(self.d_elem_nodes.keys(), polys))
         return
 
 
@@ -463,22 +450,4 @@ class iwfm_model:
     def elem_coords(self):
         ''' elem_coords() - Return a list of coordinates of an element 
             [[x0,y0],[x1,y1],[x2,y2]<,...>]'''
-        polys = []
-        for i in range(0, len(self.elem_nodes)):  # for each element ...
-            coords = []
-            # for each node in the element ...
-            for j in range(0, len(self.elem_nodes[i])):  
-                coords.append(
-                    (
-                        self.node_coords[self.elem_nodes[i][j] - 1][0],
-                        self.node_coords[self.elem_nodes[i][j] - 1][1],
-                    )
-                )
-            coords.append(
-                (
-                    self.node_coords[self.elem_nodes[i][0] - 1][0],
-                    self.node_coords[self.elem_nodes[i][0] - 1][1],
-                )
-            )  # close the polygon
-            polys.append(coords)
-        return polys
+        return iwfm.elem_poly_coords(self.d_elem_nodes, self.d_nodexy)
@@ -35,21 +35,21 @@ def iwfm_nearest_nodes(filename, node_set):
     number of points processed
     
     '''
+    import numpy as np
     import iwfm as iwfm
 
     output_filename = filename[0 : filename.find('.')] + '_nodes.out'
+    with open(filename, 'r') as input_file:
+        lines = input_file.read().splitlines()  # open and read input file
+
+    # all points in one query, skipping the header line
+    points = np.array([line.split()[1:3] for line in lines[1:]], dtype=float).reshape(-1, 2)
+    nearest, dist = iwfm.node_tree(node_set).query(points[:, 0], points[:, 1])
+
+    out_lines = [f'{lines[0]}\tNdNear\tNdDist']
+    out_lines.extend(f'{line}\t{node}\t{d}' for line, node, d 
+        in zip(lines[1:], nearest.tolist(), dist.tolist()))
     with open(output_filename, 'w') as output_file:
-        with open(filename, 'r') as input_file:
-            lines = input_file.read().splitlines()  # open and read input file
-            output_file.write(f'{lines[0]}\tNdNear\tNdDist\n')
-            for line_index in range(1, len(lines)):  # skip header line
-                temp = lines[line_index].split()
-                nearest = iwfm.nearest_node([float(temp[1]), float(temp[2])], node_set)
-                dist = iwfm.distance(
-                    [float(temp[1]), float(temp[2])],
-                    [node_set[nearest][1], node_set[nearest][2]],
-                ) 
-                # write out
-                output_file.write(f'{lines[line_index]}\t{nearest}\t{dist}\n')
+        output_file.write('\n'.join(out_lines) + '\n')
 
     return len(lines) - 1
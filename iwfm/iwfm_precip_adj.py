@@ -19,12 +19,18 @@
 
 
 def iwfm_precip_adj(precip_filename,elem_VIC_filemane,factors_filename,
-    years_filename,out_filename,verbose=False,per_line=6):
+    years_filename,out_filename,verbose=False,per_line=6,block=10000,
+    factors_out='factors.dat'):
     ''' iwfm_precip_adj() - Read an IWFM precipitation file, a list of VIC grid 
         cells for each precipitation column, and a table of monthly adjustment 
         factors for each VIC grid cell, and writes out an IWFM precipitation 
         file with precipitation rates adjusted by the VIC factors
 
+        The VIC factors are held as a (years, months, VIC cells) array, and
+        the precipitation file is read, adjusted and written in blocks of
+        (dates, precipitation columns), each block with one fancy-indexed
+        multiplication.
+
     Parameters
     ----------
     precip_filename : str
@@ -48,12 +54,19 @@ def iwfm_precip_adj(precip_filename,elem_VIC_filemane,factors_filename,
     per_line : int, default=6
       If verbose==True, number of items to write to CLI per line
 
+    block : int, default=10000
+      Number of precipitation dates adjusted at once
+
+    factors_out : str, default='factors.dat'
+      Name of output file with the factor applied to each date and column
+
     Returns
     -------
     nothing
 
     '''
     import re, sys
+    import itertools
     import numpy as np
     import iwfm as iwfm
 
@@ -72,20 +85,18 @@ def iwfm_precip_adj(precip_filename,elem_VIC_filemane,factors_filename,
     if verbose:
         print(f'  Read VIC grid data for {vic_rows:,} precipitation columns')
 
-    # -- get the climate factors ------------------------------------
+    # -- get the climate factors as a (years, months, VIC cells) array ---
     factors = open(factors_filename).read().splitlines()  # open and read input file
     factors.pop(0)  # remove header row
-    
-    d_factors, vic_years, i = {}, [], 0
-    while i < len(factors) and len(factors[i]) > 1:  # put factors into a dictionary
-        factor = re.split(';|,|\t', factors[i])
-        mm, dd, yy = re.split('/', factor[0])
-        month = str(yy) + '-' + str(mm)
-        if yy not in vic_years:
-            vic_years.append(yy)  # list of calendar years with factors
-        factor = [float(x) for x in factor[1:]]
-        d_factors[month] = factor
-        i += 1
+    factors = list(itertools.takewhile(lambda line: len(line) > 1, factors))
+
+    f_dates = np.array([[int(x) for x in re.split(';|,|\t', line, 1)[0].split('/')]
+        for line in factors], dtype=np.int64).reshape(-1, 3)  # mm, dd, yy
+    f_values = np.array([[float(x) for x in re.split(';|,|\t', line)[1:]]
+        for line in factors], dtype=float)
+    vic_years = np.unique(f_dates[:, 2])  # calendar years with factors
+    d_factors = np.full((len(vic_years), 12, f_values.shape[1]), np.nan)
+    d_factors[np.searchsorted(vic_years, f_dates[:, 2]), f_dates[:, 0] - 1] = f_values
 
    # -- replacement years for years without VIC factors ------------
     rep_years = open(years_filename).read().splitlines()  # open and read input file
@@ -95,90 +106,102 @@ def iwfm_precip_adj(precip_filename,elem_VIC_filemane,factors_filename,
     for i in range(1, len(rep_list)):
         d_repyr_col[rep_list[i]] = i - 1
 
-    # create a dictionary of all years and replacement years for missing VIC years
-    rep_years.pop(0)  # remove header line
-    d_VICyear = {}
-    for year in rep_years:
-        item = re.split(';|,|\t', year)
-        item = [int(x) for x in item]
-        d_VICyear[item[0]] = item[1:]
+    # (years, regions) replacement years for missing VIC years, row = year - first
+    rep = np.array([[int(x) for x in re.split(';|,|\t', line)]
+        for line in rep_years[1:] if line.strip()], dtype=np.int64)
+    rep_first = rep[:, 0].min()
+    d_VICyear = np.zeros((rep[:, 0].max() - rep_first + 1, rep.shape[1] - 1), dtype=np.int64)
+    d_VICyear[rep[:, 0] - rep_first] = rep[:, 1:]
 
     # -- read IWFM precipitation file ------------------------------------
-    precip = open(precip_filename).read().splitlines()  # open and read input file
-
-    with open(out_filename, 'w') as of: # open output file for copy of header info
-
-        # find line with first data set, get month and year
-        pline, status = 0, 1  # pline = line being processed, continue until status < 1
-        while status > 0:
-            if precip[pline][0] == 'C':  # skip lines that begin with 'C', 'c' or '*'
-                of.write(precip[pline] + '\n')
-                pline += 1
-            elif precip[pline][0] != 'C':
-                if skip > 0:  # also handle the other header lines
-                    of.write(precip[pline] + '\n')
-                    skip -= 1
-                    pline += 1
-                else:
-                    items = precip[pline].split()
-                    pmonth = int(items[0][0:2])
-                    pyear = int(items[0][6:10])
-                    cols = len(items)
-                    status = 0
+    with open(precip_filename) as precip, open(out_filename, 'w') as of: 
+
+        # copy the header info, find line with first data set
+        for line in precip:
+            line = line.rstrip('\n')
+            if line[0] == 'C':  # skip lines that begin with 'C'
+                of.write(line + '\n')
+            elif skip > 0:  # also handle the other header lines
+                of.write(line + '\n')
+                skip -= 1
+            else:
+                break
+        cols = len(line.split())
+
+        # -- precipitation column map: VIC cell and replacement year column
+        ncols = cols - 1
+        has_vic = np.array([e in vic_cols for e in range(1, cols)], dtype=bool)
+        vic_index = np.array([vic_cols[e][0] - 1 if e in vic_cols else 0
+            for e in range(1, cols)], dtype=np.int64)
+        regions = [vic_cols[e][1] for e in range(1, cols) if e in vic_cols]
+        unknown = [r for r in regions if r not in d_repyr_col]
+        if unknown:
+            raise KeyError(f'region {unknown[0]} not in {years_filename}')
+        region_col = np.array([d_repyr_col[vic_cols[e][1]] if e in vic_cols else 0
+            for e in range(1, cols)], dtype=np.int64)
+        ex = [e for e in range(1, cols) if e not in vic_cols]  # no VIC ID == no change
 
         # -- do the work -------------------------------------------------
-        if verbose:
-            print(f'  Processing {len(precip) - pline :,} precipitation dates...')
-
         if verbose:  # create outport to write unbuffered output to console
+            print(f'  Processing precipitation dates...')
             outport = iwfm.Unbuffered(sys.stdout)
 
         print_count = 0
         # write out the factors to a separate file just in case...
-        with open('factors.dat', 'w') as factfile:  
+        with open(factors_out, 'w') as factfile:  
             factfile.write('Date            \t' + '\t'.join(map(str, [i for i in range(1,cols+1)])) + '\n')
 
-            # process each row of the precipitation file, replacing adjusted values
-            while pline < len(precip) and len(precip[pline]) > 10:
-                items = precip[pline].split()
-                pline += 1
-
-                p = [float(x) for x in items[1:]] # precip
+            # process blocks of rows of the precipitation file
+            lines = itertools.chain([line], (line.rstrip('\n') for line in precip))
+            lines = itertools.takewhile(lambda line: len(line) > 10, lines)
+            while True:
+                rows = [line.split(None, 1) for line in itertools.islice(lines, block)]
+                if not rows:
+                    break
+                dates = [row[0] for row in rows]
+                p = np.fromstring(' '.join(row[1] for row in rows), dtype=float, sep=' ')
+                if p.size != len(rows) * ncols:
+                    raise ValueError(f'{precip_filename}: precipitation lines near '
+                                     f'{dates[0]} do not all have {ncols} columns')
+                p = p.reshape(len(rows), ncols)  # precip
 
-                date = items[0].replace('_24:00', '')
                 if verbose:  # write progress to console
-                    if print_count > per_line - 2:
-                        outport.write(' ' + date)
-                        print_count = 0
-                    else:
-                        if print_count == 0:
-                            outport.write('\n  ' + date)
-                        else:
+                    for date in dates:
+                        date = date.replace('_24:00', '')
+                        if print_count > per_line - 2:
                             outport.write(' ' + date)
-                        print_count += 1
-
-                f, ex = [], []
-                for e in range(1, len(items)):  # cycle through precip columns
-                    try:
-                        vic_id = vic_cols[e][0]  # precip column -> VIC_ID
-                    except:  # no VIC ID for this column == no change
-                        f.append(1.0)  # factor of precip column
-                        ex.append(e)
-                    else:
-                        mm, dd, yy = re.split('/', date)
-                        month = str(yy) + '-' + str(int(mm))
-
-                        if yy not in vic_years:  # use replacement years
-                            # replacement year can vary by precip column
-                            repyr = d_VICyear[int(yy)]     # replacement year as string
-                            yy = repyr[d_repyr_col[vic_cols[e][1]]]
-                            month = str(yy) + '-' + str(int(mm))
-
-                        f.append(d_factors[month][vic_id-1])  # factor of precip column
-
-                new_p = np.round(np.array(p) * np.array(f), 2)
-                of.write(items[0] + '\t' + '\t'.join(map(str, new_p)) + '\n')
-                factfile.write(items[0] + '\t' + '\t'.join(map(str, [round(F,2) for F in f])) + '\n')
+                            print_count = 0
+                        else:
+                            if print_count == 0:
+                                outport.write('\n  ' + date)
+                            else:
+                                outport.write(' ' + date)
+                            print_count += 1
+
+                # -- factor of each date and precip column
+                mm = np.array([int(d[0:2]) for d in dates], dtype=np.int64)
+                yy = np.array([int(d[6:10]) for d in dates], dtype=np.int64)
+                year_row = np.searchsorted(vic_years, yy).clip(0, len(vic_years) - 1)
+                in_vic = vic_years[year_row] == yy
+                if not in_vic.all():  # use replacement years, by precip column region
+                    missing = yy[~in_vic]
+                    if (missing < rep_first).any() or (missing - rep_first >= len(d_VICyear)).any():
+                        raise KeyError(f'{missing[0]} not in {years_filename}')
+                    rep_year = d_VICyear[(yy - rep_first).clip(0, len(d_VICyear) - 1)][:, region_col]
+                    year = np.where(in_vic[:, None], yy[:, None], rep_year)
+                    year_row = np.searchsorted(vic_years, year).clip(0, len(vic_years) - 1)
+                    if (vic_years[year_row] != year)[:, has_vic].any():
+                        raise KeyError(f'replacement year not in {factors_filename}')
+                else:
+                    year_row = np.broadcast_to(year_row[:, None], p.shape)
+                f = d_factors[year_row, (mm - 1)[:, None], vic_index[None, :]]
+                f = np.where(has_vic[None, :], f, 1.0)
+                if np.isnan(f).any():
+                    raise KeyError(f'month without factors in {factors_filename}')
+
+                new_p = np.round(p * f, 2)
+                of.write(iwfm.format_table(new_p, 2, labels=dates, lead='\t'))
+                factfile.write(iwfm.format_table(f, 2, labels=dates, lead='\t'))
 
 
     if verbose:  # write progress to console
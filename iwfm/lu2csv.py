@@ -17,13 +17,19 @@
 # -----------------------------------------------------------------------------
 
 
-def lu2csv(inFileName, skip=4, verbose=False):
-    ''' lu2csv() - Read an IWFM land use file and write to a csv file
+def lu2csv(inFileName, skip=4, verbose=False, block=100000):
+    ''' lu2csv() - Read an IWFM land use file (or another IWFM time series
+        file, e.g. precipitation or ET) and write to a csv file, with the
+        date of each line split into year, month and day columns
+
+        The file is converted in blocks of lines, so memory use does not
+        grow with the file.
 
     Parameters
     ----------
     inFileName : str
-        base name of output files
+        name of IWFM input file, the output file has the same name with
+        extension csv
 
     skip : int, default=4
         number of non-comment lines to skip in eac file
@@ -31,46 +37,54 @@ def lu2csv(inFileName, skip=4, verbose=False):
     verbose : bool, default=False
         True = command-line output on
 
+    block : int, default=100000
+        number of lines converted at once
+
     Returns
     -------
-    nothing
+    outFileName : str
+        name of csv file
     '''
-    import csv, os
+    import os
+    import itertools
+    import numpy as np
+
     comments = 'Cc*#'
 
     outFileName = os.path.splitext(inFileName)[0] + '.csv'
-    year, month, day = 0, 0, 0
+    date = '0,0,0,'  # year, month, day before the first date
 
     # -- read land use file ------------------------------------
+    count = 0
     with open(inFileName, 'r') as inFile:
         with open(outFileName, 'w', newline='') as outFile:
-            outWriter = csv.writer(outFile)
-            count = 0
-            line = inFile.readline()  # read input file
-            while len(line) > 0:
-                if line[0] not in comments:  # skip lines that begin with comment char
-                    if skip > 0:
-                        skip = skip - 1
-                    else:
-                        items = line.split()
-                        if '/' in items[0]:  # contains a date, change dates
-                            month = items[0][0:2]
-                            day = items[0][3:5]
-                            year = items[0][6:10]
-                            items.pop(0)
-                        # insert date (year, month, day)
-                        items.insert(0, day)
-                        items.insert(0, month)
-                        items.insert(0, year)
-                        # write it out
-                        outWriter.writerow(items)
-                        count = count + 1
-                line = inFile.readline()  # read next line from input file
+            # skip lines that begin with comment char, and the header lines
+            lines = (line for line in inFile if line[0] not in comments)
+            lines = itertools.islice(lines, skip, None)
+            while True:
+                chunk = list(itertools.islice(lines, block))
+                if not chunk:
+                    break
+                items = [row for row in (line.split() for line in chunk) if row]
+                if not items:  # blank lines
+                    continue
+
+                # -- year, month and day of each line from the last date line
+                is_date = np.array(['/' in row[0] for row in items])
+                dates = [date] + [f'{row[0][6:10]},{row[0][0:2]},{row[0][3:5]},'
+                    for row, d in zip(items, is_date) if d]
+                last = np.maximum.accumulate(np.where(is_date, np.cumsum(is_date), 0))
+                date = dates[-1]
+
+                # -- write it out, as csv.writer() does
+                outFile.write(''.join(dates[k] + ','.join(row[1:] if d else row) + '\r\n'
+                    for k, d, row in zip(last.tolist(), is_date.tolist(), items)))
+                count += len(items)
 
     if verbose:
         print(f'  {count:,} lines from {inFileName} written to {outFileName}')
 
-    return
+    return outFileName
 
 
 if __name__ == "__main__":
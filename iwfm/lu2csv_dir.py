@@ -0,0 +1,102 @@
+# lu2csv_dir.py
+# Convert the IWFM land use and time series files in a directory to csv files
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def lu2csv_dir(directory, patterns=('*.dat',), skip=4, processes=4, force=False,
+               verbose=False):
+    ''' lu2csv_dir() - Convert the IWFM land use, precipitation, ET and other
+        time series files in a directory to csv files with lu2csv(), several
+        files at once. Files whose csv file is newer than the file are
+        skipped
+
+    Parameters
+    ----------
+    directory : str
+        directory with IWFM files
+
+    patterns : list, default=('*.dat',)
+        file name patterns of the files to convert, e.g.
+        ['*LandUse*.dat', '*Precip*.dat', '*ET*.dat']
+
+    skip : int, default=4
+        number of non-comment lines to skip in each file
+
+    processes : int, default=4
+        number of files converted at the same time
+
+    force : bool, default=False
+        True = convert files even if the csv file is up to date
+
+    verbose : bool, default=False
+        True = command-line output on
+
+    Returns
+    -------
+    out_files : list
+        csv files written
+
+    '''
+    import glob
+    import os
+    import multiprocessing as mp
+
+    files = sorted(set(f for pattern in patterns
+        for f in glob.glob(os.path.join(directory, pattern))))
+
+    # -- only files without an up to date csv file
+    todo = []
+    for file_name in files:
+        csv_name = os.path.splitext(file_name)[0] + '.csv'
+        if (force or not os.path.exists(csv_name)
+                or os.path.getmtime(csv_name) < os.path.getmtime(file_name)):
+            todo.append((file_name, skip, verbose))
+    if verbose:
+        print(f'  Converting {len(todo):,} of {len(files):,} files in {directory}')
+
+    if processes > 1 and len(todo) > 1:
+        with mp.Pool(processes=min(processes, len(todo))) as pool:
+            out_files = pool.starmap(lu2csv_file, todo)
+    else:
+        out_files = [lu2csv_file(*job) for job in todo]
+    return out_files
+
+
+def lu2csv_file(file_name, skip, verbose):
+    ''' lu2csv_file() - lu2csv() of one file for lu2csv_dir() '''
+    import iwfm as iwfm
+
+    return iwfm.lu2csv(file_name, skip, verbose=verbose)
+
+
+if __name__ == "__main__":
+    " Run lu2csv_dir() from command line "
+    import sys
+    import iwfm.debug as idb
+    import iwfm as iwfm
+
+    if len(sys.argv) > 1:  # arguments are listed on the command line
+        directory = sys.argv[1]
+        patterns = sys.argv[2:] if len(sys.argv) > 2 else ['*.dat']
+    else:  # ask for directory from terminal
+        directory = input('Directory with IWFM files: ')
+        patterns = input('File name patterns (default *.dat): ').split() or ['*.dat']
+
+    idb.exe_time()  # initialize timer
+    lu2csv_dir(directory, patterns, verbose=True)
+
+    idb.exe_time()  # print elapsed time
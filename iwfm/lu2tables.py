@@ -17,17 +17,27 @@
 # -----------------------------------------------------------------------------
 
 
-def lu2tables(land_use_file, verbose=False, debug=0):
+def lu2tables(land_use_file, out_type='dat', skip=4, processes=4, verbose=False, debug=0):
     '''lu2tables() - Read an IWFM land use file and write contents to a 
-       separate file for each land use type
-
-    *** INCOMPLETE - UNDER DEVELOPMENT ***
+       separate table (row=elements x col=time steps) for each land use type
 
     Parameters
     ----------
     land_use_file : str
         name of existing model land use file
 
+    out_type : str or list, default='dat'
+        output type(s): 'dat' = one text file per land use type,
+        'excel' or 'xlsx' = one workbook with one sheet per land use type,
+        'npz' = one numpy archive with arrays elems, years and one
+        (elements, time steps) array per land use type
+
+    skip : int, default=4
+        number of non-comment lines to skip in the land use file (header)
+
+    processes : int, default=4
+        number of processes writing the 'dat' files
+
     verbose : bool, default=False
         turn command-line output on or off
 
@@ -38,107 +48,52 @@ def lu2tables(land_use_file, verbose=False, debug=0):
     -------
     nothing
 
-    SUGGESTED FUTURE CHANGES:
-      - include option for output file type i.e. type='dat' with options
-            like 'csv', 'excel', 'dbf', etc
-
     '''
-    import datetime
-    import sys
+    import numpy as np
     import iwfm as iwfm
 
-    # find the base name and extension
+    out_types = [out_type] if isinstance(out_type, str) else list(out_type)
+    for this_type in out_types:
+        if this_type not in ('dat', 'excel', 'xlsx', 'npz'):
+            raise ValueError(f"out_type must be 'dat', 'excel', 'xlsx' or 'npz', not '{this_type}'")
+
+    # find the base name
     land_use_file_base = land_use_file[0 : land_use_file.find('.')]
-    land_use_file_ext = land_use_file[
-        land_use_file.find('.') + 1 : len(land_use_file) + 1
-    ]
-
-    # -- SUGGESTED FUTURE CHANGES TO IMPROVE THIS PROGRAM --
-    # -- read a cl value for output file type
-    # -- allow multiple items: pop each item from arvg[] and process it
-    # -- may need to add varnames i.e. '-ext=xlsx' or '--excel'
-    # out_file_ext = 'dat'                 # default output
-    # if len(sys.argv) > 2:                # If there is a value...
-    #    cl_value = sys.argv[2]            # Read the debug value from command line
-    # if cl_value == 'xls'||'xlsx' then call write_2_excel() to write
 
     if verbose:
         print(f'  Creating land use area tables from {land_use_file}')  
 
-    file_lines = open(land_use_file).read().splitlines()  # open input file
-
-    # determine how many elements are in this model
-    # Check lines starting at the bottom, find first line with length > 5
-    # If there's a change something else is at the bottom,
-    # then change to either skip_back(n) or test for int
-    i = len(file_lines) - 1
-    while len(file_lines[i]) < 5:
-        i -= 1
-    # the first item on this line is the largest element number
-    max_elem = int(file_lines[i].split()[0])
-
-    ts_index, elem_index = 0, 0  # time step index, element being parsed
-    line_index = iwfm.skip_ahead(0, file_lines, 4)  # skip comment lines
-
-    time_steps = int(
-        float(len(file_lines) - line_index) / float(max_elem)
-    )  # How many time steps of data?
-    dates = ['' for x in range(time_steps)]  # empty list
-    crops = (
-        len(file_lines[line_index + 3].split()) - 1
-    )  # number of crops/land use types
-    data = [
-        [['0' for z in range(time_steps)] for y in range(max_elem)]
-        for x in range(crops)
-    ]  # empty array
-
-    # fill the data and years arrays
-    while ts_index < time_steps:  # iterate through each time step
-        ts_line_index = 0
-        while ts_line_index < max_elem:  # iterate through each element
-            if debug > 0:
-                print(f'Line: {file_lines[line_index]}')
-            this_line = file_lines[line_index].split()  # line to list
-            if (
-                ts_line_index == 0
-            ):  # first line has an extra item, the date in DSS format
-                date = this_line.pop(0)  # Get the date
-                hr = int(date[11:13])  # DSS midnight = '24', datetime midnight = 0
-                if hr == 24:
-                    hr = 0
-                dates[ts_index] = datetime.datetime(
-                    int(date[6:10]),
-                    int(date[0:2]),
-                    int(date[3:5]),
-                    hr,
-                    int(date[14:16]),
-                )
-                if debug > 0:
-                    sys.stdout.write(dates[ts_index])  # update cli
-                    if ts_index + 1 < time_steps:
-                        sys.stdout.write(', ')  # update cli
-            elem = int(this_line.pop(0))  # pop the element number
-            if debug > 1:
-                print(f'elem: {elem}')
-            for i in range(crops):
-                data[i][elem - 1][ts_index] = this_line[
-                    i
-                ]  # assign values to data array
-            ts_line_index += 1
-            line_index += 1
-            # ----- end of (while ts_line_index) loop -----
-        ts_index += 1
-        # ----- end of (while ts_index) loop -----
+    # -- (time steps, elements, crops) -> (crops, elements, time steps)
+    table, dates64, elems = iwfm.read_lu_array(land_use_file, skip, dtype=float)
+    time_steps, _, crops = table.shape
+    max_elem = int(elems.max())
+    data = np.zeros((crops, max_elem, time_steps))
+    data[:, elems - 1, :] = table.transpose(2, 1, 0)  # rows by element number
+    dates = dates64.astype('datetime64[s]').tolist()  # datetime.datetime, midnight
+    if debug > 0:
+        print(f'  {time_steps} time steps, {max_elem} elements, {crops} land use types')
+        print('  ' + ', '.join(str(date) for date in dates))
 
     # write to text files
-    iwfm.write_2_dat(land_use_file_base, data, crops, max_elem, time_steps, dates)
-    if verbose:
-        print(f'  Wrote land use area tables to {land_use_file_base}_*.dat')
+    if 'dat' in out_types:
+        iwfm.write_2_dat(land_use_file_base, data, crops, max_elem, time_steps, dates,
+            processes=processes)
+        if verbose:
+            print(f'  Wrote land use area tables to {land_use_file_base}_*.dat')
 
     # write to excel workbook
-    # write_2_excel(land_use_file_base,data,crops,max_elem,time_steps,dates)
-    # if verbose:
-    #  print('  Wrote land use area tables to {}.xlsx'.format(land_use_file_base))
+    if 'excel' in out_types or 'xlsx' in out_types:
+        iwfm.write_2_excel(land_use_file_base, data, crops, max_elem, time_steps, dates)
+        if verbose:
+            print(f'  Wrote land use area tables to {land_use_file_base}.xlsx')
+
+    # write to numpy archive
+    if 'npz' in out_types:
+        years = np.array([date.year for date in dates])
+        np.savez(land_use_file_base + '.npz', elems=np.arange(1, max_elem + 1), years=years,
+            **{f'lu_{i + 1}': data[i] for i in range(crops)})
+        if verbose:
+            print(f'  Wrote land use area tables to {land_use_file_base}.npz')
 
     return
 
@@ -146,22 +101,24 @@ def lu2tables(land_use_file, verbose=False, debug=0):
 if __name__ == '__main__':
     ''' Run lu2tables() from command line 
 
-    SUGGESTED FUTURE CHANGES TO IMPROVE THIS PROGRAM
-      - allow multiple items: pop each item from arvg[] and process it
+    Usage: lu2tables.py land_use_file [dat|excel|npz ...]
 
     '''
     import sys
     import iwfm.debug as idb
     import iwfm as iwfm
 
+    out_type = 'dat'
     if len(sys.argv) > 1:  # arguments are listed on the command line
         input_file = sys.argv[1]
+        if len(sys.argv) > 2:
+            out_type = sys.argv[2:]
     else:  # ask for file names from terminal
         input_file = input('IWFM Land use file name: ')
 
     iwfm.file_test(input_file)
 
     idb.exe_time()  # initialize timer
-    lu2tables(input_file, verbose=True)
+    lu2tables(input_file, out_type=out_type, verbose=True)
 
     idb.exe_time()  # print elapsed time
@@ -0,0 +1,140 @@
+# lu_change.py
+# Move agricultural land use to native and urban land use for a scenario
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def lu_change(npag, nvrv, urban, ag2nv, ag2ur, tolerance=0.011):
+    ''' lu_change() - Move a fraction of the non-ponded ag area of each
+        element to the first native/riparian column and then a fraction of
+        what remains to the first urban column, for all time steps, elements
+        and crops at once. Areas are rounded to 2 decimals, and the total
+        area of each element is checked to be unchanged
+
+    Parameters
+    ----------
+    npag, nvrv, urban : array-like
+        (time steps, elements, land use types) non-ponded ag, native and
+        riparian, and urban areas, elements in the same order
+
+    ag2nv, ag2ur : array-like
+        (elements,) fraction of the ag area changed to native and to urban,
+        0 = no change
+
+    tolerance : float, default=0.011
+        largest allowed change in the total area of an element (rounding)
+
+    Returns
+    -------
+    npag, nvrv, urban : numpy arrays
+        changed copies of the land use areas
+
+    '''
+    import sys
+    import numpy as np
+
+    npag = np.array(npag, dtype=float)
+    nvrv = np.array(nvrv, dtype=float)
+    urban = np.array(urban, dtype=float)
+    area_start = npag.sum(axis=2) + nvrv.sum(axis=2) + urban.sum(axis=2)
+    has_ag = round2(npag.sum(axis=2)) > 0                     # (T, E)
+
+    for frac, to_table in ((ag2nv, nvrv), (ag2ur, urban)):
+        frac = np.asarray(frac, dtype=float)
+        change = has_ag & (frac > 0)[None, :]
+        if not change.any():
+            continue
+        ag_start = npag.sum(axis=2)
+        reduced = round2(npag * (1.0 - frac)[None, :, None])
+        npag = np.where(change[:, :, None], reduced, npag)
+        ag_change = ag_start - npag.sum(axis=2)
+        to_table[:, :, 0] = np.where(change, round2(to_table[:, :, 0] + ag_change),
+            to_table[:, :, 0])
+
+    # -- check area conservation
+    area_end = npag.sum(axis=2) + nvrv.sum(axis=2) + urban.sum(axis=2)
+    bad = np.abs(area_end - area_start) > tolerance
+    if bad.any():
+        t, e = np.argwhere(bad)[0]
+        print(f' ** Land use area changed in {bad.sum()} time step elements, '
+              f'first at time step {t + 1} element row {e + 1}: '
+              f'{area_start[t, e]} -> {area_end[t, e]}')
+        print(f' ** Exiting... **')
+        sys.exit()
+
+    return npag, nvrv, urban
+
+
+def round2(values):
+    ''' round2() - Round an array to 2 decimals exactly as Python's round()
+        does, re-rounding the few values near a tie one at a time '''
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    result = np.round(values, 2)
+    frac = np.abs(values * 100.0) % 1.0
+    near = np.abs(frac - 0.5) < 1e-6
+    if near.any():
+        result[near] = [round(v, 2) for v in values[near].tolist()]
+    return result
+
+
+def lu_zone_factors(elem_zones, change_table, chg_col, elems):
+    ''' lu_zone_factors() - Change factor of each land use element from its
+        change zone
+
+    Parameters
+    ----------
+    elem_zones : list
+        [element, zone] pairs (from read_lu_change_zones())
+
+    change_table : list
+        change factors, header row of years then [zone, factors...] rows
+        (from read_lu_change_factors())
+
+    chg_col : int
+        column of change_table for the year (from get_change_col())
+
+    elems : array-like
+        element numbers in land use file order
+
+    Returns
+    -------
+    factors : numpy array
+        (elements,) change factor of each element, 0 for elements in no zone
+
+    '''
+    import sys
+    import numpy as np
+
+    pairs = np.array([row[:2] for row in elem_zones], dtype=np.int64).reshape(-1, 2)
+    zones = np.array([row[0] for row in change_table[1:]], dtype=np.int64)
+    values = np.array([row[chg_col] for row in change_table[1:]], dtype=float)
+
+    size = max(zones.max(initial=0), pairs[:, 1].max(initial=0)) + 1
+    zone_factor = np.full(size, np.nan)
+    zone_factor[zones] = values
+    missing = np.isnan(zone_factor[pairs[:, 1]])
+    if missing.any():
+        print(f' ** Change zone {pairs[missing, 1][0]} not in change factors')
+        print(f' ** Exiting... **')
+        sys.exit()
+
+    elems = np.asarray(elems, dtype=np.int64)
+    size = max(elems.max(initial=0), pairs[:, 0].max(initial=0)) + 1
+    elem_factor = np.zeros(size)
+    elem_factor[pairs[:, 0]] = zone_factor[pairs[:, 1]]
+    return elem_factor[elems]
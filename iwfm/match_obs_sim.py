@@ -1,5 +1,5 @@
-# read_sim_hyds.py
-# Read simulated hydrographs from IWFM hydrograph.out file
+# match_obs_sim.py
+# Match observed and simulated values by well and date
 # Copyright (C) 2020-2021 University of California
 # -----------------------------------------------------------------------------
 # This information is free; you can redistribute it and/or modify it
@@ -16,11 +16,8 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 # -----------------------------------------------------------------------------
 
+import numpy as np
 import pandas as pd
-import sys
-sys.path.insert(0, r'P:\Projects\5658_NSJWCD\IWRFM\iwfm')
-#Let's import iwfm
-import iwfm
 
 
 
@@ -28,39 +25,137 @@ def match_obs_sim(OBS,
                   gwhyd_sim,
                   keys=["Name",
                         "Month",
-                        "Year"]):
-    ''' match_obs_sim - matches observations and simulated values for the same month and year
+                        "Year"],
+                  match='month',
+                  tolerance=None,
+                  how='inner'):
+    ''' match_obs_sim - matches observations and simulated values for the same
+        well and date, month or year. Neither input dataframe is modified
 
     Parameters
     ----------
     OBS: Pandas dataframe with observations. Date in "Date" column
     gwhyd_sim: Pandas dataframe with simulated time series (output of read_sim_hyds_df)
-    keys: columns to match when joining dataframes
+    keys: columns to match when joining dataframes. "Month" and "Year" are
+        taken from the "Date" column of each dataframe, the other keys
+        (usually the well name) must be columns of both dataframes
+    match: 'month' matches the "Month" and "Year" in keys, 'exact' matches
+        the same date, 'nearest' matches each observation to the simulated
+        value with the closest date for the same well
+    tolerance: with match='nearest', the largest date difference accepted
+        (anything pd.Timedelta takes, e.g. '15D'), None for no limit
+    how: 'inner' keeps matched rows only, 'left' also keeps unmatched
+        observations with NaN simulated values
 
 
     Returns
     -------
 
-    OBS_SIM: Pandas dataframe with OBS and SIM for joined rows
-
-
+    OBS_SIM: Pandas dataframe with OBS and SIM for joined rows, in OBS order.
+        Columns in both dataframes that are not keys get suffixes _x and _y
 
 
 
     '''
-
-    #First, lets add columns with year and month values
-
-    OBS["Year"]=OBS.Date.dt.year
-    OBS["Month"] = OBS.Date.dt.month
-
-
-    gwhyd_sim["Year"]=gwhyd_sim.Date.dt.year
-    gwhyd_sim["Month"] = gwhyd_sim.Date.dt.month
-
-    OBS_SIM=pd.merge(OBS, gwhyd_sim, on=keys, how='inner')
-
-
+    if match not in ('month', 'exact', 'nearest'):
+        raise ValueError(f"match must be 'month', 'exact' or 'nearest', not '{match}'")
+
+    well_keys = [key for key in keys if key not in ('Year', 'Month', 'Date')]
+    n_obs, n_sim = len(OBS), len(gwhyd_sim)
+
+    #Integer well codes shared by both dataframes
+    if len(well_keys) > 0:
+        both = pd.concat([OBS[well_keys], gwhyd_sim[well_keys]], ignore_index=True)
+        codes = both.groupby(well_keys, sort=False, dropna=False).ngroup().values
+    else:
+        codes = np.zeros(n_obs + n_sim, dtype=np.int64)
+
+    #Integer time keys: year-month periods, years or nanoseconds
+    dates = np.concatenate([OBS['Date'].values.astype('datetime64[ns]'),
+                            gwhyd_sim['Date'].values.astype('datetime64[ns]')])
+    no_date = np.isnat(dates)
+    if match != 'month':
+        times = dates.astype(np.int64)
+        date_keys = ['Date'] if match == 'exact' else []
+    elif 'Month' in keys:
+        times = dates.astype('datetime64[M]').astype(np.int64)
+        if 'Year' not in keys:
+            times = times % 12
+        date_keys = [key for key in ('Year', 'Month') if key in keys]
+    elif 'Year' in keys:
+        times = dates.astype('datetime64[Y]').astype(np.int64)
+        date_keys = ['Year']
+    else:
+        times = np.zeros(n_obs + n_sim, dtype=np.int64)
+        date_keys = []
+
+    #One integer key per row from the well code and the rank of the time,
+    #so sorting by key sorts by well and then by date
+    uniq, ranks = np.unique(times, return_inverse=True)
+    row_keys = codes * max(len(uniq), 1) + ranks.reshape(-1)
+    if match != 'month' or len(date_keys) > 0:
+        row_keys[no_date] = -1
+    obs_keys, sim_keys = row_keys[:n_obs], row_keys[n_obs:]
+    sim_keys[sim_keys < 0] = -2
+
+    order = np.argsort(sim_keys, kind='stable')
+    sorted_keys = sim_keys[order]
+
+    if match == 'nearest':
+        #Closest simulated date of the same well, just before or just after
+        obs_codes, sim_codes = codes[:n_obs], codes[n_obs:][order]
+        obs_times, sim_times = times[:n_obs], times[n_obs:][order]
+        pos = np.searchsorted(sorted_keys, obs_keys, side='left')
+        best = np.full(n_obs, -1, dtype=np.int64)
+        best_diff = np.full(n_obs, np.iinfo(np.int64).max, dtype=np.int64)
+        if n_sim > 0:
+            for cand in (np.minimum(pos, n_sim - 1), np.maximum(pos - 1, 0)):
+                diff = np.abs(sim_times[cand] - obs_times)
+                better = ((sim_codes[cand] == obs_codes) & (sorted_keys[cand] >= 0)
+                          & (obs_keys >= 0) & (diff < best_diff))
+                best[better], best_diff[better] = cand[better], diff[better]
+        if tolerance is not None:
+            best[best_diff > pd.Timedelta(tolerance).value] = -1
+        found = best >= 0
+        obs_idx = np.nonzero(found)[0]
+        sim_idx = order[best[found]]
+    else:
+        #All simulated rows with the same key, as pd.merge does
+        lo = np.searchsorted(sorted_keys, obs_keys, side='left')
+        hi = np.searchsorted(sorted_keys, obs_keys, side='right')
+        counts = np.where(obs_keys >= 0, hi - lo, 0)
+        obs_idx = np.repeat(np.arange(n_obs), counts)
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        sim_idx = order[np.repeat(lo, counts) + np.arange(len(obs_idx)) - first]
+
+    if how == 'left':
+        missing = np.nonzero(np.bincount(obs_idx, minlength=n_obs) == 0)[0]
+        obs_idx = np.concatenate([obs_idx, missing])
+        sim_idx = np.concatenate([sim_idx, np.full(len(missing), -1, dtype=np.int64)])
+        keep = np.argsort(obs_idx, kind='stable')
+        obs_idx, sim_idx = obs_idx[keep], sim_idx[keep]
+    elif how != 'inner':
+        raise ValueError(f"how must be 'inner' or 'left', not '{how}'")
+
+    #Assemble the joined rows, only the selected rows are copied
+    left = OBS.iloc[obs_idx].reset_index(drop=True)
+    if (sim_idx < 0).any():
+        right = gwhyd_sim.reset_index(drop=True).reindex(sim_idx).reset_index(drop=True)
+    else:
+        right = gwhyd_sim.iloc[sim_idx].reset_index(drop=True)
+
+    left_dates = left['Date']
+    for key in ('Year', 'Month'):
+        if key in date_keys:
+            left[key] = left_dates.dt.year if key == 'Year' else left_dates.dt.month
+
+    join_keys = well_keys + date_keys
+    right = right.drop(columns=[col for col in join_keys if col in right.columns])
+    common = [col for col in right.columns if col in left.columns]
+    left = left.rename(columns={col: col + '_x' for col in common})
+    right = right.rename(columns={col: col + '_y' for col in common})
+
+    OBS_SIM = pd.concat([left, right], axis=1)
 
     return OBS_SIM
 
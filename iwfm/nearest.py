@@ -23,30 +23,27 @@ def nearest(d_nodes, x, y):
 
     Parameters
     ----------
-    d_nodes : dictionary
-        key = model node, value = x and y locations
+    d_nodes : dictionary or node_tree
+        key = model node, value = x and y locations, or a node_tree of
+        the nodes to reuse across calls
     
-    x : float
-        x location of point
+    x : float or array-like
+        x location of point(s)
     
-    y : float
-        y location of point
+    y : float or array-like
+        y location of point(s)
 
     Returns
     -------
-    nearest : int
-        node ID of node closest to (x,y)
+    nearest : int or numpy int array
+        node ID of node closest to (x,y), one per point for arrays
     
     '''
+    import numpy as np
     import iwfm as iwfm
 
-    point = [x, y]
-    dist = 9.9e30
-    nearest = -1
-    for key in d_nodes:
-        pt = d_nodes[key]
-        new_dist = iwfm.distance(point, pt)
-        if dist > new_dist:
-            dist = new_dist
-            nearest = key
-    return nearest
+    tree = d_nodes if isinstance(d_nodes, iwfm.node_tree) else iwfm.node_tree(d_nodes)
+    nodes, dists = tree.query(x, y)
+    if np.ndim(x) == 0:
+        return int(nodes[0])
+    return nodes
@@ -21,16 +21,14 @@
 def nearest_node(point, node_set):
     ''' nearest_node() - Find the nearest node to a point from the node array
 
-    ** INCOMPLETE **
-    TODO: NEED TO UPDATE TO READ WELL FILE 
-
     Parameters
     ----------
     point : tuple
         (x,y) point
     
-    node_set : list
-        list of node numbers with x and y of each
+    node_set : list or node_tree
+        list of node numbers with x and y of each, or a node_tree of the
+        nodes to reuse across calls
 
     Returns
     -------
@@ -40,15 +38,9 @@ def nearest_node(point, node_set):
     '''
     import iwfm as iwfm
 
-    dist, nearest = 9.9e30, -1
-    for j in range(0, len(node_set)):
-        line = node_set[j]
-        pt = [line[1], line[2]]
-        # Compute distance between each pair of the two collections of inputs.
-        new_dist = iwfm.distance(point, pt)
-        if dist > new_dist:
-            dist, nearest = new_dist, line[0]
-    return nearest
+    tree = node_set if isinstance(node_set, iwfm.node_tree) else iwfm.node_tree(node_set)
+    nodes, dists = tree.query(point[0], point[1])
+    return int(nodes[0])
 
 if __name__ == '__main__':
     ' Run nearest_node() from command line '
@@ -68,13 +60,10 @@ if __name__ == '__main__':
 
     idb.exe_time()  # initialize timer
     node_coord, node_list = iwfm.iwfm_read_nodes(node_file)
-    # read list of points from well file
-    # ** TODO: NEED TO ADD THIS PART **
-    print(f'  ** NEED TO UPDATE nearest_node.py TO READ WELL FILE ')
-    print(f'  ** EXITING')
-    sys.exit()
+    node_set = [[node, coord[0], coord[1]] for node, coord in zip(node_list, node_coord)]
 
-    # cycle through points for nearest node
-    nearest = iwfm.nearest_node(point, node_set)
+    # nearest node of every point in the well file
+    count = iwfm.iwfm_nearest_nodes(well_file, node_set)
+    print(f'  Found the nearest nodes of {count} points')
 
     idb.exe_time()  # print elapsed time
@@ -0,0 +1,89 @@
+# node_tree.py
+# KD-tree of model node locations for nearest node searches
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+class node_tree(object):
+    ''' node_tree() - KD-tree of model node locations, built once, that
+        returns the k nearest nodes and their distances for arrays of points
+
+        Example:
+          tree = node_tree(d_nodexy)
+          nodes, dists = tree.query(x, y)        # nearest node of each point
+          nodes, dists = tree.query(x, y, k=4)   # (points, 4) arrays
+          node = iwfm.nearest(tree, x, y)        # reuse the tree in other calls
+
+        The tree is not updated when node coordinates change; build a new one.
+
+    Parameters
+    ----------
+    nodes : dictionary or list
+        key = node number, value = [x, y] (e.g. iwfm_model.d_nodexy), or
+        list of [node number, x, y], or list of [x, y] with node_ids
+
+    node_ids : list, optional
+        node numbers when nodes is a list of [x, y] (e.g. the two return
+        values of iwfm_read_nodes())
+
+    '''
+
+    def __init__(self, nodes, node_ids=None):
+        import numpy as np
+        from scipy.spatial import cKDTree
+
+        if isinstance(nodes, dict):
+            self.ids = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+            xy = np.array([nodes[key][:2] for key in nodes], dtype=float)
+        elif node_ids is not None:
+            self.ids = np.asarray(node_ids, dtype=np.int64)
+            xy = np.array([row[:2] for row in nodes], dtype=float)
+        else:
+            rows = np.array([row[:3] for row in nodes], dtype=float)
+            self.ids, xy = rows[:, 0].astype(np.int64), rows[:, 1:3]
+        self.xy = xy.reshape(-1, 2)
+        self.tree = cKDTree(self.xy)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def query(self, x, y, k=1):
+        ''' query() - Nearest k node numbers and distances of points (x,y)
+
+        Parameters
+        ----------
+        x, y : float or array-like
+            point locations
+
+        k : int, default=1
+            number of nearest nodes
+
+        Returns
+        -------
+        nodes : numpy int array
+            node numbers, shape (points,) if k == 1 else (points, k),
+            nearest first
+
+        dists : numpy float array
+            distances, same shape as nodes
+
+        '''
+        import numpy as np
+
+        points = np.column_stack([np.atleast_1d(np.asarray(x, dtype=float)),
+                                  np.atleast_1d(np.asarray(y, dtype=float))])
+        dists, index = self.tree.query(points, k=min(k, len(self.ids)))
+        return self.ids[index], dists
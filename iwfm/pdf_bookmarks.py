@@ -0,0 +1,54 @@
+# pdf_bookmarks.py
+# Add one bookmark per page to a multi-page PDF file
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def pdf_bookmarks(pdf_file, titles):
+    ''' pdf_bookmarks() - Add one bookmark per page to a multi-page PDF file,
+        with titles[i] pointing to page i
+
+    Parameters
+    ----------
+    pdf_file : str
+        name of existing PDF file, rewritten in place
+
+    titles : list
+        bookmark titles in page order
+
+    Returns
+    -------
+    count : int
+        number of bookmarks added
+
+    '''
+    import os, PyPDF2
+
+    temp_file = pdf_file + '.tmp'
+    with open(pdf_file, 'rb') as pdf_in:
+        pdfReader = PyPDF2.PdfFileReader(pdf_in)
+        pdfWriter = PyPDF2.PdfFileWriter()
+        pdfWriter.appendPagesFromReader(pdfReader)
+
+        count = min(len(titles), pdfReader.numPages)
+        for page_num in range(count):
+            pdfWriter.addBookmark(titles[page_num], page_num)
+
+        with open(temp_file, 'wb') as pdf_out:
+            pdfWriter.write(pdf_out)
+
+    os.replace(temp_file, pdf_file)
+    return count
@@ -0,0 +1,152 @@
+# read_lu_array.py
+# Read an IWFM land use file into a (time, element, crop) array
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def read_lu_array(filename, skip=4, dtype='float32', cache=False):
+    ''' read_lu_array() - Open and read an IWFM land use file into one
+        (no. time steps)x(no. elements)x(no. land use types or crops) array,
+        parsing all the numbers in one call
+
+        With cache=True the array is saved next to the land use file as
+        filename + '.lu.npy' (dates and elements in filename + '.lu.npz')
+        and, while the land use file is unchanged, later calls return it
+        memory-mapped read-only instead of parsing the file again.
+
+    Parameters
+    ----------
+    filename : str
+        IWFM land use file name
+
+    skip : int, default=4
+        number of header rows to skip
+
+    dtype : numpy dtype, default='float32'
+        data type of the returned array, str = the values as written in
+        the file
+
+    cache : bool, default=False
+        True = read and write the binary cache
+
+    Returns
+    -------
+    table : numpy array
+        (time steps, elements, crops) land use data
+
+    dates : numpy datetime64[D] array
+        date of each time step
+
+    elems : numpy int array
+        element numbers, in file order
+
+    '''
+    import os
+    import numpy as np
+    import iwfm as iwfm
+
+    if cache:
+        stat = os.stat(filename)
+        stamp = np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+        array_file, meta_file = filename + '.lu.npy', filename + '.lu.npz'
+        try:
+            with np.load(meta_file) as meta:
+                if np.array_equal(meta['stamp'], stamp):
+                    table = np.load(array_file, mmap_mode='r')
+                    if table.dtype == np.dtype(dtype) or table.dtype.kind == np.dtype(dtype).kind == 'U':
+                        return table, meta['dates'], meta['elems']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    comments = 'Cc*#'
+
+    data = open(filename).read().splitlines()
+
+    # -- find the file line with the first element's data
+    index = 0
+    while any((c in comments) for c in data[index][0]):
+        index += 1
+    index += skip  # skip data spec rows
+    while any((c in comments) for c in data[index][0]):
+        index += 1
+
+    # -- data lines; the first line of each time step starts with its date
+    lines = [line for line in data[index:] if line.strip() and line[0] not in comments]
+    first = [line.split(None, 1) for line in lines]
+    is_date = np.array(['24:00' in items[0] for items in first], dtype=bool)
+    date_text = [items[0] for items, d in zip(first, is_date) if d]
+    body = '\n'.join(items[1] if d else line for items, d, line in zip(first, is_date, lines))
+
+    ncols = len(lines[0].split()) - (1 if is_date[0] else 0)  # element + crops
+    if np.dtype(dtype).kind == 'U':  # keep the text of each value
+        values = np.array(body.split())
+    else:
+        values = np.fromstring(body, dtype=float, sep=' ')
+    nsteps = len(date_text)
+    if nsteps == 0 or values.size != len(lines) * ncols or len(lines) % nsteps != 0:
+        raise ValueError(f'{filename}: land use data is not {ncols} columns for '
+                         f'the same elements in each of {nsteps} time steps')
+    values = values.reshape(nsteps, len(lines) // nsteps, ncols)
+
+    elems = values[0, :, 0].astype(np.int64)
+    table = np.ascontiguousarray(values[:, :, 1:], dtype=dtype)
+    dates = iwfm.text2datetime64([d[:10] for d in date_text]).astype('datetime64[D]')
+
+    if cache:
+        try:
+            np.save(array_file, table)
+            with open(meta_file, 'wb') as f:
+                np.savez(f, stamp=stamp, dates=dates, elems=elems)
+        except OSError:
+            pass
+    return table, dates, elems
+
+
+def read_lu_arrays(filenames, skip=4, dtype='float32', cache=False, processes=4):
+    ''' read_lu_arrays() - Read several IWFM land use files with
+        read_lu_array(), in parallel processes
+
+    Parameters
+    ----------
+    filenames : list
+        IWFM land use file names
+
+    skip : int, default=4
+        number of header rows to skip
+
+    dtype : numpy dtype, default='float32'
+        data type of the returned arrays
+
+    cache : bool, default=False
+        True = read and write the binary caches
+
+    processes : int, default=4
+        number of processes, 1 = read the files one after another
+
+    Returns
+    -------
+    results : list
+        (table, dates, elems) from read_lu_array() for each file
+
+    '''
+    import multiprocessing as mp
+
+    args = [(filename, skip, dtype, cache) for filename in filenames]
+    processes = min(processes, len(args))
+    if processes > 1:
+        with mp.Pool(processes=processes) as pool:
+            return pool.starmap(read_lu_array, args)
+    return [read_lu_array(*arg) for arg in args]
@@ -37,40 +37,22 @@ def read_lu_file(filename, skip=4):
     
     dates : list
         DSS dates for each time step
-    
-    '''
-    comments = 'Cc*#'
 
-    data = open(filename).read().splitlines()
+    elems : list
+        element numbers, repeated for each time step
 
-    # -- find the file line with the first element's data
-    index = 0
-    while any((c in comments) for c in data[index][0]):
-        index += 1
-    index += skip  # skip data spec rows
-    while any((c in comments) for c in data[index][0]): 
-        index += 1
+    (iwfm.read_lu_array() returns the same data as arrays)
+    
+    '''
+    import numpy as np
+    import iwfm as iwfm
 
-    # -- compile the data from the file
-    table, elems, dates = [], [], []
-    line = data[index].split()
+    # -- parse the file in bulk, then return it as lists
+    values, dates, elems = iwfm.read_lu_array(filename, skip, dtype=float)
 
-    temp_table = []
-    while index < len(data):
-        line = data[index].split()
-        # if first item is a date, then clean up and start a new table
-        if '24:00' in line[0]:  # finish the last time period and start a new one
-            date = line.pop(0)  # remove the date
-            dates.append(date)
-            if len(temp_table) > 0:  # temp_table is empty for the first time period
-                table.append(temp_table)
-            temp_table = []
-        elem = int(line.pop(0))
-        elems.append(elem)
-        for j in range(0, len(line)):
-            line[j] = float(line[j])
-        temp_table.append(line)
-        index += 1
-    table.append(temp_table)  # for the last time period
+    iso = np.datetime_as_string(dates, unit='D')
+    dates = [f'{d[5:7]}/{d[8:10]}/{d[0:4]}_24:00' for d in iso]
+    table = values.tolist()
+    elems = elems.tolist() * len(dates)
 
     return table, dates, elems
@@ -30,15 +30,10 @@ def read_obs(file):
     Returns
     -------
     obs : list
-        observation dates and measurements
+        observation dates and measurements, one [well name, date, time, 
+        value] list per line, grouped by well
     
     '''
+    import iwfm as iwfm
 
-    file_lines = open(file).read().splitlines() 
-    file_lines = [word.replace('_', ' ') for word in file_lines]
-
-    obs = []
-    for item in file_lines:
-        item = item.split()
-        obs.append([item[0], item[1], item[2], float(item[3])])
-    return obs
+    return iwfm.read_obs_smp(file)
@@ -29,15 +29,13 @@ def read_obs_smp(smp_file):
     Returns
     -------
     obs : list
-        data file contents
+        data file contents, one [well name, date, time, value] list per 
+        line, grouped by well (use read_smp() for the columnar form)
     
     '''
-    file_lines = open(smp_file).read().splitlines() 
-    file_lines = [word.replace("_", " ") for word in file_lines]
-
-    obs = []
-    for j in range(0, len(file_lines)):
-        temp = file_lines[j].split()
-        obs.append([temp[0], temp[1], temp[2], float(temp[3])])
+    import iwfm as iwfm
 
+    smp, offsets = iwfm.read_smp(smp_file)
+    obs = [list(row) for row in zip(smp.Name.astype(str), smp.Date.dt.strftime('%m/%d/%Y'),
+        smp.Time, smp.Value)]
     return obs
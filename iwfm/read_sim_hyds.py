@@ -32,7 +32,8 @@ def read_sim_hyds(nhyds, gwhyd_files):
     Returns
     -------
     gwhyd_sim : list
-        list with one item of hydrograph values for each input hydrograph file
+        list with one item of hydrograph values for each input hydrograph file,
+        each a list of [date, value, value, ...] rows
 
     '''
     gwhyd_sim = []
@@ -41,11 +42,13 @@ def read_sim_hyds(nhyds, gwhyd_files):
         gwhyd_lines = (open(gwhyd_files[k]).read().splitlines())
         gwhyd_lines = [word.replace('_24:00', ' ') for word in gwhyd_lines]
 
+        hyd_rows = []
         for j in range(9, len(gwhyd_lines)):
             items= gwhyd_lines[j].split()
             temp = [items.pop(0)]
             alist = [float(x) for x in items]
             temp.extend(alist)
-            gwhyd_sim.append(temp)
+            hyd_rows.append(temp)
+        gwhyd_sim.append(hyd_rows)
 
     return gwhyd_sim
@@ -17,7 +17,7 @@
 # -----------------------------------------------------------------------------
 
 
-def read_sim_wells(gw_file):
+def read_sim_wells(gw_file, cache=False):
     ''' read_sim_wells() - Read Groundwater.dat file and build a dictionary of 
         groundwater hydrograph info and gwhyd_sim columns, and returns the 
         dictionary
@@ -27,6 +27,9 @@ def read_sim_wells(gw_file):
     gw_file : str
         IWFM Groundwater.dat file name
 
+    cache : bool, default=False
+        True = read and write the gw_hyd_info disk cache
+
     Returns
     -------
     well_dict : dictionary
@@ -35,35 +38,19 @@ def read_sim_wells(gw_file):
     
     '''
     import iwfm as iwfm
-    import re
-
-    well_dict, well_list = {}, []
-    gwhyd_info = open(gw_file).read().splitlines()
-
 
-    line_index = iwfm.skip_ahead(1, gwhyd_info, 20)  # skip to NOUTH
-    nouth = int(gwhyd_info[line_index].split()[0])
+    hyd_info = iwfm.gw_hyd_info(gw_file, cache=cache)
 
-    #Skip to GWHYDOUTFL
-    line_index = iwfm.skip_ahead(line_index, gwhyd_info, 2)
-    GWHYDOUTFL = gwhyd_info[line_index].split()[0]
-
-
-    line_index = iwfm.skip_ahead(line_index, gwhyd_info, 1)  # skip to first hydrograph
-    for i in range(0, nouth):  
-        items, line = [], re.split(r'\t+', gwhyd_info[line_index])
-        #Let's delete the layer identification from the name
-        if line[5].find('_L'+line[2])>0:
-            line[5]=line[5].replace('_L'+line[2],'')
-        items.append(line[5].upper())  # state well number = key
-        items.append(int(line[0]))     # column number in hydrograph file
-        items.append(float(line[3]))   # x
-        items.append(float(line[4]))   # y
-        items.append(int(line[2]))     # model layer
-        items.append(line[5].lower())  # well name (state well number)
-        if len(line)>6:
-            items.append(line[6])          # Comments
-        well_dict[items[0]] = items[1:]
-        well_list.append(items[0])
-        line_index += 1
-    return well_dict, well_list,nouth, GWHYDOUTFL
+    well_dict, well_list = {}, []
+    for row in range(len(hyd_info)):
+        key = hyd_info.wells[row].upper()           # state well number = key
+        items = [int(hyd_info.columns[row]),         # column number in hydrograph file
+                 float(hyd_info.x[row]),             # x
+                 float(hyd_info.y[row]),             # y
+                 int(hyd_info.layers[row]),          # model layer
+                 hyd_info.wells[row].lower()]        # well name (state well number)
+        if hyd_info.comments[row]:
+            items.append(str(hyd_info.comments[row]))  # Comments
+        well_dict[key] = items
+        well_list.append(key)
+    return well_dict, well_list, hyd_info.nouth, hyd_info.gwhydoutfl
@@ -17,11 +17,7 @@
 # -----------------------------------------------------------------------------
 
 
-def read_sim_wells_df(gw_file,sm_pywfm,crs=26910,
-                      wells_flag="C       ID   HYDTYP   IOUTHL         X               Y         IOUTH        Name                      Comment",
-                      nouth_flag="/ NOUTH",
-                      end_wells_flag="C*******************************************************************************"
-                      ):
+def read_sim_wells_df(gw_file,sm_pywfm=None,crs=26910,model=None,cache=False):
     ''' read_sim_wells_df() - Read Groundwater.dat file and build a dictionary of
         groundwater hydrograph info and gwhyd_sim columns, and returns
         Pandas dataframe
@@ -30,8 +26,17 @@ def read_sim_wells_df(gw_file,sm_pywfm,crs=26910,
     ----------
     gw_file : str
         IWFM Groundwater.dat file name
+    sm_pywfm: pywfm model, optional
+        if given, the top and layer bottom elevations at each well are
+        added as columns Top, L1_bot, L2_bot, ...
     crs: int
         EPSG number of reference system usde in the wells coordinates
+    model: iwfm_model, optional
+        if given instead of sm_pywfm, the Top and L1_bot, L2_bot, ... 
+        columns are interpolated from its nodal stratigraphy with finite 
+        element weights (iwfm.well_layers)
+    cache: bool, default=False
+        True = read and write the gw_hyd_info disk cache
 
     Returns
     -------
@@ -44,76 +49,36 @@ def read_sim_wells_df(gw_file,sm_pywfm,crs=26910,
     
     '''
     import iwfm as iwfm
+    import numpy as np
     import pandas as pd
     import geopandas
 
-    #Let's import wells file
-    lines = (open(gw_file).read().splitlines())
-
-    #Let's find nouth variable
-    lines_i = 0
-
-    while lines[lines_i].find(nouth_flag) < 0:
-        lines_i += 1
-    lines_new = lines[0:lines_i]
-
-    line_nouth=lines[lines_i].split()
-    nouth=int(line_nouth[0])
-
-    GWHYDOUTFL=lines[lines_i+2].split()[0]
-
-    #Let's find where the wells section starts
-
-    while lines[lines_i].find(wells_flag) < 0:
-        lines_i += 1
-    lines_i +=2
-
-    #Number of layers
-    nlay=sm_pywfm.get_n_layers()
-    colnames=["Name", "HYDROGRAPH ID", "X", "Y", "IOUTHL", "Comment"]
-    colnames.append("Top")
-
-    for i in range(nlay):
-        colnames.append("L"+str(i+1)+"_bot")
-
-    #Let's create dataframe where we will store the wells
-    wells_df=pd.DataFrame(columns=colnames)
-
-
-
-    #let's loop and add lines
-    while lines[lines_i].find(end_wells_flag) < 0:
-        line_dum=lines[lines_i]
-        line_dum_list=line_dum.split("\t")
-        name_dum=line_dum_list[6]
-        if name_dum.find("_L")>0:
-                name_dum=name_dum[:name_dum.find("_L")]
-        id_dum=line_dum_list[0]
-        x_dum=float(line_dum_list[3])
-        y_dum = float(line_dum_list[4])
-        comment_dum=line_dum_list[8]
-        IOUTHL_dum=line_dum_list[2]
-        lith_dum=sm_pywfm.get_stratigraphy_atXYcoordinate(x_dum, y_dum, 3.2808)
-        top_dum=lith_dum[0]
-        dict_dum={"Name":[name_dum],
-                  "HYDROGRAPH ID":[id_dum],
-                  "X":[x_dum],
-                  "Y":[y_dum],
-                  "IOUTHL":[IOUTHL_dum],
-                  "Comment":[comment_dum],
-                  "Top":[lith_dum[0]]}
-
+    hyd_info = iwfm.gw_hyd_info(gw_file, cache=cache)
+
+    #Let's build the dataframe from the hydrograph table in one go
+    wells_df=pd.DataFrame({"Name": [name[:name.find("_L")] if name.find("_L") > 0 else name
+                                    for name in hyd_info.names],
+                           "HYDROGRAPH ID": hyd_info.ids,
+                           "X": hyd_info.x,
+                           "Y": hyd_info.y,
+                           "IOUTHL": hyd_info.layers,
+                           "Comment": hyd_info.comments})
+
+    #Stratigraphy at each well, only if a model is given
+    if model is not None:
+        elevs=iwfm.well_layers(hyd_info.x, hyd_info.y, model.d_nodexy, model.d_elem_nodes, model.d_nodeelev)[1]
+        wells_df["Top"]=elevs[:, 0]
+        for i in range(elevs[:, 2::2].shape[1]):
+            wells_df["L"+str(i+1)+"_bot"]=elevs[:, 2 + 2 * i]
+    elif sm_pywfm is not None:
+        nlay=sm_pywfm.get_n_layers()
+        lith=np.array([sm_pywfm.get_stratigraphy_atXYcoordinate(x_dum, y_dum, 3.2808)[:nlay + 1]
+                       for x_dum, y_dum in zip(hyd_info.x, hyd_info.y)], dtype=float).reshape(-1, nlay + 1)
+        wells_df["Top"]=lith[:, 0]
         for i in range(nlay):
-            dict_dum["L"+str(i+1)+"_bot"]=[lith_dum[i+1]]
-
-        wells_df_dum=pd.DataFrame(dict_dum)
-        wells_df=pd.concat([wells_df,wells_df_dum],ignore_index=True)
-
-
-        lines_i += 1
-
+            wells_df["L"+str(i+1)+"_bot"]=lith[:, i + 1]
 
     wells_gdf = geopandas.GeoDataFrame(wells_df.copy(), geometry=geopandas.points_from_xy(wells_df.X, wells_df.Y,crs="EPSG:"+str(crs)))
 
 
-    return wells_df, nouth, GWHYDOUTFL, wells_gdf
+    return wells_df, hyd_info.nouth, hyd_info.gwhydoutfl, wells_gdf
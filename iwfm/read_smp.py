@@ -0,0 +1,65 @@
+# read_smp.py
+# Read a PEST smp file into columns grouped by well
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def read_smp(smp_file):
+    ''' read_smp() - Read a PEST-style smp file into a DataFrame with 
+        categorical well names, datetime64 dates and float values, with the
+        rows grouped by well and the row range of each well
+
+    Parameters
+    ----------
+    smp_file : str
+        PEST-style data file name (smp format)
+
+    Returns
+    -------
+    obs : Pandas DataFrame
+        columns Name (categorical, in order of first appearance), Date 
+        (datetime64), Time (str) and Value (float), grouped by well with 
+        each well's rows in file order
+
+    offsets : dictionary
+        key = well name, value = (first row, last row + 1) of the well in
+        obs, so obs.Value.values[start:end] is a view of its values
+
+    '''
+    import io
+    import re
+    import numpy as np
+    import pandas as pd
+
+    # split dates and times joined as MM/DD/YYYY_HH:MM:SS, leaving well names alone
+    text = re.sub(r'(/\d{4})_', r'\1 ', open(smp_file).read())
+
+    obs = pd.read_csv(io.StringIO(text), sep=r'\s+', header=None, usecols=[0, 1, 2, 3],
+        names=['Name', 'Date', 'Time', 'Value'], dtype={'Name': str, 'Date': str, 'Time': str})
+
+    obs['Date'] = pd.to_datetime(obs.Date, format='%m/%d/%Y')
+    obs['Value'] = pd.to_numeric(obs.Value).astype(float)
+    obs['Name'] = pd.Categorical(obs.Name, categories=pd.unique(obs.Name))
+
+    # group the rows by well, keeping the file order within each well
+    codes = obs.Name.cat.codes.values
+    obs = obs.iloc[np.argsort(codes, kind='stable')].reset_index(drop=True)
+
+    ends = np.cumsum(np.bincount(codes, minlength=len(obs.Name.cat.categories)))
+    starts = ends - np.bincount(codes, minlength=len(ends))
+    offsets = {name: (int(starts[i]), int(ends[i])) 
+        for i, name in enumerate(obs.Name.cat.categories)}
+    return obs, offsets
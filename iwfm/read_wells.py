@@ -18,7 +18,7 @@
 # -----------------------------------------------------------------------------
 
 
-def read_wells(infile):
+def read_wells(infile, cache=False):
     ''' read_wells() - Read IWFM Groundwater.dat file and build a dictionary
         of groundwater hydrograph info and gwhyd_sim columns
 
@@ -27,6 +27,9 @@ def read_wells(infile):
     infile : str
         IWFM Groundwaer.dat file name
 
+    cache : bool, default=False
+        True = read and write the gw_hyd_info disk cache
+
     Returns
     -------
     well_dict : dictionary
@@ -35,24 +38,12 @@ def read_wells(infile):
     '''
     import iwfm as iwfm
 
-    gwhyd_info = open(infile).read().splitlines() 
-
-    # skip to NOUTH, number of hydrographs
-    line_index = iwfm.skip_ahead(1, gwhyd_info, 20)  
-    nouth = int(gwhyd_info[line_index].split()[0])
+    hyd_info = iwfm.gw_hyd_info(infile, cache=cache)
 
     well_dict = {}
-    line_index = iwfm.skip_ahead(line_index, gwhyd_info, 3)  # skip to first hydrograph
-    for i in range(0, nouth): 
-        items = []
-        line = gwhyd_info[line_index].split()
-        items.append(line[5].upper())  # well name = key
-        items.append(int(line[0]))     # column number in hydrograph file
-        items.append(float(line[3]))   # x
-        items.append(float(line[4]))   # y
-        items.append(int(line[2]))     # model layer
-        items.append(line[5].lower())  # well name (state well number)
-        key, values = items[0], items[1:]
-        well_dict[key] = values
-        line_index = line_index + 1
+    for row in range(len(hyd_info)):
+        name = str(hyd_info.names[row])
+        well_dict[name.upper()] = [int(hyd_info.columns[row]),  # column number in hydrograph file
+            float(hyd_info.x[row]), float(hyd_info.y[row]),     # x, y
+            int(hyd_info.layers[row]), name.lower()]            # model layer, well name
     return well_dict
@@ -0,0 +1,63 @@
+# screen_overlap.py
+# Length of each well screen within each model layer, for many wells at once
+# Copyright (C) 2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def screen_overlap(layer_top, layer_bot, screen_top, screen_bot, fractions=False):
+    ''' screen_overlap() - Return the length of each well screen that lies
+        within each model layer, for all wells at once, optionally as the
+        fraction of the screen length in the model in each layer
+
+    Parameters
+    ----------
+    layer_top : array-like
+        (wells, layers) top elevation of each layer at each well
+
+    layer_bot : array-like
+        (wells, layers) bottom elevation of each layer at each well
+
+    screen_top : array-like
+        (wells) elevation of the top of each screened interval
+
+    screen_bot : array-like
+        (wells) elevation of the bottom of each screened interval
+
+    fractions : bool, default=False
+        if True divide each row by its total, so each well's values sum
+        to 1 (rows with no overlap stay 0)
+
+    Returns
+    -------
+    overlap : numpy array
+        (wells, layers) screen length or fraction of screen in each layer
+
+    '''
+    import numpy as np
+
+    layer_top = np.asarray(layer_top, dtype=float)
+    layer_bot = np.asarray(layer_bot, dtype=float)
+    screen_top = np.asarray(screen_top, dtype=float).reshape(-1, 1)
+    screen_bot = np.asarray(screen_bot, dtype=float).reshape(-1, 1)
+
+    # overlap of [screen_bot, screen_top] with [layer_bot, layer_top]
+    overlap = np.minimum(screen_top, layer_top) - np.maximum(screen_bot, layer_bot)
+    overlap = np.nan_to_num(np.clip(overlap, 0.0, None))
+
+    if fractions:
+        total = overlap.sum(axis=1, keepdims=True)
+        overlap = np.divide(overlap, total, out=np.zeros_like(overlap), where=total > 0)
+    return overlap
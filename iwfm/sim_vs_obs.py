@@ -1,5 +1,5 @@
-# read_sim_hyds.py
-# Read simulated hydrographs from IWFM hydrograph.out file
+# sim_vs_obs.py
+# Draw scatterplots of observed vs simulated values and calculate r2
 # Copyright (C) 2020-2021 University of California
 # -----------------------------------------------------------------------------
 # This information is free; you can redistribute it and/or modify it
@@ -16,72 +16,178 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 # -----------------------------------------------------------------------------
 
+import numpy as np
 import pandas as pd
 import iwfm
-import sklearn.metrics
 import os
 
 
 
 
-def sim_vs_obs(OBS,gwhyd_sim,dir_out):
-    ''' sim_vs_obs() - draws a scatterplot of observed vs simulated values
+def sim_vs_obs(OBS,gwhyd_sim,dir_out,processes=1,pdf_file=None,tiles=(3,3)):
+    ''' sim_vs_obs() - draws a scatterplot of observed vs simulated values,
+        and one for each well
 
     Parameters
     ----------
     OBS: Pandas dataframe with observations. Date in "Date" column
     gwhyd_sim: Pandas dataframe with simulated time series (output of read_sim_hyds_df)
-    dir_out: Directory where the scatter plot will be saved
+    dir_out: Directory where the scatter plots will be saved
+    processes: number of processes drawing the per-well scatter plots
+    pdf_file: if not None, name of a multi-page PDF file in dir_out to write
+        the per-well scatter plots to, tiled on each page, instead of one
+        PNG file per well
+    tiles: (rows, columns) of scatter plots on each page of pdf_file
 
 
     Returns
     -------
-
-
+    r2_all: dictionary with r2 of each well
 
 
 
     '''
+    import multiprocessing as mp
 
     #First, let's match obs and sim records for same well, month, and year
 
     OBS_SIM=iwfm.match_obs_sim(OBS,gwhyd_sim)
 
-    ax = OBS_SIM.plot.scatter(x='WSE', y='SIM')
-    ax.axline((1, 1), slope=1, color='g')
+    obs = OBS_SIM['WSE'].values.astype(float)
+    sim = OBS_SIM['SIM'].values.astype(float)
+
+    #Let's calculate r2 of all the records and of each well in one pass
+    codes, wells = pd.factorize(OBS_SIM.Name, sort=False)
+    r2 = sim_vs_obs_r2(obs, sim, np.zeros(len(obs), dtype=np.int64), 1)[0]
+    r2_wells = sim_vs_obs_r2(obs, sim, codes, len(wells))
+    r2_all = dict(zip(wells, r2_wells))
+
+    fig = sim_vs_obs_figure()
+    sim_vs_obs_draw(fig.add_subplot(), obs, sim, r2, pad=0)
+    fig.savefig(os.path.join(dir_out,"OBS_vs_SIM.png"))
+
+    #Rows of each well, as slices of one stable sort
+    order = np.argsort(codes, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(wells)))])
+    panels = [(well, obs[order[bounds[k]:bounds[k + 1]]], sim[order[bounds[k]:bounds[k + 1]]],
+               r2_wells[k]) for k, well in enumerate(wells)]
+
+    #Let's also print scatter plots for each well, tiled in one PDF file
+    if pdf_file is not None:
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        rows, cols = tiles
+        fig = sim_vs_obs_figure(figsize=(4 * cols, 4 * rows))
+        axes = fig.subplots(rows, cols, squeeze=False).ravel()
+        with PdfPages(os.path.join(dir_out, pdf_file)) as pdf:
+            for first in range(0, len(panels), len(axes)):
+                for ax, panel in zip(axes, panels[first:first + len(axes)]):
+                    ax.clear()
+                    ax.set_visible(True)
+                    sim_vs_obs_draw(ax, *panel[1:], title=panel[0])
+                for ax in axes[len(panels[first:first + len(axes)]):]:
+                    ax.set_visible(False)
+                fig.tight_layout()
+                pdf.savefig(fig)
+        return r2_all
+
+    #... or one PNG file for each well, spread across processes
+    jobs = [(os.path.join(dir_out, "OBS_vs_SIM_"+panel[0]+".png"),) + panel for panel in panels]
+    if processes > 1 and len(jobs) > 1:
+        with mp.Pool(processes=processes) as pool:
+            pool.map(sim_vs_obs_png, jobs, chunksize=max(1, len(jobs) // (4 * processes)))
+    else:
+        for job in jobs:
+            sim_vs_obs_png(job)
 
-    #Let's calculate r2
-    r2=sklearn.metrics.r2_score(OBS_SIM['WSE'],OBS_SIM['SIM'])
+    return r2_all
 
-    ax.text(max(max(OBS_SIM.WSE),max(OBS_SIM.SIM))-15, max(max(OBS_SIM.WSE),max(OBS_SIM.SIM))-5, "r2= "+str(round(r2,2)))
+
+def sim_vs_obs_r2(obs, sim, codes, ngroups):
+    ''' sim_vs_obs_r2() - coefficient of determination of sim as a predictor
+        of obs within each group, as sklearn.metrics.r2_score, from grouped
+        sums in one pass
+
+    Parameters
+    ----------
+    obs, sim: numpy arrays of observed and simulated values
+    codes: numpy array with the group number (0 to ngroups-1) of each value
+    ngroups: number of groups
+
+
+    Returns
+    -------
+    r2: numpy array with r2 of each group, nan for groups with less than 2 values
+
+
+
+    '''
+    count = np.bincount(codes, minlength=ngroups)
+    total = np.bincount(codes, weights=obs, minlength=ngroups)
+    mean = np.divide(total, count, out=np.zeros(ngroups), where=count > 0)
+    ss_res = np.bincount(codes, weights=(obs - sim) ** 2, minlength=ngroups)
+    ss_tot = np.bincount(codes, weights=(obs - mean[codes]) ** 2, minlength=ngroups)
+
+    r2 = np.where(ss_res == 0, 1.0, 0.0)
+    np.subtract(1.0, ss_res / np.where(ss_tot > 0, ss_tot, 1.0), out=r2, where=ss_tot > 0)
+    r2[count < 2] = np.nan
+    return r2
+
+
+def sim_vs_obs_figure(figsize=None):
+    ''' sim_vs_obs_figure() - a matplotlib figure that is not managed by
+        pyplot, so it can be reused and works in worker processes '''
+    from matplotlib.figure import Figure
+
+    return Figure(figsize=figsize)
+
+
+def sim_vs_obs_draw(ax, obs, sim, r2, title=None, pad=5):
+    ''' sim_vs_obs_draw() - draw one scatterplot of observed vs simulated
+        values on matplotlib axes ax '''
+    ax.scatter(obs, sim)
+    ax.axline((1, 1), slope=1, color='g')
+    ax.set_xlabel('WSE')
+    ax.set_ylabel('SIM')
+    if title is not None:
+        ax.set_title(title)
+    if len(obs) == 0:
+        return
+
+    lb = min(obs.min(), sim.min())
+    ub = max(obs.max(), sim.max())
+    ax.text(ub - 15, ub - 5, "r2= " + str(round(r2, 2)))
 
     #Let's set axis limits
-    ax.set_xlim(min(min(OBS_SIM.WSE),min(OBS_SIM.SIM)),max(max(OBS_SIM.WSE),max(OBS_SIM.SIM)))
-    ax.set_ylim(min(min(OBS_SIM.WSE), min(OBS_SIM.SIM)), max(max(OBS_SIM.WSE), max(OBS_SIM.SIM)))
-    fig = ax.get_figure()
-    fig.savefig(os.path.join(dir_out,"OBS_vs_SIM.png"))
+    ax.set_xlim(lb - pad, ub + pad)
+    ax.set_ylim(lb - pad, ub + pad)
 
-    #Let's also print scatter plots for each well
 
-    r2_all={}
+_png_figure = None
 
-    for well in OBS_SIM.Name.unique():
-        OBS_SIM_dum=OBS_SIM[OBS_SIM.Name==well].copy()
-        ax = OBS_SIM_dum.plot.scatter(x='WSE', y='SIM',title=well)
-        ax.axline((1, 1), slope=1, color='g')
 
-        # Let's calculate r2
-        r2 = sklearn.metrics.r2_score(OBS_SIM_dum['WSE'], OBS_SIM_dum['SIM'])
-        r2_all[well]=r2
-        ax.text(max(max(OBS_SIM_dum.WSE), max(OBS_SIM_dum.SIM)) - 15, max(max(OBS_SIM_dum.WSE), max(OBS_SIM_dum.SIM)) - 5,
-                "r2= " + str(round(r2, 2)))
+def sim_vs_obs_png(job):
+    ''' sim_vs_obs_png() - draw one well's scatterplot to a PNG file, reusing
+        one figure for all the wells drawn by this process
 
-        # Let's set axis limits
-        ax.set_xlim(min(min(OBS_SIM_dum.WSE), min(OBS_SIM_dum.SIM))-5, max(max(OBS_SIM_dum.WSE), max(OBS_SIM_dum.SIM))+5)
-        ax.set_ylim(min(min(OBS_SIM_dum.WSE), min(OBS_SIM_dum.SIM))-5, max(max(OBS_SIM_dum.WSE), max(OBS_SIM_dum.SIM))+5)
-        fig = ax.get_figure()
-        fig.savefig(os.path.join(dir_out, "OBS_vs_SIM_"+well+".png"))
+    Parameters
+    ----------
+    job: tuple (png_file, well, obs, sim, r2)
 
-    return r2_all
 
+    Returns
+    -------
+    png_file: name of the file written
+
+
+    '''
+    global _png_figure
+    png_file, well, obs, sim, r2 = job
+
+    if _png_figure is None:
+        _png_figure = sim_vs_obs_figure()
+    _png_figure.clear()
+    sim_vs_obs_draw(_png_figure.add_subplot(), obs, sim, r2, title=well)
+    _png_figure.savefig(png_file)
+    return png_file
 
@@ -46,9 +46,7 @@ def sub_pp_elem_file(elem_file, new_elem_file, elem_list, new_srs):
 
     comments = ['Cc*#']
 
-    elems = []
-    for e in elem_list:
-        elems.append(e[0])
+    elems = {e[0] for e in elem_list}
 
     elem_lines = open(elem_file).read().splitlines()  # open and read input file
 
@@ -40,6 +40,8 @@ def sub_pp_node_file(node_file, new_node_file, node_list):
     '''
     import iwfm as iwfm
 
+    nodes = set(node_list)
+
     node_lines = open(node_file).read().splitlines()  # open and read input file
 
     line_index = iwfm.skip_ahead(0, node_lines, 0)  # skip comments
@@ -51,7 +53,7 @@ def sub_pp_node_file(node_file, new_node_file, node_list):
     new_node_lines = node_lines[:line_index]
 
     for i in range(line_index, len(node_lines)):
-        if int(node_lines[i].split()[0]) in node_list:
+        if int(node_lines[i].split()[0]) in nodes:
             new_node_lines.append(node_lines[i])
     new_node_lines.append('')
 
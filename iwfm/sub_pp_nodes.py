@@ -37,10 +37,8 @@ def sub_pp_nodes(elem_file, elem_list):
     '''
     import iwfm as iwfm
 
-    comments = ['Cc*#']
-    elems = []
-    for e in elem_list:
-        elems.append(int(e[0]))
+    comments = 'Cc*#'
+    elems = {int(e[0]) for e in elem_list}
 
     elem_lines = open(elem_file).read().splitlines()  # open and read input file
 
@@ -56,17 +54,12 @@ def sub_pp_nodes(elem_file, elem_list):
     line_index = iwfm.skip_ahead(line_index + 1, elem_lines, 0) 
 
     # -- get node list
-    node_list = []
+    nodes = set()
     for i in range(line_index, len(elem_lines)):
-        temp = [int(n) for n in elem_lines[i].split()]
-        elem = temp[0]
-        nodes = temp[1:5]
-        if elem in elems:
-            for node in nodes:
-                if node not in node_list:
-                    node_list.append(node)
-    node_list.sort()
+        temp = elem_lines[i].split()
+        if int(temp[0]) in elems:
+            nodes.update(int(n) for n in temp[1:5])
     # remove 0, it is not a node number, just indicates a triangular element
-    if (node_list[0] == 0):  
-        node_list.pop(0)
+    nodes.discard(0)
+    node_list = sorted(nodes)
     return node_list
@@ -41,6 +41,8 @@ def sub_pp_strat_file(strat_file, new_strat_file, node_list):
     '''
     import iwfm as iwfm
 
+    nodes = set(node_list)
+
     strat_lines = open(strat_file).read().splitlines() 
 
     while len(strat_lines[-1]) < 2:
@@ -52,7 +54,7 @@ def sub_pp_strat_file(strat_file, new_strat_file, node_list):
     new_strat_lines = strat_lines[:line_index]
 
     for i in range(line_index, len(strat_lines)):
-        if int(strat_lines[i].split()[0]) in node_list:
+        if int(strat_lines[i].split()[0]) in nodes:
             new_strat_lines.append(strat_lines[i])
 
     new_strat_lines.append('')
@@ -46,6 +46,8 @@ def sub_swhed_file(old_filename, new_filename, node_list, snode_list, verbose=Fa
     '''
     import iwfm as iwfm
 
+    nodes, snodes = set(node_list), set(snode_list)
+
     swshwd_lines = open(old_filename).read().splitlines()  
 
     line_index = iwfm.skip_ahead(0, swshwd_lines, 2)  # skip factors and comments
@@ -58,11 +60,11 @@ def sub_swhed_file(old_filename, new_filename, node_list, snode_list, verbose=Fa
     for sw in range(0, nsw):  # small watershed descriptions
         change, line, items = 0, line_index, swshwd_lines[line_index].split()
 
-        if int(items[4]) in node_list:  # if IWB in submodel keep small watershed
+        if int(items[4]) in nodes:  # if IWB in submodel keep small watershed
             sw_list.append(int(items[0]))  # ID
             
             # if IWBTS not in submodel, replace with '0'
-            if (int(items[2]) not in snode_list):
+            if (int(items[2]) not in snodes):
                 change, items[2] = 1, '0'
 
             # check that each arc node is in the submodel
@@ -70,7 +72,7 @@ def sub_swhed_file(old_filename, new_filename, node_list, snode_list, verbose=Fa
                 line_index = iwfm.skip_ahead(line_index, swshwd_lines, 1)
                 
                 # remove this arc node and decrement nwb
-                if (int(swshwd_lines[line_index].split()[0]) not in snode_list):
+                if (int(swshwd_lines[line_index].split()[0]) not in snodes):
                     del swshwd_lines[line_index]
                     change, items[3] = 1, str(int(items[3]) - 1)
                     line_index -= 1
@@ -96,7 +98,7 @@ def sub_swhed_file(old_filename, new_filename, node_list, snode_list, verbose=Fa
 
     # remove root zone parameters for small watersheds outside submodel
     for sw in range(0, nsw):  
-        if int(swshwd_lines[line_index].split()[0]) not in node_list:  # remove the line
+        if int(swshwd_lines[line_index].split()[0]) not in nodes:  # remove the line
             del swshwd_lines[line_index]
         line_index = iwfm.skip_ahead(line_index, swshwd_lines, 1) 
 
@@ -104,7 +106,7 @@ def sub_swhed_file(old_filename, new_filename, node_list, snode_list, verbose=Fa
 
     # remove aquifer parameters for small watersheds outside submodel
     for sw in range(0, nsw):
-        if int(swshwd_lines[line_index].split()[0]) not in node_list:  # remove the line
+        if int(swshwd_lines[line_index].split()[0]) not in nodes:  # remove the line
             del swshwd_lines[line_index]
         line_index = iwfm.skip_ahead(line_index, swshwd_lines, 1) 
 
@@ -112,7 +114,7 @@ def sub_swhed_file(old_filename, new_filename, node_list, snode_list, verbose=Fa
 
     # remove initial conditions for small watersheds outside submodel
     for sw in range(0, nsw):  
-        if int(swshwd_lines[line_index].split()[0]) not in node_list:  # remove the line
+        if int(swshwd_lines[line_index].split()[0]) not in nodes:  # remove the line
             del swshwd_lines[line_index]
         line_index = iwfm.skip_ahead(line_index, swshwd_lines, 0)
 
@@ -43,25 +43,20 @@ def sub_unsat_file(old_filename, new_filename, elem_list, verbose=False):
     '''
     import iwfm as iwfm
 
-    comments = ['Cc*#']
-    elems = []
-    for e in elem_list:
-        elems.append(e[0])
+    comments = 'Cc*#'
+    elems = {int(e[0]) for e in elem_list}
 
     unsat_lines = open(old_filename).read().splitlines()  
     unsat_lines.append('')
 
     line_index = iwfm.skip_ahead(0, unsat_lines, 9)  # skip factors and comments
 
-    while line_index < len(unsat_lines):
-        if (
-            len(unsat_lines[line_index]) > 1
-            and unsat_lines[line_index][0] not in comments
-        ):
-            if int(unsat_lines[line_index].split()[0]) not in elems:  # remove the line
-                del unsat_lines[line_index]
-                line_index -= 1
-        line_index += 1
+    # -- keep blank and comment lines and the lines of submodel elements
+    unsat_lines = unsat_lines[:line_index] + [
+        line for line in unsat_lines[line_index:]
+        if len(line) <= 1 or line[0] in comments or not line.split()
+        or int(line.split()[0]) in elems
+    ]
 
     unsat_lines.append('')
 
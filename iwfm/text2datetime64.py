@@ -0,0 +1,59 @@
+# text2datetime64.py
+# Convert a list of MM/DD/YYYY date strings to a numpy datetime64 array
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def text2datetime64(dates):
+    ''' text2datetime64() - Convert a list of MM/DD/YYYY date strings to a 
+        numpy datetime64 array, parsing all dates in one vectorized step
+        when they are zero-padded and each distinct date only once otherwise
+
+    Parameters
+    ----------
+    dates : list
+        dates as strings in MM/DD/YYYY or M/D/YYYY format, anything after
+        the date (such as '_24:00') is ignored
+
+    Returns
+    -------
+    numpy array of datetime64[D]
+
+    '''
+    import numpy as np
+    import datetime
+
+    if np.asarray(dates).dtype.kind == 'M':  # already dates
+        return np.asarray(dates).astype('datetime64[D]').ravel()
+
+    text = np.asarray(dates, dtype='U10').ravel()
+    if text.size == 0:
+        return np.array([], dtype='datetime64[D]')
+
+    chars = text.view('U1').reshape(-1, 10)
+    if (chars[:, 2] == '/').all() and (chars[:, 5] == '/').all():
+        # reorder the characters of MM/DD/YYYY to YYYY-MM-DD for numpy
+        iso = chars[:, [6, 7, 8, 9, 2, 0, 1, 5, 3, 4]]
+        iso[:, 4] = '-'
+        iso[:, 7] = '-'
+        return np.ascontiguousarray(iso).view('U10').ravel().astype('datetime64[D]')
+
+    # dates not zero-padded: parse each distinct date once
+    text = np.array([d.split('_')[0].split()[0] for d in dates])
+    unique, inverse = np.unique(text, return_inverse=True)
+    parsed = np.array([datetime.datetime.strptime(d, '%m/%d/%Y') for d in unique],
+        dtype='datetime64[D]')
+    return parsed[inverse]
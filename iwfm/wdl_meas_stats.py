@@ -18,10 +18,16 @@
 # -----------------------------------------------------------------------------
 
 
-def wdl_meas_stats(input_file, verbose=False):
+def wdl_meas_stats(input_file, verbose=False, processes=1):
     ''' wdl_meas_stats() - Calculate water level statistics and write out 
         to a file
 
+        Statistics are accumulated in one pass with O(1) state per station
+        (Welford's method), so the input does not need to be sorted by
+        station. With processes > 1 the file is split into chunks at line
+        boundaries, each chunk is aggregated by a separate process and 
+        the partial aggregates are merged.
+
     Parameters
     ----------
     input_file : str
@@ -30,52 +36,133 @@ def wdl_meas_stats(input_file, verbose=False):
     verbose : bool, default=False
         True = command-line output on
 
+    processes : int, default=1
+        number of processes to read the file with
+
     Returns
     -------
     nothing
 
     '''
-    import statistics
+    import math
+    import multiprocessing as mp
+    import iwfm as iwfm
 
     output_file = input_file[0 : input_file.find('.')] + '_stats.out'
 
-    lines_in, lines_out, count = 0, 0, 0
-    with open(input_file, 'r') as infile, open(output_file, 'w') as outfile:
+    # -- aggregate each chunk of the file, skipping the header line
+    chunks = [(input_file, start, end) for start, end 
+        in iwfm.file_chunks(input_file, processes, skip_lines=1)]
+    if processes > 1 and len(chunks) > 1:
+        with mp.Pool(processes=processes) as pool:
+            partials = pool.map(wdl_stats_chunk, chunks)
+    else:
+        partials = [wdl_stats_chunk(chunk) for chunk in chunks]
+
+    # -- merge the partial aggregates in file order
+    stats, lines_in = {}, 1
+    for partial, nlines in partials:
+        lines_in += nlines
+        for well_id, state in partial.items():
+            if well_id in stats:
+                stats[well_id] = wdl_stats_merge(stats[well_id], state)
+            else:
+                stats[well_id] = state
+
+    lines_out = 0
+    with open(output_file, 'w') as outfile:
         outfile.write('STN_ID\tMIN_DATE\tMAX_DATE\tCOUNT\tWL_AVG\tWL_MAX\tWL_MIN\tWL_SDV\n')
-        first_date, first_well_id, start_date, last_date, wl = 0, '', '', '', []
-        for line in infile:
-            lines_in +=  1
-            items = line.split()
-            if lines_in == 2:
-                first_well_id, start_date, last_date = items[0], items[1], items[1]
-                wl.append(float(items[4]))
-                count = 1
-            elif lines_in > 2:
-                this_well_id, this_date = items[0], items[1]
-                if items[0] != first_well_id:
-                    # write out info for this well
-                    if count > 1:
-                        stdev = int(statistics.stdev(wl) * 100) / 100
-                    else:
-                        stdev = -99.9
-                    outfile.write(f'{first_well_id}\t{text_date(start_date)}'+
-                        f'\t{text_date(last_date)}\t{count}'+
-                        f'\t{int(statistics.mean(wl) * 100) / 100}'+
-                        f'\t{max(wl)}\t{min(wl)}\t{stdev}\n')
-                    lines_out = lines_out + 1
-                    # - reset for the next well
-                    first_well_id = this_well_id
-                    first_date = this_date
-                    start_date = items[1]
-                    count = 1
-                    wl = []
-                    wl.append(float(items[4]))
-                else:
-                    wl.append(float(items[4]))
-                    count = count + 1
-
-                last_date = this_date
+        for well_id, state in stats.items():
+            count, mean, m2, wl_max, wl_min, start_key, start_date, last_key, last_date = state
+            if count > 1:
+                stdev = int(math.sqrt(m2 / (count - 1)) * 100) / 100
+            else:
+                stdev = -99.9
+            outfile.write(f'{well_id}\t{iwfm.text_date(start_date)}'+
+                f'\t{iwfm.text_date(last_date)}\t{count}'+
+                f'\t{int(mean * 100) / 100}'+
+                f'\t{wl_max}\t{wl_min}\t{stdev}\n')
+            lines_out = lines_out + 1
 
     if verbose:
         print(f'Processed {lines_in:,} lines from {input_file}')
         print(f'Wrote {lines_out:,} lines to {output_file}')
+
+
+def wdl_stats_chunk(chunk):
+    ''' wdl_stats_chunk() - Accumulate water level statistics for each 
+        station in one byte range of a water level file
+
+    Parameters
+    ----------
+    chunk : tuple
+        (file name, start byte, end byte)
+
+    Returns
+    -------
+    stats : dictionary
+        key = station id, value = [count, mean, sum of squared differences
+        from the mean, max, min, first date key, first date, last date key,
+        last date]
+    
+    lines : int
+        number of lines read
+
+    '''
+    import iwfm as iwfm
+
+    input_file, start, end = chunk
+    stats, lines, pos = {}, 0, start
+    with open(input_file, 'rb') as infile:
+        infile.seek(start)
+        while pos < end:
+            line = infile.readline()
+            if not line:
+                break
+            pos += len(line)
+            lines += 1
+            items = line.split()
+            if len(items) < 5:
+                continue
+            well_id, date, wl = items[0].decode(), items[1].decode(), float(items[4])
+            date_key = (iwfm.year(date), iwfm.month(date), iwfm.day(date))
+
+            state = stats.get(well_id)
+            if state is None:
+                stats[well_id] = [1, wl, 0.0, wl, wl, date_key, date, date_key, date]
+                continue
+            # Welford update of count, mean and sum of squared differences
+            state[0] += 1
+            delta = wl - state[1]
+            state[1] += delta / state[0]
+            state[2] += delta * (wl - state[1])
+            state[3] = max(state[3], wl)
+            state[4] = min(state[4], wl)
+            if date_key < state[5]:
+                state[5], state[6] = date_key, date
+            if date_key > state[7]:
+                state[7], state[8] = date_key, date
+    return stats, lines
+
+
+def wdl_stats_merge(a, b):
+    ''' wdl_stats_merge() - Merge two partial water level aggregates for one
+        station, from wdl_stats_chunk()
+
+    Parameters
+    ----------
+    a, b : list
+        partial aggregates
+
+    Returns
+    -------
+    merged aggregate : list
+
+    '''
+    count = a[0] + b[0]
+    delta = b[1] - a[1]
+    mean = a[1] + delta * b[0] / count
+    m2 = a[2] + b[2] + delta * delta * a[0] * b[0] / count
+    first = a[5:7] if a[5] <= b[5] else b[5:7]
+    last = a[7:9] if a[7] >= b[7] else b[7:9]
+    return [count, mean, m2, max(a[3], b[3]), min(a[4], b[4])] + first + last
@@ -17,9 +17,14 @@
 # -----------------------------------------------------------------------------
 
 
-def wdl_ts_4_wells(station_file, waterlevel_file, verbose=False):
+def wdl_ts_4_wells(station_file, waterlevel_file, verbose=False, processes=1,
+    date_range=None, binary=False):
     ''' wdl_ts_4_wells() - Write well data as time series
 
+        The water level file is split into chunks at line boundaries and 
+        each chunk is filtered by a separate process, testing station IDs 
+        against a hash set. The filtered chunks are written in file order.
+
     Parameters
     ----------
     station_file : str
@@ -31,12 +36,28 @@ def wdl_ts_4_wells(station_file, waterlevel_file, verbose=False):
     verbose : bool, default=True
         True = command-line output on 
 
+    processes : int, default=1
+        number of processes to filter the water levels file with
+
+    date_range : tuple, default=None
+        (first date, last date) as MM/DD/YYYY strings, to keep only 
+        measurements within the range (either may be None)
+
+    binary : bool, default=False
+        also write STN_ID, MSMT_DATE and WSE of each measurement kept to
+        a numpy structured array file (station_file_base + '_TS.npy')
+
     Returns
     -------
     nothing
     
     '''
     import csv
+    import os
+    import shutil
+    import multiprocessing as mp
+    import numpy as np
+    import iwfm as iwfm
 
     station_file_base = station_file[0 : station_file.find('.')]  # basename
     station_file_ext = station_file[
@@ -44,34 +65,126 @@ def wdl_ts_4_wells(station_file, waterlevel_file, verbose=False):
     ]  # extention
     output_file = station_file_base + '_TS.out'
 
-    # -- read stations into a dictionary
+    # -- read stations into a set
     file_lines = open(station_file).read().splitlines() 
     if verbose:
         print(f'Read {len(file_lines):,} stations from {station_file}')
 
-    mydict = {
-        entry['STN_ID']: [entry['SITE_CODE'], entry['SWN']]
+    stations = {
+        entry['STN_ID'].encode()
         for entry in csv.DictReader(file_lines, delimiter='\t')
     }
 
-    lines_in, lines_out = 0, 0
-    with open(waterlevel_file, 'r') as infile, open(output_file, 'w') as outfile:
+    # -- date range as (year, month, day) keys
+    if date_range is None:
+        date_keys = None
+    else:
+        date_keys = tuple(None if d is None else wdl_date_key(d) for d in date_range)
+
+    # -- filter each chunk of the water level file to a part file
+    chunks = [(waterlevel_file, start, end, stations, date_keys, binary, 
+        f'{output_file}.part{i}') for i, (start, end) 
+        in enumerate(iwfm.file_chunks(waterlevel_file, processes))]
+    if processes > 1 and len(chunks) > 1:
+        with mp.Pool(processes=processes) as pool:
+            results = pool.map(wdl_ts_chunk, chunks)
+    else:
+        results = [wdl_ts_chunk(chunk) for chunk in chunks]
+
+    # -- concatenate the part files in order
+    lines_in, lines_out, records = 0, 0, []
+    with open(output_file, 'wb') as outfile:
         outfile.write(
-            'STN_ID,SITE_CODE,WLM_ID,MSMT_DATE,WLM_RPE,WLM_GSE,RDNG_WS,RDNG_RP,WSE,RPE_GSE,GSE_WSE,WLM_QA_DESC,WLM_DESC,WLM_ACC_DESC,WLM_ORG_ID,WLM_ORG_NAME,MSMT_CMT,COOP_AGENCY_ORG_ID,COOP_ORG_NAME\n'
+            b'STN_ID,SITE_CODE,WLM_ID,MSMT_DATE,WLM_RPE,WLM_GSE,RDNG_WS,RDNG_RP,WSE,RPE_GSE,GSE_WSE,WLM_QA_DESC,WLM_DESC,WLM_ACC_DESC,WLM_ORG_ID,WLM_ORG_NAME,MSMT_CMT,COOP_AGENCY_ORG_ID,COOP_ORG_NAME\n'
         )
-        for line in infile:
-            lines_in = lines_in + 1
-            items = line.split()
-            if len(line) > 10:
-                value = mydict.get(items[0][0 : line.find(',')])
-                if value is not None:
-                    outfile.write(line)
-                    lines_out = lines_out + 1
+        for part_file, part_in, part_out, part_records in results:
+            with open(part_file, 'rb') as part:
+                shutil.copyfileobj(part, outfile)
+            os.remove(part_file)
+            lines_in, lines_out = lines_in + part_in, lines_out + part_out
+            records.append(part_records)
+
+    if binary:
+        binary_file = station_file_base + '_TS.npy'
+        np.save(binary_file, np.concatenate(records))
+        if verbose:
+            print(f'Wrote {lines_out:,} measurements to {binary_file}')
+
     if verbose:
         print(f'Processed {lines_in:,} lines from {waterlevel_file}')
         print(f'Wrote {lines_out:,} lines to {output_file}')
     return
 
+
+def wdl_ts_chunk(chunk):
+    ''' wdl_ts_chunk() - Filter one byte range of a water level file to a
+        part file, keeping lines for the stations in a set
+
+    Parameters
+    ----------
+    chunk : tuple
+        (water level file name, start byte, end byte, set of station IDs
+        as bytes, (first, last) date keys or None, bool to also return 
+        binary records, part file name)
+
+    Returns
+    -------
+    part_file : str
+        part file name
+
+    lines_in : int
+        number of lines read
+
+    lines_out : int
+        number of lines written
+
+    records : numpy structured array
+        STN_ID, MSMT_DATE and WSE of the lines written (empty unless 
+        binary records were asked for)
+
+    '''
+    import numpy as np
+
+    waterlevel_file, start, end, stations, date_keys, binary, part_file = chunk
+    dtype = [('STN_ID', 'U16'), ('MSMT_DATE', 'datetime64[D]'), ('WSE', 'f8')]
+
+    lines_in, lines_out, pos, records = 0, 0, start, []
+    with open(waterlevel_file, 'rb') as infile, open(part_file, 'wb') as outfile:
+        infile.seek(start)
+        while pos < end:
+            line = infile.readline()
+            if not line:
+                break
+            pos += len(line)
+            lines_in = lines_in + 1
+            if len(line) > 10 and line[0 : line.find(b',')] in stations:
+                if date_keys is not None or binary:
+                    items = line.decode().split(',')
+                    date_key = wdl_date_key(items[3])
+                    if date_keys is not None:
+                        if date_keys[0] is not None and date_key < date_keys[0]:
+                            continue
+                        if date_keys[1] is not None and date_key > date_keys[1]:
+                            continue
+                    if binary:
+                        wse = float(items[8]) if items[8].strip() else np.nan
+                        records.append((items[0], '{:04d}-{:02d}-{:02d}'.format(*date_key), wse))
+                outfile.write(line)
+                lines_out = lines_out + 1
+    return part_file, lines_in, lines_out, np.array(records, dtype=dtype)
+
+
+def wdl_date_key(text):
+    ''' wdl_date_key() - Return a (year, month, day) tuple from a date in 
+        YYYY-MM-DD or MM/DD/YYYY format, with or without a time'''
+    import iwfm as iwfm
+
+    text = text.strip().split()[0]
+    if '-' in text:
+        y, m, d = text[0:10].split('-')
+        return int(y), int(m), int(d)
+    return iwfm.year(text), iwfm.month(text), iwfm.day(text)
+
 if __name__ == '__main__':
     ' Run wdl_ts_4_wells() from command line'
     import sys
@@ -81,14 +194,16 @@ if __name__ == '__main__':
     if len(sys.argv) > 1:  # arguments are listed on the command line
         station_file = sys.argv[1]
         waterlevel_file = sys.argv[2]
+        processes = int(sys.argv[3]) if len(sys.argv) > 3 else 1
     else:  # ask for file names from terminal
         station_file = input('Well station file name: ')
         waterlevel_file   = input('Water level file name: ')
+        processes = 1
 
     iwfm.file_test(station_file)  
     iwfm.file_test(waterlevel_file)
 
     idb.exe_time()  # initialize timer
-    iwfm.wdl_ts_4_wells(station_file, waterlevel_file, verbose=True)
+    iwfm.wdl_ts_4_wells(station_file, waterlevel_file, verbose=True, processes=processes)
 
     idb.exe_time()  # print elapsed time
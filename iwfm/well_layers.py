@@ -0,0 +1,90 @@
+# well_layers.py
+# Layer elevations and screen fractions by layer at many wells at once
+# Copyright (C) 2020-2021 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def well_layers(x, y, d_nodexy, d_elem_nodes, d_nodeelev, screen_top=None,
+                screen_bot=None, elems=None):
+    ''' well_layers() - Interpolate the nodal stratigraphy to each well with
+        finite element weights, and return the layer top and bottom
+        elevations and the fraction of each well screen in each layer, for
+        all wells at once
+
+    Parameters
+    ----------
+    x, y : array-like
+        well coordinates
+
+    d_nodexy : dictionary
+        key = node number, value = [x, y] (iwfm_model.d_nodexy)
+
+    d_elem_nodes : dictionary
+        key = element number, value = list of node numbers
+        (iwfm_model.d_elem_nodes)
+
+    d_nodeelev : dictionary
+        key = node number, value = [land surface, aquitard 1 bottom,
+        aquifer 1 bottom, aquitard 2 bottom, ...] (iwfm_model.d_nodeelev)
+
+    screen_top, screen_bot : array-like, optional
+        elevations of the top and bottom of each well screen
+
+    elems : array-like, optional
+        element containing each well if already known
+
+    Returns
+    -------
+    elems : numpy int array
+        element containing each well, 0 if outside the model
+
+    elevs : numpy float array
+        (wells, 2 * layers + 1) interpolated stratigraphy, in the order of
+        d_nodeelev
+
+    layer_top, layer_bot : numpy float arrays
+        (wells, layers) top of the aquitard and bottom of the aquifer of
+        each layer
+
+    fractions : numpy float array or None
+        (wells, layers) fraction of each screen in each layer, None without
+        screen elevations
+
+    '''
+    import numpy as np
+    import iwfm as iwfm
+
+    elems, nodes, weights = iwfm.fe_weights(x, y, d_nodexy, d_elem_nodes, elems=elems)
+
+    # -- nodal stratigraphy as an array, row 0 for missing nodes
+    node_nos = np.fromiter(d_nodeelev.keys(), dtype=np.int64, count=len(d_nodeelev))
+    node_elev = np.array(list(d_nodeelev.values()), dtype=float)
+    node_elev = np.vstack([np.zeros((1, node_elev.shape[1])), node_elev])
+    lookup = np.zeros(max(node_nos.max(), nodes.max()) + 1, dtype=np.int64)
+    lookup[node_nos] = np.arange(1, len(node_nos) + 1)
+
+    # -- weighted sum over the element nodes, (wells, 4, strat) -> (wells, strat)
+    elevs = np.einsum('wn,wnk->wk', np.nan_to_num(weights), node_elev[lookup[nodes]])
+    elevs[elems == 0] = np.nan
+
+    layer_top = elevs[:, 0:-1:2]
+    layer_bot = elevs[:, 2::2]
+
+    fractions = None
+    if screen_top is not None and screen_bot is not None:
+        fractions = iwfm.screen_overlap(layer_top, layer_bot, screen_top, screen_bot,
+            fractions=True)
+    return elems, elevs, layer_top, layer_bot, fractions
@@ -17,7 +17,7 @@
 # -----------------------------------------------------------------------------
 
 
-def write_2_dat(file_base_name, data, crops, elements, time_steps, dates):
+def write_2_dat(file_base_name, data, crops, elements, time_steps, dates, processes=1):
     ''' write_2_dat() - Write a 3D array as 2D tables (row=elements
         x col=time_steps) to (crops) # of text files with filename 
         extension 'dat'
@@ -27,8 +27,8 @@ def write_2_dat(file_base_name, data, crops, elements, time_steps, dates):
     file_base_name : str
         Base name of output file
 
-    data : list
-        Data to be written
+    data : list or numpy array
+        Data to be written, [crop][element][time step]
 
     crops : list
         List of crop codes or names
@@ -42,26 +42,40 @@ def write_2_dat(file_base_name, data, crops, elements, time_steps, dates):
     dates : list
         Dates corresponding to time steps
 
+    processes : int, default=1
+        number of processes writing files, one file per crop
+
     Returns
     -------
     nothing
 
     '''
-    # Create the output file names
-    files = ['' for x in range(crops)]  # empty list
-    for i in range(0, crops):
-        files[i] = ''.join([file_base_name, '_', str(i + 1), '.dat'])
-    # write the arrays to the output files
-    for i in range(crops):
-        fp = open(files[i], 'w')
-        fp.write('   WYr  ')
-        for j in range(time_steps):
-            fp.write(f'               {dates[j].year}  ')
-        fp.write('\n')
-        for j in range(elements):
-            fp.write(f'{(j + 1):6d} ')
-            for k in range(time_steps):
-                fp.write(f'{float(data[i][j][k]):20.4f} ')
-            fp.write('\n')
-        fp.close
+    import multiprocessing as mp
+    import numpy as np
+
+    data = np.asarray(data, dtype=float)
+
+    # write the arrays to the output files, one block per file
+    head = '   WYr  ' + ''.join(f'               {dates[j].year}  ' for j in range(time_steps)) + '\n'
+    jobs = [(''.join([file_base_name, '_', str(i + 1), '.dat']), head,
+        data[i, :elements, :time_steps]) for i in range(crops)]
+    if processes > 1 and crops > 1:
+        with mp.Pool(processes=min(processes, crops)) as pool:
+            pool.map(write_2_dat_file, jobs)
+    else:
+        for job in jobs:
+            write_2_dat_file(job)
     return
+
+
+def write_2_dat_file(job):
+    ''' write_2_dat_file() - Write one write_2_dat() table,
+        job = (file name, header line, (elements, time steps) array) '''
+    import numpy as np
+    import iwfm as iwfm
+
+    file_name, head, table = job
+    text = iwfm.format_table(table, 4, 20, ids=np.arange(1, len(table) + 1), id_width=6,
+        sep=' ', end=' \n')
+    with open(file_name, 'w') as fp:
+        fp.write(head + text)
@@ -27,8 +27,8 @@ def write_2_excel(file_base_name, data, sheets, elements, time_steps, dates, dat
     file_base_name : str
         base name of output file
     
-    data : list
-        data to be written
+    data : list or numpy array
+        data to be written, [sheet][element][time step]
     
     sheets : int
         number of sheets
@@ -65,8 +65,7 @@ def write_2_excel(file_base_name, data, sheets, elements, time_steps, dates, dat
         for k in range(time_steps):  # write dates in first column
             worksheets[i].write(1, k + 1, int(dates[k].year))
         for j in range(elements):  # write data
-            worksheets[i].write(j + 2, 0, j + 1)
-            for k in range(time_steps):
-                worksheets[i].write(j + 2, k + 1, float(data[i][j][k]))
+            row = [float(value) for value in data[i][j][:time_steps]]
+            worksheets[i].write_row(j + 2, 0, [j + 1] + row)
     workbook.close()
     return
@@ -23,8 +23,8 @@ def write_lu2file(out_table,out_file,in_years,date_head_tail=['09/30/', '_24:00'
 
     Parameters
     ----------
-    out_table : list
-        IWFM land use information
+    out_table : list or numpy array
+        IWFM land use information, [time step][element][land use type]
 
     out_file : str
         Name of output file
@@ -46,16 +46,17 @@ def write_lu2file(out_table,out_file,in_years,date_head_tail=['09/30/', '_24:00'
     nothing
 
     '''
+    import numpy as np
+    import iwfm as iwfm
+
     with open(out_file, 'w') as f:
         for i in range(0,len(in_years)):
             date = date_head_tail[0] + str(in_years[i]) + date_head_tail[1]  # date in DSS format
-            for j in range(0, len(out_table[i])):
-                if j == 0:  # start line with date in DSS format
-                    f.write(date)
-                f.write('\t' + str(j + 1) + '\t')  # elem number
-                for word in out_table[i][j]:
-                    f.write(str(round(word, 2)) + '\t')
-                f.write('\n')
+            # -- whole (elements, crops) block at once, same text as str(round(word, 2))
+            block = np.asarray(out_table[i], dtype=float)
+            if len(block) > 0:  # start with date in DSS format
+                f.write(date + iwfm.format_table(block, 2, ids=np.arange(1, len(block) + 1),
+                    lead='\t', end='\t\n'))
 
     if verbose:
         if len(in_years)==1:
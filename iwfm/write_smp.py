@@ -26,8 +26,9 @@ def write_smp(output_filename, lines):
     output_filename : str
         name of smp output file
     
-    lines : list
-        data as [obslicationid, date, time, value]
+    lines : list or Pandas DataFrame
+        data as [obslicationid, date, time, value], or a DataFrame with
+        columns Name, Date (datetime64), Time and Value as from read_smp()
 
     Returns
     -------
@@ -35,8 +36,16 @@ def write_smp(output_filename, lines):
         number of items written to the smp file
 
     '''
-    output_filename = filename_ext(output_filename, 'smp')
+    import iwfm as iwfm
+
+    if hasattr(lines, 'columns'):  # DataFrame: format whole columns at once
+        text = (lines.Name.astype(str) + '\t' + lines.Date.dt.strftime('%m/%d/%Y') 
+            + '\t' + lines.Time.astype(str) + '\t' + lines.Value.astype(str))
+    else:
+        text = [f'{line[0]}\t{line[1]}\t{line[2]}\t{line[3]}' for line in lines]
+
+    output_filename = iwfm.filename_ext(output_filename, 'smp')
     with open(output_filename, 'w') as output_file:
-        for i in range(0, len(lines)):
-            output_file.write(f'{lines[i][0]}\t{lines[i][1]}\t{lines[i][2]}\t{lines[i][3]}\n')
+        if len(text) > 0:
+            output_file.write('\n'.join(text) + '\n')
     return len(lines)